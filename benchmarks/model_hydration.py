@@ -0,0 +1,49 @@
+"""
+Measures how quickly rows returned by the database are converted to model instances and how much memory each row uses.
+
+No database connection is needed. Run from the project root with ``python -m benchmarks.model_hydration``.
+"""
+import datetime
+import time
+import tracemalloc
+
+from dragonfly.db import models
+
+ROWS = 100000
+
+
+class Article(models.Model):
+    __slots__ = ()
+
+    title = models.VarCharField(length=50)
+    text = models.TextField()
+    user_id = models.IntField()
+
+
+def generate_rows(n):
+    now = datetime.datetime.now()
+    return [{'id': i, 'title': f"Article {i}", 'text': 'Lorem ipsum', 'user_id': i % 50, 'created_at': now,
+             'updated_at': now} for i in range(n)]
+
+
+def main():
+    rows = generate_rows(ROWS)
+
+    start = time.perf_counter()
+    [Article(row) for row in rows]
+    elapsed = time.perf_counter() - start
+
+    # Measure the memory kept alive by the models (the row dictionaries already exist so are not counted)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    hydrated = [Article(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"Hydrated {len(hydrated)} rows")
+    print(f"Rows per second: {ROWS / elapsed:,.0f}")
+    print(f"Bytes per row: {(after - before) / ROWS:,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Measures how quickly a request object is created from the WSGI environ dictionary. A typical environ (from a browser
+with a number of cookies) is used. The request is created alone, as for an endpoint that only uses the path, and with
+the headers and cookies read.
+
+Run from the project root with ``python -m benchmarks.request``.
+"""
+import time
+
+from dragonfly.request import Request
+
+REQUESTS = 100000
+
+ENVIRON = {
+    'REQUEST_METHOD': 'GET',
+    'PATH_INFO': '/articles/1',
+    'QUERY_STRING': 'page=2&sort=title',
+    'REMOTE_ADDR': '127.0.0.1',
+    'SERVER_NAME': 'localhost',
+    'SERVER_PORT': '8080',
+    'SERVER_PROTOCOL': 'HTTP/1.1',
+    'SCRIPT_NAME': '',
+    'CONTENT_TYPE': 'text/plain',
+    'CONTENT_LENGTH': '',
+    'wsgi.version': (1, 0),
+    'wsgi.url_scheme': 'http',
+    'wsgi.input': None,
+    'wsgi.errors': None,
+    'wsgi.multithread': False,
+    'wsgi.multiprocess': False,
+    'wsgi.run_once': False,
+    'HTTP_HOST': 'localhost:8080',
+    'HTTP_CONNECTION': 'keep-alive',
+    'HTTP_USER_AGENT': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0 Safari/537.36',
+    'HTTP_ACCEPT': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'HTTP_ACCEPT_ENCODING': 'gzip, deflate, br',
+    'HTTP_ACCEPT_LANGUAGE': 'en-GB,en;q=0.9',
+    'HTTP_COOKIE': 'session_id=0f8e7d6c5b4a39281706f5e4d3c2b1a0; csrf_token=a1b2c3d4e5f6; theme=dark; visited=True',
+}
+
+
+def measure(read):
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        request = Request(ENVIRON)
+        request.path
+        if read:
+            request.headers
+            request.cookies
+    return (time.perf_counter() - start) / REQUESTS * 1000000
+
+
+def main():
+    print(f"Microseconds per request (path only): {measure(False):.2f}")
+    print(f"Microseconds per request (headers and cookies read): {measure(True):.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Measures how quickly the router matches URLs when a large number of routes have been registered.
+
+Run from the project root with ``python -m benchmarks.router``.
+"""
+import random
+import time
+
+from dragonfly.routes.route_collection import RouteCollection
+
+RESOURCES = 250
+MATCHES = 100000
+
+
+def main():
+    route_collection = RouteCollection()
+
+    # Each resource registers 4 dynamic routes and 2 static routes (the same as `Router.resource`)
+    for i in range(RESOURCES):
+        route_collection.add(f"resource{i}", f"Resource{i}Controller@index", 'GET')
+        route_collection.add(f"resource{i}/create", f"Resource{i}Controller@create", 'GET')
+        route_collection.add(f"resource{i}/<id:int>", f"Resource{i}Controller@show", 'GET')
+        route_collection.add(f"resource{i}/<id:int>/edit", f"Resource{i}Controller@edit", 'GET')
+        route_collection.add(f"resource{i}/<id:int>/comments/<name:str>", f"Resource{i}Controller@comment", 'GET')
+        route_collection.add(f"users/<user:int>/resource{i}/<id:int>", f"Resource{i}Controller@user", 'GET')
+
+    random.seed(0)
+    shapes = ["resource{i}/{i}", "resource{i}/{i}/edit", "resource{i}/{i}/comments/test", "users/1/resource{i}/{i}",
+              "resource{i}/missing"]
+    uris = []
+    for _ in range(MATCHES):
+        i = random.randrange(RESOURCES)
+        uris.append(random.choice(shapes).format(i=i))
+
+    start = time.perf_counter()
+    for uri in uris:
+        route_collection.match_route(uri, 'GET')
+    elapsed = time.perf_counter() - start
+
+    node_info = route_collection.node_info()
+
+    print(f"Routes registered: {RESOURCES * 6}")
+    print(f"Nodes: {node_info['nodes']}, largest node: {node_info['max_rules']} rules")
+    print(f"Matches per second: {MATCHES / elapsed:,.0f}")
+    print(f"Microseconds per match: {elapsed / MATCHES * 1000000:.2f}")
+
+    # The slowest kind of URL, as the time taken depends on the nodes a URL is tried against
+    worst = max(time_shape(route_collection, shape) for shape in shapes)
+    print(f"Microseconds per match (slowest kind of URL): {worst:.2f}")
+
+
+def time_shape(route_collection, shape):
+    """The average number of microseconds taken to match URLs of the given shape."""
+    uris = [shape.format(i=random.randrange(RESOURCES)) for _ in range(MATCHES // 10)]
+
+    start = time.perf_counter()
+    for uri in uris:
+        route_collection.match_route(uri, 'GET')
+
+    return (time.perf_counter() - start) / len(uris) * 1000000
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Measures how long a template with a large ``@for`` loop takes to render as the number of items grows. Each part of the
+HTML is added to a list and joined once, so the time per item should stay roughly the same (linear scaling) rather than
+growing with the size of the page.
+
+Run from the project root with ``python -m benchmarks.template``.
+"""
+import os
+import tempfile
+import time
+
+from dragonfly.template.template import Converter
+
+TEMPLATE = """<table>
+    @for(row in rows)
+        <tr><td>{{ $row.id$ }}</td><td>{{ $row.title$ }}</td></tr>
+    @endfor
+</table>
+"""
+
+SIZES = (1000, 10000, 100000, 500000)
+
+
+class Row:
+
+    def __init__(self, id):
+        self.id = id
+        self.title = f"Article {id}"
+
+
+def compile_template():
+    with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False) as f:
+        f.write(TEMPLATE)
+
+    try:
+        python = Converter(f.name).convert()
+    finally:
+        os.remove(f.name)
+
+    namespace = {}
+    exec(compile(python, 'benchmark_template', 'exec'), namespace)
+
+    return namespace['get_html']
+
+
+def measure(get_html, size):
+    rows = [Row(i) for i in range(size)]
+
+    start = time.perf_counter()
+    html = get_html({'rows': rows})
+    elapsed = time.perf_counter() - start
+
+    return elapsed, len(html)
+
+
+def main():
+    get_html = compile_template()
+
+    for size in SIZES:
+        elapsed, length = measure(get_html, size)
+        print(f"{size:>7} rows: {elapsed * 1000:8.2f} ms ({elapsed / size * 1000000:.3f} microseconds per row, "
+              f"{length} characters)")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,29 @@ import os
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))  # This is your Project Root
 MIDDLEWARE = ['tests.middleware.test_middleware', 'tests.middleware.all_middleware'] # These are only needed for testing
-PYTHON_TO_REGEX = {"int": "([0-9]+)", "str": "(.+)"}
+# Custom route parameter types. The default types (int, str, slug, uuid and path) are defined in dragonfly.constants
+PYTHON_TO_REGEX = {}
 URL = "http://localhost:8080"
 
 DATABASE = {
     'user': 'dragonfly',
     'passwd': 'password',
     'host': '127.0.0.1',
-    'db': 'dragonfly_testing'
-}
\ No newline at end of file
+    'db': 'dragonfly_testing',
+    # Optional connection pool settings (see dragonfly.db.pool.DEFAULT_POOL_SETTINGS)
+    'pool': {
+        'min_size': 1,
+        'max_size': 10
+    }
+}
+# Optional settings used to read request bodies (see dragonfly.multipart.DEFAULT_REQUEST_SETTINGS)
+REQUEST = {
+    'max_body_size': 10 * 1024 * 1024,
+    'spool_threshold': 512 * 1024
+}
+# Optional template settings (see dragonfly.template.template.DEFAULT_TEMPLATE_SETTINGS). auto_reload should be False in
+# production so templates are never checked for changes.
+TEMPLATES = {
+    'auto_reload': True,
+    'check_interval': 1
+}
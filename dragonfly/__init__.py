@@ -2,7 +2,9 @@ from dragonfly.auth import Auth
 from dragonfly.db import models
 from dragonfly.db.database import DB
 from dragonfly.request import request
-from dragonfly.response import Response, RedirectResponse, DeferredResponse, ErrorResponse
+from dragonfly.conditional import not_modified
+from dragonfly.response import Response, RedirectResponse, DeferredResponse, ErrorResponse, StreamingResponse, \
+    FileResponse, NotModifiedResponse
 from dragonfly.routes import routes
 from dragonfly.template.template import view
 from dragonfly.utils import Utils
@@ -0,0 +1,130 @@
+from email.utils import parsedate_to_datetime
+
+from dragonfly.request import request
+from dragonfly.response import NotModifiedResponse, make_etag, http_date
+
+# Conditional requests only apply to these methods
+CONDITIONAL_METHODS = ('GET', 'HEAD')
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Check if the ETag is in the ``If-None-Match`` header. The weak comparison is used, so ``W/"abc"`` matches ``"abc"``.
+
+    :param if_none_match: The value of the ``If-None-Match`` header
+    :type if_none_match: str
+
+    :param etag: The ETag of the response
+    :type etag: str
+
+    :return: If the ETag matches
+    :rtype: bool
+    """
+    if if_none_match.strip() == '*':
+        return True
+
+    etag = etag[2:] if etag.startswith('W/') else etag
+
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def is_not_modified(etag=None, last_modified=None):
+    """
+    Check if the browser's cached copy of the response for the current request is still valid. As in RFC 7232 the
+    ``If-Modified-Since`` header is ignored if an ``If-None-Match`` header was sent.
+
+    :param etag: The ETag of the response (including the quotes)
+    :type etag: str
+
+    :param last_modified: The value of the Last-Modified header of the response
+    :type last_modified: str
+
+    :return: If a 304 response should be sent
+    :rtype: bool
+    """
+    if request.method not in CONDITIONAL_METHODS:
+        return False
+
+    if_none_match = request.get_header('If-None-Match')
+
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = request.get_header('If-Modified-Since')
+
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            # An invalid date is ignored
+            return False
+
+    return False
+
+
+def not_modified(etag=None, last_modified=None, weak=False):
+    """
+    Allows a controller to return before doing any expensive work (e.g. rendering a template) if the browser's cached
+    copy is still valid. The same values should be set on the full response using
+    :meth:`set_etag <dragonfly.response.Response.set_etag>` and
+    :meth:`set_last_modified <dragonfly.response.Response.set_last_modified>`.
+
+    :example:
+        ``cached = not_modified(etag=article.updated_at)``
+
+    :param etag: A value that changes whenever the content changes (a version key)
+    :type etag: str
+
+    :param last_modified: When the content was last modified
+    :type last_modified: datetime.datetime
+
+    :param weak: If the ETag is weak
+    :type weak: bool
+
+    :return: A 304 response if the cached copy is still valid, otherwise ``None``
+    :rtype: :class:`NotModifiedResponse <dragonfly.response.NotModifiedResponse>`
+    """
+    etag = None if etag is None else make_etag(etag, weak)
+    last_modified = None if last_modified is None else http_date(last_modified)
+
+    if not is_not_modified(etag, last_modified):
+        return None
+
+    response = NotModifiedResponse()
+
+    if etag is not None:
+        response.header('ETag', etag)
+
+    if last_modified is not None:
+        response.header('Last-Modified', last_modified)
+
+    return response
+
+
+def evaluate(response):
+    """
+    Replace the response with a 304 response if the browser's cached copy is still valid. This is done by the router for
+    every response.
+
+    :param response: The response returned by the controller
+    :type response: :class:`Response <dragonfly.response.Response>`
+
+    :return: The given response or a :class:`NotModifiedResponse <dragonfly.response.NotModifiedResponse>`
+    :rtype: :class:`Response <dragonfly.response.Response>`
+    """
+    if not response.status.startswith('200'):
+        return response
+
+    if is_not_modified(response.get_header('ETag'), response.get_header('Last-Modified')):
+        return NotModifiedResponse(response)
+
+    return response
@@ -1,6 +1,10 @@
-PYTHON_TO_REGEX = {"int": "([0-9]+)", "str": "(.+)"}
+PYTHON_TO_REGEX = {"int": "([0-9]+)", "str": "(.+)", "slug": "([-a-zA-Z0-9_]+)",
+                   "uuid": "([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})",
+                   "path": "(.+)"}
 METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']
 DATA_METHODS = ['POST', 'PUT', 'PATCH']
+# The methods a form can choose using a hidden '_method' input
+OVERRIDE_METHODS = ['PUT', 'PATCH', 'DELETE']
 REASON_PHRASES = {
     100: 'Continue',
     101: 'Switching Protocols',
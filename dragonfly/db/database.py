@@ -1,24 +1,90 @@
+import base64
+import binascii
+import functools
+import json
 import math
+import threading
+import time
 
 import MySQLdb.cursors
 
 from config import DATABASE
-from dragonfly.exceptions import MissingClause, MissingTable, InvalidOperator, ChunkOutOfRange
+from dragonfly.db.pool import get_pool
+from dragonfly.exceptions import MissingClause, MissingTable, InvalidOperator, ChunkOutOfRange, InvalidCursor
+
+# Cached row counts used by keyset pagination. Stored as {key: (expires at, count)}.
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+COUNT_CACHE_SIZE = 1024
+
+# The generated SQL is cached by the shape of the query (table, columns and operators) so repeated queries that only
+# differ in their values do not rebuild the SQL.
+STATEMENT_CACHE_SIZE = 512
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _select_clause(columns):
+    return f"SELECT {', '.join(columns)}"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _where_clause(column, comparison_operator, n_values=None):
+    if n_values is None:
+        return f"WHERE {column} {comparison_operator} %s"
+
+    return f"WHERE {column} {comparison_operator} ({', '.join(['%s'] * n_values)})"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _multiple_where_clause(columns):
+    return f"WHERE {' AND '.join(f'{column} = %s' for column in columns)}"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _select_statement(select, table, where, limit=None):
+    statement = f"{select} FROM {table} {where}"
+
+    return statement if limit is None else f"{statement} LIMIT {limit}"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _update_statement(table, columns, where):
+    return f"UPDATE `{table}` SET {', '.join(f'{column} = %s' for column in columns)} {where}"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _delete_statement(table, where):
+    return f"DELETE FROM `{table}` {where}"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _insert_statement(table, columns, n_rows=1):
+    row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+
+    return f"INSERT INTO `{table}` ({', '.join(columns)}) VALUES {', '.join([row_placeholder] * n_rows)}"
 
 
 class DB:
     """An easy way to interact with the configured database."""
 
-    comparison_operators = ['=', '<=>', '<>', '!=', '>', '>=', '<', '<=', 'IN()', 'NOT', 'BETWEEN', 'IS NULL',
-                            'IS NOT NULL', 'LIKE', 'EXISTS']
+    comparison_operators = ['=', '<=>', '<>', '!=', '>', '>=', '<', '<=', 'IN()', 'IN', 'NOT IN', 'NOT', 'BETWEEN',
+                            'IS NULL', 'IS NOT NULL', 'LIKE', 'EXISTS']
+
+    # Operators that compare against a list of values
+    list_operators = ['IN', 'NOT IN']
 
-    def __init__(self, database_settings=DATABASE):
+    def __init__(self, database_settings=DATABASE, debug=False):
         """
         :param database_settings: The config for the database
         :type database_settings: dict
+
+        :param debug: If the last executed query should be stored in ``last_query``
+        :type debug: bool
         """
         self.__database_settings = database_settings
+        self.__debug = debug
         self.last_insert_id = None
+        self.last_query = None
 
         self.__query = {
             'select': 'SELECT *',
@@ -50,12 +116,7 @@ class DB:
         .. note:: If you would like to select all (``*``) columns then simply do not use the select argument when
         building your query.
         """
-        self.__query['select'] = f"SELECT "
-
-        for arg in args:
-            self.__query['select'] += f"{arg}, "
-
-        self.__query['select'] = self.__query['select'][:-2]
+        self.__query['select'] = _select_clause(args)
 
         return self
 
@@ -68,13 +129,19 @@ class DB:
         :param comparison_operator: The comparison operator, e.g ``=``
         :type comparison_operator: str
 
-        :param condition_2: The value to the right of the operator.
+        :param condition_2: The value to the right of the operator. For ``IN`` and ``NOT IN`` this should be a list.
         """
         if comparison_operator not in self.comparison_operators:
             raise InvalidOperator(f"Invalid comparison operator {comparison_operator} used")
 
-        self.__query['where'] = f"WHERE {condition_1} {comparison_operator} %s"
-        self.__query_params['where'] = [condition_2]
+        if comparison_operator in self.list_operators:
+            condition_2 = list(condition_2)
+
+            self.__query['where'] = _where_clause(condition_1, comparison_operator, len(condition_2))
+            self.__query_params['where'] = condition_2
+        else:
+            self.__query['where'] = _where_clause(condition_1, comparison_operator)
+            self.__query_params['where'] = [condition_2]
 
         return self
 
@@ -85,12 +152,7 @@ class DB:
         :param where_dict: The values to match
         :type where_dict: dict
         """
-        to_append = ''
-
-        for key, value in where_dict.items():
-            to_append += f"{key} = %s AND "
-
-        self.__query['where'] = f"WHERE {to_append[:-4]}"
+        self.__query['where'] = _multiple_where_clause(tuple(where_dict))
         self.__query_params['where'] = list(where_dict.values())
 
         return self
@@ -100,7 +162,7 @@ class DB:
         """This will execute the developer defined query and return all results."""
         self.__validate(['select'])
 
-        self.__generated_query = f"{self.__query['select']} FROM {self.__query['table']} {self.__query['where']}"
+        self.__generated_query = _select_statement(self.__query['select'], self.__query['table'], self.__query['where'])
         self.__generated_params = self.__query_params['where']
 
         return self.__execute_sql()
@@ -109,11 +171,40 @@ class DB:
         """This will execute the developer defined query and return only the first result (uses ``LIMIT 1``)"""
         self.__validate(['select'])
 
-        self.__generated_query = f"{self.__query['select']} FROM {self.__query['table']} {self.__query['where']}"
+        self.__generated_query = _select_statement(self.__query['select'], self.__query['table'], self.__query['where'],
+                                                   1)
         self.__generated_params = self.__query_params['where']
 
         return self.__execute_sql(1)
 
+    def iterate(self, batch_size=1000):
+        """
+        This will execute the developer defined query and return a generator that yields the results one at a time.
+
+        An unbuffered (server-side) cursor is used and rows are fetched ``batch_size`` at a time, so the memory used
+        does not depend on the number of rows returned. The connection is held until the generator is exhausted or
+        closed. If it is closed before every row has been read the connection is closed rather than returned to the
+        pool, as the unread rows would otherwise have to be read from the server.
+
+        :example:
+            ``for row in DB().table('articles').iterate():``
+
+        :param batch_size: The number of rows fetched from the server at once
+        :type batch_size: int
+
+        :return: A generator of rows
+        :rtype: generator
+        """
+        self.__validate(['select'])
+
+        query = _select_statement(self.__query['select'], self.__query['table'], self.__query['where'])
+        params = self.__query_params['where']
+
+        # The query is built now (not when iteration starts) so this object can be reused straight away
+        self.__reset()
+
+        return self.__stream(query, params, batch_size)
+
     def chunk(self, chunk_loc, chunk_size):
         """
         This will run the given query and return the given number of results at the given location.
@@ -162,6 +253,142 @@ class DB:
                 'to': max_id - 1}
         return self.__execute_sql(), meta
 
+    def keyset_chunk(self, chunk_size, after=None, before=None, cursor=None, key='id', total=None, total_ttl=60):
+        """
+        Returns the given number of results that come after (or before) the given key value.
+
+        Unlike :meth:`chunk<dragonfly.db.database.DB.chunk>` only one indexed range query is run per page, meaning the
+        cost of fetching a page does not grow with the size of the table. The returned meta information contains opaque
+        ``next_cursor`` and ``prev_cursor`` values that can be passed back in as ``cursor`` to fetch the neighbouring
+        pages.
+
+        :example:
+            ``DB().table('articles').keyset_chunk(20, after=40)``
+
+        :param chunk_size: The number of rows each chunk should contain.
+        :type chunk_size: int
+
+        :param after: Only return rows where the key is greater than this value.
+
+        :param before: Only return rows where the key is less than this value.
+
+        :param cursor: A cursor returned in the meta information of a previous call. Overrides ``after`` and ``before``.
+        :type cursor: str
+
+        :param key: The (unique, indexed) column to order and paginate by. This must be selected.
+        :type key: str
+
+        :param total: If a total should be included in the meta information. Either ``None`` (no total), ``'cached'``
+        (an exact count cached for ``total_ttl`` seconds) or ``'approximate'`` (the table statistics estimate, only
+        available if no where clause has been set).
+        :type total: str
+
+        :param total_ttl: The number of seconds a cached total is valid for.
+        :type total_ttl: int
+
+        :return: A tuple containing the rows and a dictionary of meta information
+        :rtype: tuple
+        """
+        self.__validate(['select'])
+
+        if cursor is not None:
+            after, before = self.decode_cursor(cursor)
+
+        if after is not None and before is not None:
+            raise ValueError("Only one of 'after' and 'before' can be given")
+
+        select = self.__query['select']
+        where = self.__query['where']
+        where_params = list(self.__query_params['where'])
+
+        meta = {'per_page': chunk_size}
+
+        if total is not None:
+            meta['total'] = self.__count(where, where_params, total == 'approximate', total_ttl)
+
+        backwards = before is not None
+        params = where_params
+
+        if after is not None or backwards:
+            condition = f"{key} < %s" if backwards else f"{key} > %s"
+            where = f"{where} AND {condition}" if bool(where) else f"WHERE {condition}"
+            params = where_params + [before if backwards else after]
+
+        # Fetch one extra row to find out if there is another page without running a count
+        self.__generated_query = f"{select} FROM `{self.__query['table']}` {where} " \
+                                 f"ORDER BY {key} {'DESC' if backwards else 'ASC'} LIMIT {chunk_size + 1}"
+        self.__generated_params = params
+
+        rows = list(self.__execute_sql())
+        has_more = len(rows) > chunk_size
+        rows = rows[:chunk_size]
+
+        if backwards:
+            rows.reverse()
+
+        # Going forwards there is a previous page if we started after a row. Going backwards there is always a next page.
+        has_next = has_more if not backwards else True
+        has_prev = after is not None if not backwards else has_more
+
+        meta['next_cursor'] = self.encode_cursor(after=rows[-1][key]) if rows and has_next else None
+        meta['prev_cursor'] = self.encode_cursor(before=rows[0][key]) if rows and has_prev else None
+
+        return rows, meta
+
+    def count(self, cache_ttl=None, approximate=False):
+        """
+        Returns the number of rows that match the developer defined query.
+
+        :param cache_ttl: If given, the count is cached for this number of seconds.
+        :type cache_ttl: int
+
+        :param approximate: If the (fast but approximate) table statistics should be used. Only possible if no where
+        clause has been set.
+        :type approximate: bool
+
+        :return: The number of rows
+        :rtype: int
+        """
+        self.__validate([])
+
+        return self.__count(self.__query['where'], list(self.__query_params['where']), approximate, cache_ttl)
+
+    @staticmethod
+    def encode_cursor(after=None, before=None):
+        """
+        Generates an opaque cursor that can be passed to :meth:`keyset_chunk<dragonfly.db.database.DB.keyset_chunk>`.
+
+        :return: The cursor
+        :rtype: str
+        """
+        position = {'after': after} if before is None else {'before': before}
+
+        return base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Converts a cursor generated by :meth:`encode_cursor<dragonfly.db.database.DB.encode_cursor>` back to a tuple of
+        ``(after, before)``.
+
+        :param cursor: The cursor
+        :type cursor: str
+
+        :return: The ``after`` and ``before`` values
+        :rtype: tuple
+        """
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, AttributeError, binascii.Error):
+            raise InvalidCursor(f"{cursor} is not a valid cursor")
+
+        # A cursor that has been tampered with could contain anything, so only a single key value is accepted
+        if not isinstance(position, dict) or len(position) != 1 or not position.keys() <= {'after', 'before'} or \
+                not isinstance(next(iter(position.values())), (int, float, str)):
+            raise InvalidCursor(f"{cursor} is not a valid cursor")
+
+        return position.get('after'), position.get('before')
+
     def update(self, update_dict):
         """
         Updates the given row/rows based on the dictionary.
@@ -175,12 +402,7 @@ class DB:
 
         self.__validate(['where'])
 
-        self.__generated_query = f"UPDATE `{self.__query['table']}` SET "
-
-        for key, value in update_dict.items():
-            self.__generated_query += f"{key} = %s, "
-
-        self.__generated_query = f"{self.__generated_query[:-2]} {self.__query['where']}"
+        self.__generated_query = _update_statement(self.__query['table'], tuple(update_dict), self.__query['where'])
         self.__generated_params = list(update_dict.values()) + self.__query_params['where']
 
         return self.__execute_sql()
@@ -195,7 +417,7 @@ class DB:
 
         self.__validate(['where'])
 
-        self.__generated_query = f"DELETE FROM `{self.__query['table']}` {self.__query['where']}"
+        self.__generated_query = _delete_statement(self.__query['table'], self.__query['where'])
         self.__generated_params = self.__query_params['where']
 
         return self.__execute_sql()
@@ -208,19 +430,57 @@ class DB:
         :type insert_dict: dict
 
         """
-        keys = ''
-        values = ''
+        self.__generated_query = _insert_statement(self.__query['table'], tuple(insert_dict))
+        self.__generated_params = list(insert_dict.values())
 
-        for key in insert_dict.keys():
-            keys += f"{key}, "
-            values += '%s, '
+        return self.__execute_sql(insert=True)
 
-        self.__generated_query = f"INSERT INTO `{self.__query['table']}` ({keys[:-2]}) VALUES ({values[:-2]})"
-        self.__generated_params = list(insert_dict.values())
+    def insert_many(self, rows, batch_size=1000):
+        """
+        Inserts multiple rows into the database using one multi-row ``INSERT`` per batch.
 
-        return self.__execute_sql()
+        All of the rows must contain the same columns. After this method has run ``last_insert_id`` contains the id of
+        the first row in the final batch (as is the case with MySQL's ``LAST_INSERT_ID()``).
+
+        :example:
+            ``DB().table('articles').insert_many([{'title': 'First'}, {'title': 'Second'}])``
+
+        :param rows: A list of dictionaries containing the column and the value to insert into the specified table
+        :type rows: list
+
+        :param batch_size: The maximum number of rows sent in each ``INSERT``
+        :type batch_size: int
+
+        :return: A list containing the id of the first row inserted by each batch
+        :rtype: list
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1")
+
+        rows = list(rows)
+
+        if not rows:
+            return []
+
+        columns = tuple(rows[0].keys())
+
+        if any(row.keys() != rows[0].keys() for row in rows):
+            raise ValueError("All rows must contain the same columns")
 
-    def custom_sql(self, sql, n_rows=None):
+        first_ids = []
+
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+
+            self.__generated_query = _insert_statement(self.__query['table'], columns, len(batch))
+            self.__generated_params = [row[column] for row in batch for column in columns]
+
+            self.__execute_sql(insert=True)
+            first_ids.append(self.last_insert_id)
+
+        return first_ids
+
+    def custom_sql(self, sql, n_rows=None, params=None):
         """
         Execute the custom SQL passed to the function.
 
@@ -230,62 +490,142 @@ class DB:
         :param n_rows: The number of rows to retrieve. If set to `None` returns all rows
         :type n_rows: int
 
+        :param params: Any values to substitute into the ``%s`` placeholders in the SQL
+        :type params: list
+
         :return: The result of the SQL executed
         :rtype: dict
 
         """
 
-        db = MySQLdb.connect(**self.__database_settings, cursorclass=MySQLdb.cursors.DictCursor)
-        cursor = db.cursor()
+        with get_pool(self.__database_settings).connection() as db:
+            cursor = db.cursor()
 
-        cursor.execute(sql)
-        db.commit()
+            cursor.execute(sql, params)
 
-        if n_rows is None:
-            results = cursor.fetchall()
-        elif n_rows == 1:
-            results = cursor.fetchone()
-        else:
-            results = cursor.fetchmany(n_rows)
+            if n_rows is None:
+                results = cursor.fetchall()
+            elif n_rows == 1:
+                results = cursor.fetchone()
+            else:
+                results = cursor.fetchmany(n_rows)
 
-        cursor.close()
-        db.close()
+            cursor.close()
 
         return results
 
-    def __execute_sql(self, n_rows=None):
+    @staticmethod
+    def statement_cache_info():
+        """
+        How often the SQL generated for each type of statement is reused rather than generated again.
+
+        :return: The hits, misses and size of the cache for each type of statement
+        :rtype: dict
+        """
+        caches = {'select_clause': _select_clause, 'where_clause': _where_clause,
+                  'multiple_where_clause': _multiple_where_clause, 'select': _select_statement,
+                  'update': _update_statement, 'delete': _delete_statement, 'insert': _insert_statement}
+
+        return {name: cache.cache_info()._asdict() for name, cache in caches.items()}
+
+    def pool_info(self):
+        """
+        The size and usage of the connection pool used by this object. See
+        :meth:`ConnectionPool.pool_info <dragonfly.db.pool.ConnectionPool.pool_info>`.
+
+        :return: The number of connections and the counters of the pool
+        :rtype: dict
+        """
+        return get_pool(self.__database_settings).pool_info()
+
+    def __execute_sql(self, n_rows=None, insert=False):
         """
         Execute the user defined SQL.
 
         :param n_rows: The number of rows to retrieve. If set to `None` returns all rows
         :type: int
 
+        :param insert: If the query is an ``INSERT`` and thus the id of the new row should be stored
+        :type: bool
+
         :return: The result of the SQL executed
         :rtype: dict
         """
 
-        db = MySQLdb.connect(**self.__database_settings, cursorclass=MySQLdb.cursors.DictCursor)
-        cursor = db.cursor()
-        cursor.execute(self.__generated_query, self.__generated_params)
+        with get_pool(self.__database_settings).connection() as db:
+            cursor = db.cursor()
+            # Pooled connections use autocommit, so writes do not need a separate COMMIT
+            cursor.execute(self.__generated_query, self.__generated_params)
 
-        db.commit()
+            if n_rows is None:
+                results = cursor.fetchall()
+            elif n_rows == 1:
+                results = cursor.fetchone()
+            else:
+                results = cursor.fetchmany(n_rows)
 
-        if n_rows is None:
-            results = cursor.fetchall()
-        elif n_rows == 1:
-            results = cursor.fetchone()
-        else:
-            results = cursor.fetchmany(n_rows)
+            # Store the last inserted id (used in the model class). The cursor already knows this so no extra query is
+            # needed.
+            if insert:
+                self.last_insert_id = cursor.lastrowid
 
-        cursor.execute("SELECT LAST_INSERT_ID()")
+            if self.__debug:
+                self.last_query = cursor._last_executed
 
-        # Store the last inserted id and query. This is used in the model class.
-        self.last_insert_id = cursor.fetchone()['LAST_INSERT_ID()']
-        self.last_query = cursor._last_executed
+            cursor.close()
 
-        cursor.close()
-        db.close()
+        self.__reset()
 
+        return results
+
+    def __stream(self, query, params, batch_size):
+        """
+        Executes the given query using an unbuffered cursor and yields the results.
+
+        :param query: The SQL to execute
+        :type query: str
+
+        :param params: The parameters to pass to the query
+        :type params: list
+
+        :param batch_size: The number of rows fetched from the server at once
+        :type batch_size: int
+        """
+        pool = get_pool(self.__database_settings)
+        pooled = pool.acquire()
+        cursor = None
+
+        # If the rows have not all been read (the generator was closed early or an error occurred part way through) the
+        # connection still has a result set waiting. Draining it could mean reading millions of rows, so the connection
+        # is closed instead of being returned to the pool.
+        unread = False
+
+        try:
+            cursor = pooled.connection.cursor(MySQLdb.cursors.SSDictCursor)
+            cursor.execute(query, params)
+            unread = True
+
+            if self.__debug:
+                self.last_query = cursor._last_executed
+
+            rows = cursor.fetchmany(batch_size)
+
+            while rows:
+                yield from rows
+                rows = cursor.fetchmany(batch_size)
+
+            unread = False
+        finally:
+            try:
+                if cursor is not None and not unread:
+                    cursor.close()
+            finally:
+                # Releasing the connection ends any transaction the query ran in, so the next user does not read from
+                # an old snapshot
+                pool.release(pooled, discard=unread)
+
+    def __reset(self):
+        """Resets the developer defined query (apart from the table) so the object can be used for another query."""
         self.__query = {
             'table': self.__query['table'],
             'select': 'SELECT *',
@@ -299,7 +639,44 @@ class DB:
         self.__generated_params = None
         self.__generated_query = None
 
-        return results
+    def __count(self, where, where_params, approximate, cache_ttl):
+        """
+        Counts the rows in the table that match the given where clause, using the count cache if possible.
+
+        :return: The number of rows
+        :rtype: int
+        """
+        table = self.__query['table']
+        cache_key = (self.__database_settings.get('db'), table, where, repr(where_params), approximate)
+
+        if cache_ttl:
+            try:
+                expires, total = _count_cache[cache_key]
+                if expires > time.monotonic():
+                    self.__reset()
+                    return total
+            except KeyError:
+                pass
+
+        if approximate and not bool(where):
+            # InnoDB keeps an estimate of the number of rows. Reading it avoids a full index scan.
+            self.__generated_query = "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() " \
+                                     "AND TABLE_NAME = %s"
+            self.__generated_params = [table]
+            total = self.__execute_sql(1)['TABLE_ROWS']
+        else:
+            self.__generated_query = f"SELECT COUNT(*) FROM `{table}` {where}"
+            self.__generated_params = where_params
+            total = self.__execute_sql(1)['COUNT(*)']
+
+        if cache_ttl:
+            with _count_cache_lock:
+                if len(_count_cache) >= COUNT_CACHE_SIZE:
+                    _count_cache.clear()
+
+                _count_cache[cache_key] = (time.monotonic() + cache_ttl, total)
+
+        return total
 
     def __validate(self, required_parameters):
         """
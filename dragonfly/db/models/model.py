@@ -3,8 +3,10 @@ import json
 
 from dragonfly.db.database import DB
 from dragonfly.db.models.fields import PrimaryKey, IntField, TimestampField
+from dragonfly.db.models.relationships import Relationship
+from dragonfly.exceptions import InvalidCursor
 from dragonfly.request import request
-from dragonfly.response import Response
+from dragonfly.response import Response, ErrorResponse
 
 
 def default(o):
@@ -15,33 +17,83 @@ def default(o):
         return o.isoformat()
 
 
+def _auto_increment_step(db):
+    """
+    The gap between the ids given to the rows of a multi-row ``INSERT``, if MySQL guarantees they are evenly spaced.
+
+    With ``innodb_autoinc_lock_mode`` 0 (traditional) or 1 (consecutive) an ``INSERT`` with a known number of rows is
+    given a block of ids that are ``auto_increment_increment`` apart. With lock mode 2 (interleaved, the default since
+    MySQL 8.0) concurrent inserts can take ids from within the block.
+
+    :param db: The query builder to use
+    :type db: :class:`DB <dragonfly.db.database.DB>`
+
+    :return: ``auto_increment_increment`` or ``None`` if the ids are not guaranteed to be evenly spaced
+    :rtype: int
+    """
+    settings = db.custom_sql("SELECT @@innodb_autoinc_lock_mode AS lock_mode, @@auto_increment_increment AS step", 1)
+
+    return int(settings['step']) if int(settings['lock_mode']) in (0, 1) else None
+
+
+class FieldValue:
+    """
+    Replaces each field defined on a model class. The value of the field for a given row is stored in the row's
+    ``_values`` list at a position that is shared by every row of the model.
+
+    Accessing the attribute on the model class itself returns the original ``Field`` object.
+    """
+
+    __slots__ = ('field', 'index')
+
+    def __init__(self, field, index):
+        self.field = field
+        self.index = index
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.field
+
+        return instance._values[self.index]
+
+    def __set__(self, instance, value):
+        # Keep a copy of the values from the database the first time the row is modified
+        if instance._original is None:
+            instance._original = tuple(instance._values)
+
+        instance._values[self.index] = value
+
+
 class Model(object):
-    """A way to easily interact with rows in a table."""
+    """
+    A way to easily interact with rows in a table.
 
-    def __init__(self, data=None):
-        """
-        By providing data to the constructor the class is converted from an object that represents the Model's table to
-        a row in the Model's table.
+    Each row stores its values in a single list. A model that also declares ``__slots__ = ()`` does not give its rows a
+    ``__dict__`` (or ``__weakref__``), which makes each row smaller. Such a model can only store other values on its
+    rows if they are added to its ``__slots__``.
+    """
 
-        :param data: The data to initialise the class with if it represents a row in the database.
-        """
+    # Rows only store their values (in a list shared with the ``FieldValue`` descriptors), the values originally
+    # retrieved from the database (only once the row has been modified) and a few flags.
+    __slots__ = ('_values', '_original', '_relationships', '__has_select', '__is_row', '__db_builder', '__eager')
 
-        # If this value is true then any data returned from the database will not have all the model fields. As such a
-        # model instance cannot be created from that data. This field is thus needed to determine when this has happened
-        # and to return a dictionary of data instead of attempting (and failing) to instantiate a model for it.
-        self.__has_select = False
+    def __init_subclass__(cls, **kwargs):
+        """Introspects the fields and meta information of a newly defined model once, rather than on every instance."""
+        super().__init_subclass__(**kwargs)
+        cls.__build_schema()
 
-        # By default it is not a row
-        self.__is_row = False
+    @classmethod
+    def __build_schema(cls):
+        """
+        Retrieves the fields defined in the user defined model along with any data in its 'Meta' subclass and stores them
+        on the class. These are shared by every instance (and row) of the model.
+        """
 
         # Retrieve the types that were defined in the user defined model and set the primary key for the table
-        self.fields = {}
-        self.primary_key = []
-        self.__composite = False
+        fields = {}
+        primary_key = []
 
-        self._relationships = {}
-
-        for (key, value) in self.__class__.__dict__.items():
+        for (key, value) in cls.__dict__.items():
 
             # Make sure not an inbuilt method or in the 'Meta' subclass
             if not key.startswith("__") and not key == 'Meta':
@@ -49,79 +101,125 @@ class Model(object):
                 # Make sure not a function
                 if not callable(value):
                     # Must be a field type so add to types dictionary
-                    self.fields[key] = value
+                    fields[key] = value
 
                     # If the field has the 'primary_key' attribute set to true then add to list of primary keys
                     if value.default_parameters['primary_key']:
-                        self.primary_key.append(key)
+                        primary_key.append(key)
 
         # Retrieve all data from the 'Meta' subclass (if present)
-        self.meta = {}
+        meta = {}
 
         try:
-            for (key, value) in self.__class__.__dict__['Meta'].__dict__.items():
+            for (key, value) in cls.__dict__['Meta'].__dict__.items():
                 if not key.startswith("__"):
-                    self.meta[key] = value
+                    meta[key] = value
 
                     # Retrieve any defined primary keys in 'Meta' subclass. Note that this will override any field defined primary keys
                     if isinstance(value, PrimaryKey):
-                        self.primary_key = list(value.fields)
+                        primary_key = list(value.fields)
         except KeyError:
             pass
 
         try:
             # If the 'id' bool is defined and set to 'True' in 'Meta' class add id field
-            if self.meta['id'] is True:
-                self.fields['id'] = IntField(unsigned=True, auto_increment=True, primary_key=True)
-                self.primary_key.append('id')
+            if meta['id'] is True:
+                fields['id'] = IntField(unsigned=True, auto_increment=True, primary_key=True)
+                primary_key.append('id')
         except KeyError:
             # If 'id' bool is not present in 'Meta' class add id field (assuming id field is wanted by default)
-            self.fields['id'] = IntField(unsigned=True, auto_increment=True, primary_key=True)
-            self.primary_key.append('id')
+            fields['id'] = IntField(unsigned=True, auto_increment=True, primary_key=True)
+            primary_key.append('id')
 
         # The same as a above but for 'created_at' and 'updated_at' timestamps
         try:
-            if self.meta['timestamps'] is True:
-                self.fields['created_at'] = TimestampField(default='CURRENT_TIMESTAMP', null=False)
-                self.fields['updated_at'] = TimestampField(default='NOW()', on="UPDATE NOW()", null=False)
+            if meta['timestamps'] is True:
+                fields['created_at'] = TimestampField(default='CURRENT_TIMESTAMP', null=False)
+                fields['updated_at'] = TimestampField(default='NOW()', on="UPDATE NOW()", null=False)
         except KeyError:
-            self.fields['created_at'] = TimestampField(default='CURRENT_TIMESTAMP', null=False)
-            self.fields['updated_at'] = TimestampField(default='NOW()', on="UPDATE NOW()", null=False)
-
-        if len(self.primary_key) > 1:
-            self.__composite = True
+            fields['created_at'] = TimestampField(default='CURRENT_TIMESTAMP', null=False)
+            fields['updated_at'] = TimestampField(default='NOW()', on="UPDATE NOW()", null=False)
 
         # Generate the table name if it has not been defined
-        if 'table_name' not in self.meta.keys():
+        if 'table_name' not in meta.keys():
             # TODO split at capital and add underscore
-            self.meta['table_name'] = self.__class__.__name__.lower() + 's'
+            meta['table_name'] = cls.__name__.lower() + 's'
+
+        meta['primary_key'] = primary_key
 
-        self.meta['primary_key'] = self.primary_key
+        cls.fields = fields
+        cls.primary_key = primary_key
+        cls.meta = meta
+        cls.__composite = len(primary_key) > 1
 
         # Shortcut
-        self.__fields_keys = self.fields.keys()
+        cls.__fields_keys = fields.keys()
+
+        # Names of fields that can be missing from the data used to create a row
+        cls.__nullable = {key for key, value in fields.items() if value.default_parameters['null']}
+
+        # Replace the fields with descriptors that read and write the value stored in each row
+        for index, (key, value) in enumerate(fields.items()):
+            setattr(cls, key, FieldValue(value, index))
+
+    def __init__(self, data=None):
+        """
+        By providing data to the constructor the class is converted from an object that represents the Model's table to
+        a row in the Model's table.
+
+        The fields, primary key and meta information are shared by all instances of the model (see
+        ``__init_subclass__``), so an instance only stores its own values.
+
+        :param data: The data to initialise the class with if it represents a row in the database.
+        """
+
+        # If this value is true then any data returned from the database will not have all the model fields. As such a
+        # model instance cannot be created from that data. This field is thus needed to determine when this has happened
+        # and to return a dictionary of data instead of attempting (and failing) to instantiate a model for it.
+        self.__has_select = False
 
-        # Only used if class is a row
-        self._database_values = {}
-        self.__new_values = {}
+        # Created when first needed
+        self._relationships = None
+        self.__db_builder = None
 
-        # Default DB attributes to None
-        for key in self.__fields_keys:
-            setattr(self, key, None)
+        # Relationships to eager load (see `with_`)
+        self.__eager = ()
 
-        # Shortcut to interact with DB
-        self.__db = DB().table(self.meta['table_name'])
+        # Only set once a row has been modified (see ``FieldValue``)
+        self._original = None
 
         # Set the class attributes to the given data (if present), converting the class to a row
         if data is not None:
             self.__is_row = True
             self.__data_to_attributes(data)
+        else:
+            # By default it is not a row and all DB attributes are None
+            self.__is_row = False
+            self._values = [None] * len(self.__fields_keys)
+
+    @property
+    def __db(self):
+        """Shortcut to interact with DB"""
+        if self.__db_builder is None:
+            self.__db_builder = DB().table(self.meta['table_name'])
+
+        return self.__db_builder
+
+    @property
+    def _database_values(self):
+        """
+        The values of this row as they are in the database. These are used to retrieve the correct row when updating
+        the model.
+
+        :rtype: dict
+        """
+        return dict(zip(self.__fields_keys, self._values if self._original is None else self._original))
 
     def __str__(self):
         if self.__is_row:
             string = f"{self.__class__.__name__}\n"
-            for key in self.__fields_keys:
-                string += f"{key}: {self.__dict__[key]} \n"
+            for key, value in zip(self.__fields_keys, self._values):
+                string += f"{key}: {value} \n"
 
             return string
 
@@ -176,6 +274,68 @@ class Model(object):
 
         return self.__data_to_model([create_dict])[0]
 
+    def bulk_create(self, create_list, return_models=False, batch_size=1000):
+        """
+        Creates many new rows in the table using multi-row ``INSERT`` statements.
+
+        Unlike :meth:`create` no query is run per row. If ``return_models`` is ``True`` the new rows are read back with
+        a single query per batch (to retrieve any values generated by the database, e.g timestamps).
+
+        .. note::
+            The ids of the new rows can only be worked out from the first id of each ``INSERT`` if MySQL guarantees
+            they are evenly spaced (``innodb_autoinc_lock_mode`` 0 or 1). Otherwise (e.g. lock mode 2, the default
+            since MySQL 8.0, or Galera clusters) the rows are read back using a ``unique`` field given in every row,
+            or, if the model has no such field, each row is inserted on its own so that its id is known.
+
+        :param create_list: A list of dictionaries containing the values to create each new row with
+        :type create_list: list
+
+        :param return_models: If model representations of the new rows should be returned
+        :type return_models: bool
+
+        :param batch_size: The maximum number of rows inserted by each query
+        :type batch_size: int
+
+        :return: A list of object models if ``return_models`` is ``True``, otherwise ``None``
+        :rtype: list
+        """
+        create_list = list(create_list)
+
+        if return_models and self.__composite:
+            raise Exception("Models cannot be returned from a bulk create on a table with a composite key")
+
+        if not return_models:
+            self.__db.insert_many(create_list, batch_size)
+            return None
+
+        primary_key = self.primary_key[0]
+        step = _auto_increment_step(self.__db)
+
+        if step is not None:
+            first_ids = self.__db.insert_many(create_list, batch_size)
+
+            # The ids of each batch are evenly spaced, starting at the id returned for the batch
+            ids = [first_id + j * step for i, first_id in enumerate(first_ids)
+                   for j in range(len(create_list[i * batch_size:(i + 1) * batch_size]))]
+
+            return self.__data_to_model(self.__select_in(primary_key, ids, batch_size))
+
+        unique = next((key for key, field in self.fields.items() if field.default_parameters['unique'] and
+                       all(key in row for row in create_list)), None)
+
+        if unique is not None:
+            self.__db.insert_many(create_list, batch_size)
+
+            return self.__data_to_model(self.__select_in(unique, [row[unique] for row in create_list], batch_size))
+
+        ids = []
+
+        for row in create_list:
+            self.__db.insert(row)
+            ids.append(self.__db.last_insert_id)
+
+        return self.__data_to_model(self.__select_in(primary_key, ids, batch_size))
+
     def first(self):
         """
         Get the first row in the table.
@@ -194,6 +354,31 @@ class Model(object):
         """
         return self.__data_to_model(self.__db.get())
 
+    def iterate(self, batch_size=1000):
+        """
+        Lazily get all rows that match the query, one at a time. Useful when processing a large number of rows as only
+        ``batch_size`` rows are held in memory at once.
+
+        :param batch_size: The number of rows fetched from the database at once
+        :type batch_size: int
+
+        :return: A generator of object models (or dictionaries if :meth:`select` has been used)
+        :rtype: generator
+        """
+        if self.__is_row:
+            raise Exception("A data bound class cannot be rebound to more data")
+
+        # Relationships are not eager loaded for lazily retrieved rows
+        self.__eager = ()
+
+        rows = self.__db.iterate(batch_size)
+
+        if self.__has_select:
+            self.__has_select = False
+            return rows
+
+        return (self.__class__(row) for row in rows)
+
     def all(self):
         """
         Get all rows in the table .
@@ -240,6 +425,23 @@ class Model(object):
 
         return self
 
+    def with_(self, *args):
+        """
+        Eager load the given relationships for the rows retrieved by the query. Each relationship is retrieved with one
+        query for all of the rows (rather than one query per row) and cached on each row.
+
+        :example:
+            ``Article().with_('comments', 'user').get()``
+
+        :param args: The names of the methods on the model that define the relationships
+
+        :return: This model object
+        :rtype: :class:`Model <dragonfly.db.models.model.Model>`
+        """
+        self.__eager = args
+
+        return self
+
     def where(self, column, comparator, value):
         """
         Same as the :class:`DB <dragonfly.db.database.DB>` class :meth:`where <dragonfly.db.database.DB.where>` method.
@@ -275,7 +477,7 @@ class Model(object):
 
         return self
 
-    def paginate(self, size, to_json=False):
+    def paginate(self, size, to_json=False, keyset=False, total=None):
         """
         Paginates the data in the table by the given size.
 
@@ -283,24 +485,61 @@ class Model(object):
         of rows that correspond to the page requested will be returned (the page number is known from the request
         object).
 
+        If ``keyset`` is ``True`` the page is instead chosen using the ``cursor`` (or ``after``) value in the request and
+        only one query is run per page, no matter how large the table is. See :meth:`keyset_chunk<dragonfly.db.database.DB.keyset_chunk>`.
+        If the cursor is not valid (e.g. it has been changed by the client) a 400 :class:`ErrorResponse <dragonfly.response.ErrorResponse>`
+        is returned when ``to_json`` is ``True``, otherwise the first page is returned.
+
         :param size: The number of rows on each page
         :type size: int
 
         :param to_json: If the function should return a JSON response, default is False
         :type to_json: bool
 
+        :param keyset: If keyset (cursor based) pagination should be used, default is False
+        :type keyset: bool
+
+        :param total: Only used with keyset pagination. Either ``None``, ``'cached'`` or ``'approximate'``
+        :type total: str
+
         :return: A tuple containing a dictionary if results and a dictionary contaning meta information
         :rtype: tuple
 
         """
-        if not bool(request.get_data()):
-            page_number = 1
+        request_data = request.get_data()
+
+        if keyset:
+            cursor = request_data['cursor'][0] if 'cursor' in request_data else None
+            after = request_data['after'][0] if 'after' in request_data else None
+
+            before = None
+
+            if after is not None and after.isdigit():
+                after = int(after)
+
+            # The cursor comes from the client, so it is decoded here where an invalid one can be handled
+            if cursor is not None:
+                try:
+                    after, before = DB.decode_cursor(cursor)
+                except InvalidCursor:
+                    if to_json:
+                        self.__eager = ()
+                        return ErrorResponse("Invalid cursor", status_code=400)
+
+                    after = None
+
+            result, meta = self.__db.keyset_chunk(size, after=after, before=before, key=self.primary_key[0],
+                                                  total=total)
         else:
-            page_number = request.get_data()['page'][0]
+            if not bool(request_data):
+                page_number = 1
+            else:
+                page_number = request_data['page'][0]
 
-        result, meta = self.__db.chunk(int(page_number), size)
+            result, meta = self.__db.chunk(int(page_number), size)
 
         if result is None:
+            self.__eager = ()
             return None, None
 
         result = self.__data_to_model(result)
@@ -328,7 +567,7 @@ class Model(object):
             raise Exception("Mismatch between model defined columns and given columns")
 
         for key in update_dict.keys():
-            self.__dict__[key] = update_dict[key]
+            setattr(self, key, update_dict[key])
 
         self.save()
 
@@ -337,22 +576,39 @@ class Model(object):
     def save(self):
         """
         Permeate the changes made to the Python model to the database.
-        """
 
-        # Iterate over each new attribute (check if changed) and validate using Field class. Then save to DB
-        self.__new_values = {}
+        Only the columns that have changed since the row was retrieved (or last saved) are updated and the row is found
+        using its primary key. If nothing has changed no query is run.
+        """
+        if not self.__is_row:
+            raise Exception("A non data bound class cannot be saved")
 
-        for key in self.__fields_keys:
-            if self.__dict__[key] is not None:
-                self.__new_values[key] = self.__dict__[key]
+        changes = self.get_changes()
 
-        self._database_values = {k: v for k, v in self._database_values.items() if v is not None}
+        if changes:
+            self.__db.multiple_where(self.__primary_key_values()).update(changes)
 
-        self.__db.multiple_where(self._database_values).update(self.__new_values)
+        # The database now matches the current values
+        self._original = None
 
     def delete(self):
         """Delete this row from the database ."""
-        self.__db.multiple_where(self._database_values).delete()
+        if not self.__is_row:
+            raise Exception("A non data bound class cannot be deleted")
+
+        self.__db.multiple_where(self.__primary_key_values()).delete()
+
+    def get_changes(self):
+        """
+        Returns the fields that have been modified since the row was retrieved (or last saved).
+
+        :return: A dictionary containing the changed fields and their new values
+        :rtype: dict
+        """
+        if self._original is None:
+            return {}
+
+        return {key: new for key, old, new in zip(self.__fields_keys, self._original, self._values) if old != new}
 
     def to_dict(self):
         """
@@ -366,6 +622,22 @@ class Model(object):
 
         return self._database_values
 
+    def __select_in(self, column, values, batch_size):
+        """
+        Retrieve the rows where the given column has one of the given values, in the order they were inserted.
+
+        :return: The rows
+        :rtype: list
+        """
+        rows = []
+
+        for start in range(0, len(values), batch_size):
+            rows.extend(self.__db.custom_sql(
+                f"SELECT * FROM `{self.meta['table_name']}` WHERE `{column}` IN %s ORDER BY `{self.primary_key[0]}`",
+                params=[tuple(values[start:start + batch_size])]))
+
+        return rows
+
     def __data_to_model(self, data):
         """Starts the process of converting data from the database to model instances.
 
@@ -376,6 +648,10 @@ class Model(object):
         :rtype: list
         """
 
+        # The relationships given to `with_` only apply to this query, so they are reset like the query builder
+        eager = self.__eager
+        self.__eager = ()
+
         # Return a dict if true and thus not all fields present.
         if self.__has_select:
             self.__has_select = False
@@ -387,14 +663,46 @@ class Model(object):
         # Create new class instances passing in the given data
         collection = [self.__class__(row) for row in data]
 
+        if eager:
+            self.__eager_load(collection, eager)
+
         return collection
 
+    def __eager_load(self, collection, eager):
+        """
+        Retrieves the relationships given to `with_` for all of the given rows and caches them on each row.
+
+        :param collection: The rows to load the relationships for
+        :type collection: list
+
+        :param eager: The names of the relationships to load
+        :type eager: tuple
+        """
+        rows = [row for row in collection if row]
+
+        if not rows:
+            return
+
+        # Calling a relationship method on a model that is not bound to data returns the relationship itself
+        unbound = self.__class__()
+
+        for name in eager:
+            relationship = getattr(unbound, name)()
+
+            if not isinstance(relationship, Relationship):
+                raise Exception(f"{name} does not define a relationship")
+
+            for row, value in zip(rows, relationship.eager_load(rows, self.meta)):
+                if row._relationships is None:
+                    row._relationships = {}
+
+                row._relationships[relationship.target_name] = value
+
     def __data_to_attributes(self, data):
-        """Converts the given data to class attributes in the class instance.
+        """Converts the given data to the values of this row.
 
-        The given data (from the database) is first converted to its equivalent python type and then assigned to the
-        class dictionary as well as a ``database_values`` dictionary that is used to retrieve the correct row from the
-        database when updating the model.
+        The values are stored in a list in the same order as the model fields. The ``FieldValue`` descriptors on the
+        class use this order to give access to each value as an attribute.
 
         :param data: The data to assign to the model instance
         """
@@ -402,25 +710,35 @@ class Model(object):
         if not self.__is_row:
             raise Exception("A non data bound class cannot be bound to data without being converted")
 
-        for k, v in self.fields.items():
-            if v.default_parameters['null']:
-                if k not in data:
-                    data[k] = None
+        # In the future the to_python_type() method on each field class can be uses to convert to the correct type
+        # when the given DB package (e.g mysqldb) does not do it by default
+        try:
+            values = [data[key] for key in self.__fields_keys]
+            missing = 0
+        except KeyError:
+            # Nullable fields do not have to be present
+            values = [data.get(key) for key in self.__fields_keys]
+            missing = sum(1 for key in self.__fields_keys if key not in data)
+
+            if any(key not in data and key not in self.__nullable for key in self.__fields_keys):
+                raise Exception("Mismatch between model defined columns and database columns")
 
         # Ensure that the retrieved data and the defined model match
-        if not data.keys() == self.__fields_keys:
+        if len(data) + missing != len(values):
             raise Exception("Mismatch between model defined columns and database columns")
 
-        for key, value in self.fields.items():
-            # In the future the to_python_type() method on each field class can be uses to convert to the correct type
-            # when the given DB package (e.g mysqldb) does not do it by default
-            value = data[key]
+        self._values = values
 
-            # Assign the given data values to a class attribute (using __dict__)
-            self.__dict__[key] = value
+    def __primary_key_values(self):
+        """
+        Returns the values of the primary key(s) as they are in the database.
 
-            # Store a back up of the data values so the row can be found when updating the model
-            self._database_values[key] = value
+        :return: Dictionary containing the primary key(s) and their values.
+        :rtype: dict
+        """
+        database_values = self._database_values
+
+        return {key: database_values[key] for key in self.primary_key}
 
     def __get_field_values(self):
         """
@@ -429,17 +747,16 @@ class Model(object):
         :return: Dictionary containing the fields of the model and the values.
         :rtype: dict
         """
-        attributes = {}
-        for key in self.__fields_keys:
-            attributes[key] = self.__dict__[key]
-
-        return attributes
+        return dict(zip(self.__fields_keys, self._values))
 
     def add_relationship(self, relationship_class, update=False):
         """
         Adds a relationship to another model to this model instance using the relationship classes. Note that the method
         will cache the values of a relationship unless update is set to true.
 
+        If this model is not bound to data the relationship class is returned as it is. This is used to eager load
+        relationships (see :meth:`with_`).
+
         :param relationship_class: An instantiated relationship class.
         :type relationship_class: :class:`Relationship <dragonfly.db.models.relationships.Relationship>`
 
@@ -449,8 +766,14 @@ class Model(object):
         :return: The retrieved, related, model(s).
         :rtype: :class:`Relationship <dragonfly.db.models.relationships.Relationship>`
         """
+        if not self.__is_row:
+            return relationship_class
+
         target_name = relationship_class.target_name
 
+        if self._relationships is None:
+            self._relationships = {}
+
         if update:
             self._relationships[target_name] = relationship_class.delayed_init(self._database_values,
                                                                                self.meta)
@@ -1,4 +1,5 @@
 import abc
+import copy
 import importlib
 
 from dragonfly.db.database import DB
@@ -34,6 +35,36 @@ class Relationship(abc.ABC):
         :rtype: :class:`Relationship <dragonfly.db.models.relationships.Relationship>`
         """
 
+    @abc.abstractmethod
+    def eager_load(cls, rows, meta):
+        """
+        This function is executed when the relationship is eager loaded for a list of rows. The related rows for all the
+        given rows are retrieved using a single query.
+
+        :param rows: The rows (model instances) to retrieve related data for
+        :type rows: list
+
+        :param meta: The meta values of the model
+        :type meta: dict
+
+        :return: A list containing what :meth:`delayed_init` would have returned for each row (in the same order)
+        :rtype: list
+        """
+
+    def _target_class(self):
+        """
+        Get the class of the target model.
+
+        :return: The target model class
+        :rtype: type
+        """
+        return getattr(importlib.import_module(f"models.{self.target_name}"), self.target_name.capitalize())
+
+    @staticmethod
+    def _unique(values):
+        """Returns the given values without duplicates or ``None`` (keeping their order)."""
+        return list(dict.fromkeys(value for value in values if value is not None))
+
 
 class HasMany(Relationship):
     """
@@ -51,8 +82,39 @@ class HasMany(Relationship):
         self.index = 0
 
         # Get the target model class
-        self.__target = getattr(importlib.import_module(f"models.{self.target_name}"), self.target_name.capitalize())()
+        self.__target = self._target_class()()
+
+        self.__generate_keys(meta)
+
+        self._values = self.__target.where(self._target_key, '=', values[self._this_key]).get()
+
+        return self
+
+    def eager_load(self, rows, meta):
+
+        self.__target = self._target_class()()
+
+        self.__generate_keys(meta)
+
+        keys = self._unique(getattr(row, self._this_key) for row in rows)
+        grouped = {key: [] for key in keys}
+
+        if keys:
+            for related in self.__target.where(self._target_key, 'IN', keys).get():
+                grouped[getattr(related, self._target_key)].append(related)
+
+        results = []
+
+        # Each row gets its own copy of this relationship so it can be iterated independently
+        for row in rows:
+            result = copy.copy(self)
+            result.index = 0
+            result._values = grouped.get(getattr(row, self._this_key), [])
+            results.append(result)
+
+        return results
 
+    def __generate_keys(self, meta):
         # If no target key (foreign key) has been given, generate from table name
         if self._target_key is None:
             self._target_key = meta['table_name'][:-1] + '_id'
@@ -61,10 +123,6 @@ class HasMany(Relationship):
         if self._this_key is None:
             self._this_key = meta['primary_key'][0]
 
-        self._values = self.__target.where(self._target_key, '=', values[self._this_key]).get()
-
-        return self
-
     def __iter__(self):
         return self
 
@@ -99,9 +157,32 @@ class BelongsTo(Relationship):
 
     def delayed_init(self, values, meta):
 
-        self.__target = getattr(importlib.import_module(f"models.{self.target_name}"), self.target_name.capitalize())(
-        )
+        self.__target = self._target_class()()
+
+        self.__generate_keys()
+
+        self._values = self.__target.where(self._target_key, '=', values[self._this_key]).first()
+
+        return self._values
+
+    def eager_load(self, rows, meta):
+
+        target_class = self._target_class()
+        self.__target = target_class()
+
+        self.__generate_keys()
+
+        keys = self._unique(getattr(row, self._this_key) for row in rows)
+        owners = {}
+
+        if keys:
+            owners = {getattr(owner, self._target_key): owner for owner in
+                      self.__target.where(self._target_key, 'IN', keys).get()}
 
+        # Rows without an owner get an unbound model, as is the case for `delayed_init`
+        return [owners.get(getattr(row, self._this_key)) or target_class() for row in rows]
+
+    def __generate_keys(self):
         # The primary key of this target model
         if self._target_key is None:
             self._target_key = self.__target.primary_key[0]
@@ -110,10 +191,6 @@ class BelongsTo(Relationship):
         if self._this_key is None:
             self._this_key = self.__target.meta['table_name'][:-1] + '_id'
 
-        self._values = self.__target.where(self._target_key, '=', values[self._this_key]).first()
-
-        return self._values
-
     def __bool__(self):
         return len(self._values) != 0
 
@@ -133,13 +210,59 @@ class ManyToMany(Relationship):
 
         self.__index = 0
 
+        sql = self.__generate_sql(meta)
+
+        # Select all the columns in the target model table where the primary key is equal to one of the keys in the
+        # pivot table where the other key is equal to the id of this model.
+        res = DB().custom_sql(f"{sql} = %s", params=[values[meta['primary_key'][0]]])
+
+        self._values = [self.__target_pre_init(data=row) for row in res]
+
+        return self
+
+    def eager_load(self, rows, meta):
+
+        sql = self.__generate_sql(meta, with_pivot_key=True)
+
+        keys = self._unique(getattr(row, meta['primary_key'][0]) for row in rows)
+        grouped = {key: [] for key in keys}
+
+        if keys:
+            res = DB().custom_sql(f"{sql} IN ({', '.join(['%s'] * len(keys))})", params=keys)
+
+            for data in res:
+                # The pivot key is not a field of the target model
+                key = data.pop('_pivot_key')
+                grouped[key].append(self.__target_pre_init(data=data))
+
+        results = []
+
+        for row in rows:
+            result = copy.copy(self)
+            result.__index = 0
+            result._values = grouped.get(getattr(row, meta['primary_key'][0]), [])
+            results.append(result)
+
+        return results
+
+    def __generate_sql(self, meta, with_pivot_key=False):
+        """
+        Generate the SQL that selects the target rows, up to (but not including) the comparison on the pivot table key.
+
+        :param meta: The meta values of the model
+        :type meta: dict
+
+        :param with_pivot_key: If the pivot table key should also be selected (as ``_pivot_key``)
+        :type with_pivot_key: bool
+
+        :return: The SQL
+        :rtype: str
+        """
         # Store target model before it is initialised
-        self.__target_pre_init = self.__target = getattr(importlib.import_module(f"models.{self.target_name}"),
-                                                     self.target_name.capitalize())
-        self.__target = self.__target_pre_init()
+        self.__target_pre_init = self._target_class()
 
-        target_table = self.__target.meta['table_name']
-        target_pk = self.__target.primary_key[0]
+        target_table = self.__target_pre_init.meta['table_name']
+        target_pk = self.__target_pre_init.primary_key[0]
 
         # Generate keys if not passed in by user
         if self._target_key is None:
@@ -154,17 +277,13 @@ class ManyToMany(Relationship):
             self.__table = "_".join(sorted(table_names))
 
         # List of all columns in the target model table.
-        columns = [f"{target_table}.{column}" for column in self.__target.fields_keys]
+        columns = [f"{target_table}.{column}" for column in self.__target_pre_init.fields.keys()]
 
-        # Select all the columns in the target model table where the primary key is equal to one of the keys in the
-        # pivot table where the other key is equal to the id of this model.
-        res = DB().custom_sql(
-            f"SELECT {', '.join(columns)} FROM {target_table} INNER JOIN {self.__table} ON {target_table}.{target_pk} "
-            f"= {self.__table}.{self._target_key} WHERE {self.__table}.{self._this_key} = {values[meta['primary_key'][0]]}")
+        if with_pivot_key:
+            columns.append(f"{self.__table}.{self._this_key} AS _pivot_key")
 
-        self.values = [self.__target_pre_init(data=row) for row in res]
-
-        return self
+        return f"SELECT {', '.join(columns)} FROM {target_table} INNER JOIN {self.__table} ON " \
+               f"{target_table}.{target_pk} = {self.__table}.{self._target_key} WHERE {self.__table}.{self._this_key}"
 
     def __iter__(self):
         return self
@@ -0,0 +1,356 @@
+import contextlib
+import threading
+import time
+from collections import deque
+
+import MySQLdb.cursors
+
+from config import DATABASE
+from dragonfly.exceptions import PoolExhausted
+
+# The settings used for a pool if they are not overridden by the 'pool' key in the database config.
+DEFAULT_POOL_SETTINGS = {
+    'min_size': 1,
+    'max_size': 10,
+    'idle_timeout': 300,
+    'max_lifetime': 3600,
+    'checkout_timeout': 30,
+    'ping_after_idle': 30
+}
+
+
+class PooledConnection:
+    """A connection stored in the :class:`ConnectionPool` along with the information needed to decide when to retire it."""
+
+    __slots__ = ('connection', 'created_at', 'last_used')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of database connections.
+
+    Connections are checked out using :meth:`connection` and returned to the pool once the ``with`` block exits, meaning
+    that a TCP connection and authentication handshake only happens when the pool has to grow.
+
+    Connections are opened in autocommit mode, so each statement is committed by the server without a separate
+    ``COMMIT``. A transaction can still be used by turning autocommit off (``db.autocommit(False)``) inside the ``with``
+    block. It is rolled back (and autocommit turned back on) if it has not been committed when the block exits.
+
+    :param connection_settings: The settings passed to ``MySQLdb.connect``
+    :type connection_settings: dict
+
+    :param min_size: The number of connections kept open even when idle
+    :type min_size: int
+
+    :param max_size: The maximum number of connections (idle and in use) the pool can hold
+    :type max_size: int
+
+    :param idle_timeout: The number of seconds a connection (above ``min_size``) can be idle before it is closed
+    :type idle_timeout: float
+
+    :param max_lifetime: The number of seconds after which a connection is closed and replaced. ``None`` disables this.
+    :type max_lifetime: float
+
+    :param checkout_timeout: The number of seconds to wait for a free connection before raising ``PoolExhausted``
+    :type checkout_timeout: float
+
+    :param ping_after_idle: Connections that have been idle for longer than this (in seconds) are checked (using
+    ``ping``) before they are handed out. Recently used connections are not checked, saving a round trip. ``None``
+    disables this.
+    :type ping_after_idle: float
+    """
+
+    def __init__(self, connection_settings, min_size=1, max_size=10, idle_timeout=300, max_lifetime=3600,
+                 checkout_timeout=30, ping_after_idle=30):
+
+        if max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size (min_size={min_size}, max_size={max_size})")
+
+        self.__connection_settings = connection_settings
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self.ping_after_idle = ping_after_idle
+
+        self.__condition = threading.Condition()
+
+        # Set by `close`, after which returned connections are closed rather than kept
+        self.closed = False
+
+        # Idle connections. The most recently returned connection is handed out first so that the least used connections
+        # go idle and can be closed.
+        self.__idle = deque()
+
+        # The number of open connections (both idle and checked out)
+        self.__size = 0
+
+        self.__stats = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'failed_health_checks': 0
+        }
+
+        with self.__condition:
+            for _ in range(min_size):
+                self.__size += 1
+                self.__idle.append(self.__connect())
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of a ``with`` block.
+
+        If autocommit was turned off inside the block, any uncommitted transaction is rolled back and autocommit is
+        turned back on, so the next user of the connection starts from a clean state. If this fails the connection is
+        assumed to be broken and is discarded instead of being returned to the pool.
+
+        :example:
+            ``with pool.connection() as db:``
+        """
+        pooled = self.acquire()
+
+        try:
+            yield pooled.connection
+        finally:
+            self.release(pooled)
+
+    def acquire(self):
+        """
+        Take a connection from the pool, opening a new one if none are idle and the pool is not full.
+
+        :return: The checked out connection
+        :rtype: :class:`PooledConnection <dragonfly.db.pool.PooledConnection>`
+        """
+        deadline = None if self.checkout_timeout is None else time.monotonic() + self.checkout_timeout
+        pooled = None
+        expired = []
+
+        try:
+            with self.__condition:
+                while True:
+                    expired.extend(self.__prune())
+
+                    if self.__idle:
+                        pooled = self.__idle.pop()
+                        break
+
+                    if self.__size < self.max_size:
+                        # Reserve the slot now so other threads cannot grow the pool past its maximum while this thread
+                        # connects outside of the lock.
+                        self.__size += 1
+                        break
+
+                    self.__stats['waits'] += 1
+                    remaining = None if deadline is None else deadline - time.monotonic()
+
+                    if remaining is not None and remaining <= 0:
+                        self.__stats['timeouts'] += 1
+                        raise PoolExhausted(f"No database connection became available within {self.checkout_timeout} "
+                                            f"seconds")
+
+                    self.__condition.wait(remaining)
+
+                self.__stats['checkouts'] += 1
+        finally:
+            # Closing a connection can be slow, so expired connections are closed once the lock has been released
+            for expired_connection in expired:
+                self.__close(expired_connection)
+
+        if pooled is not None and self.ping_after_idle is not None and \
+                time.monotonic() - pooled.last_used > self.ping_after_idle and not self.__is_healthy(pooled):
+            with self.__condition:
+                self.__stats['failed_health_checks'] += 1
+            self.__close(pooled)
+            pooled = None
+
+        if pooled is None:
+            try:
+                pooled = self.__connect()
+            except Exception:
+                # Give the reserved slot back
+                with self.__condition:
+                    self.__size -= 1
+                    self.__condition.notify()
+                raise
+
+        return pooled
+
+    def release(self, pooled, discard=False):
+        """
+        Return a connection to the pool. Any transaction left open is rolled back first (see :meth:`connection`).
+
+        :param pooled: The connection returned by :meth:`acquire`
+        :type pooled: :class:`PooledConnection <dragonfly.db.pool.PooledConnection>`
+
+        :param discard: If the connection should be closed rather than reused
+        :type discard: bool
+        """
+        if not discard and not self.__reset(pooled):
+            discard = True
+
+        pooled.last_used = time.monotonic()
+
+        with self.__condition:
+            keep = not (discard or self.closed or self.__is_expired(pooled, pooled.last_used))
+
+            if keep:
+                self.__idle.append(pooled)
+            else:
+                self.__size -= 1
+
+            self.__condition.notify()
+
+        if not keep:
+            self.__close(pooled)
+
+    def pool_info(self):
+        """
+        The size and usage of the pool.
+
+        :return: The number of connections (in total, idle and in use), the minimum and maximum size, and counts of the
+        connections created and closed, checkouts, waits for a connection, timeouts and failed health checks since the
+        pool was created
+        :rtype: dict
+        """
+        with self.__condition:
+            stats = dict(self.__stats)
+            stats['size'] = self.__size
+            stats['idle'] = len(self.__idle)
+            stats['in_use'] = self.__size - len(self.__idle)
+            stats['min_size'] = self.min_size
+            stats['max_size'] = self.max_size
+
+        return stats
+
+    def close(self):
+        """Close all idle connections. Connections that are checked out are closed when they are returned."""
+        with self.__condition:
+            self.closed = True
+
+            idle = list(self.__idle)
+            self.__idle.clear()
+            self.__size -= len(idle)
+            self.__condition.notify_all()
+
+        for pooled in idle:
+            self.__close(pooled)
+
+    def __prune(self):
+        """
+        Remove any idle connections that have expired from the pool. Must be called while holding the lock.
+
+        :return: The removed connections, which the caller should close once it has released the lock
+        :rtype: list
+        """
+        now = time.monotonic()
+        keep = deque()
+        expired = []
+
+        while self.__idle:
+            pooled = self.__idle.popleft()
+
+            idle_too_long = self.idle_timeout is not None and now - pooled.last_used > self.idle_timeout and \
+                self.__size > self.min_size
+
+            if idle_too_long or self.__is_expired(pooled, now):
+                expired.append(pooled)
+                self.__size -= 1
+            else:
+                keep.append(pooled)
+
+        self.__idle = keep
+
+        return expired
+
+    def __is_expired(self, pooled, now):
+        return self.max_lifetime is not None and now - pooled.created_at > self.max_lifetime
+
+    @staticmethod
+    def __reset(pooled):
+        """
+        End any transaction left open on the connection. With autocommit on (the normal case) there cannot be one, so
+        this does not need a round trip. The autocommit state is read from the last response sent by the server.
+
+        :return: If the connection can be reused
+        :rtype: bool
+        """
+        try:
+            if not pooled.connection.get_autocommit():
+                pooled.connection.rollback()
+                pooled.connection.autocommit(True)
+        except MySQLdb.Error:
+            return False
+
+        return True
+
+    @staticmethod
+    def __is_healthy(pooled):
+        try:
+            pooled.connection.ping()
+        except MySQLdb.Error:
+            return False
+
+        return True
+
+    def __connect(self):
+        connection = MySQLdb.connect(**{**self.__connection_settings, 'autocommit': True},
+                                     cursorclass=MySQLdb.cursors.DictCursor)
+
+        # The condition uses a re-entrant lock so this is safe whether or not the caller already holds it
+        with self.__condition:
+            self.__stats['created'] += 1
+
+        return PooledConnection(connection)
+
+    def __close(self, pooled):
+        try:
+            pooled.connection.close()
+        except MySQLdb.Error:
+            pass
+
+        with self.__condition:
+            self.__stats['closed'] += 1
+
+
+# Pools are shared across the whole process, one for each distinct set of connection settings.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database_settings=DATABASE):
+    """
+    Get the process-wide pool for the given database settings, creating it if needed.
+
+    Pool options can be set through a ``pool`` dictionary in the database settings (see ``DEFAULT_POOL_SETTINGS`` for
+    the available keys). All other keys are passed to ``MySQLdb.connect``.
+
+    :param database_settings: The config for the database
+    :type database_settings: dict
+
+    :return: The connection pool
+    :rtype: :class:`ConnectionPool <dragonfly.db.pool.ConnectionPool>`
+    """
+    connection_settings = {k: v for k, v in database_settings.items() if k != 'pool'}
+    key = repr(sorted(connection_settings.items()))
+
+    try:
+        return _pools[key]
+    except KeyError:
+        pass
+
+    with _pools_lock:
+        if key not in _pools:
+            pool_settings = {**DEFAULT_POOL_SETTINGS, **database_settings.get('pool', {})}
+            _pools[key] = ConnectionPool(connection_settings, **pool_settings)
+
+        return _pools[key]
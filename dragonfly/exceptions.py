@@ -20,3 +20,23 @@ class InvalidOperator(Exception):
 
 class ChunkOutOfRange(Exception):
     pass
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class RouterFrozen(Exception):
+    pass
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+class InvalidRequestBody(Exception):
+    pass
@@ -0,0 +1,248 @@
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+import config
+from dragonfly.request import request
+from dragonfly.response import StreamingResponse, FileResponse, NotModifiedResponse
+
+# Brotli is only used if it is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# The settings used if they are not overridden by the COMPRESSION dictionary in config.py
+DEFAULT_COMPRESSION_SETTINGS = {
+    # Responses smaller than this (in bytes) are not compressed as the saving is outweighed by the cost
+    'min_size': 500,
+    # The compression level for gzip (1-9) and brotli (0-11)
+    'gzip_level': 6,
+    'brotli_quality': 5,
+    # Only responses with one of these MIME types are compressed (images, video etc. are already compressed)
+    'content_types': ['text/html', 'text/plain', 'text/css', 'text/csv', 'text/xml', 'text/javascript',
+                      'application/javascript', 'application/json', 'application/xml', 'image/svg+xml'],
+    # The number of compressed bodies of cacheable responses that are kept
+    'cache_size': 256
+}
+
+
+def compress(content, encoding, settings):
+    """
+    Compress the given bytes.
+
+    :param content: The content to compress
+    :type content: bytes
+
+    :param encoding: Either 'br' or 'gzip'
+    :type encoding: str
+
+    :param settings: The compression settings
+    :type settings: dict
+
+    :return: The compressed content
+    :rtype: bytes
+    """
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings['brotli_quality'])
+
+    return gzip.compress(content, compresslevel=settings['gzip_level'])
+
+
+def compress_stream(chunks, encoding, settings):
+    """
+    Compress an iterable of bytes as it is iterated over.
+
+    :param chunks: The chunks to compress
+    :type chunks: iterable
+
+    :param encoding: Either 'br' or 'gzip'
+    :type encoding: str
+
+    :param settings: The compression settings
+    :type settings: dict
+
+    :return: A generator of the compressed chunks
+    :rtype: generator
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=settings['brotli_quality'])
+        process, finish = compressor.process, compressor.finish
+    else:
+        # A wbits value of 31 produces a gzip (rather than zlib) stream
+        compressor = zlib.compressobj(settings['gzip_level'], zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+
+    try:
+        for chunk in chunks:
+            compressed = process(chunk)
+
+            # The compressor buffers its output so most chunks produce nothing
+            if compressed:
+                yield compressed
+
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses using gzip or brotli (if the ``brotli`` package is installed), depending on what the client
+    accepts. To use it add ``'dragonfly.middleware.compression_middleware'`` as the last item of ``MIDDLEWARE`` in
+    ``config.py``, so it runs after any other middleware has modified the response.
+
+    Only responses with a MIME type in the ``content_types`` setting that are at least ``min_size`` bytes are compressed.
+    A :class:`StreamingResponse <dragonfly.response.StreamingResponse>` is compressed as it is sent. A
+    :class:`FileResponse <dragonfly.response.FileResponse>` is never compressed so the WSGI server can send it directly.
+
+    If a response is marked as cacheable (``response.cacheable = True``) its compressed body is cached, so a response
+    with the same content is only compressed once.
+    """
+
+    actions = '*'
+
+    def __init__(self):
+        self.settings = {**DEFAULT_COMPRESSION_SETTINGS, **getattr(config, 'COMPRESSION', {})}
+        self.content_types = frozenset(self.settings['content_types'])
+
+        self.__cache = OrderedDict()
+        self.__cache_lock = threading.Lock()
+        self.__cache_stats = {'hits': 0, 'misses': 0}
+
+    def before(self):
+        pass
+
+    def after(self, response):
+        if isinstance(response, FileResponse) or response.get_header('Content-Encoding') is not None:
+            return
+
+        content_type = response.get_header('Content-type')
+
+        # A 304 response must have the same Vary and ETag headers as the full response it replaces, so the type of the
+        # full response is checked
+        if isinstance(response, NotModifiedResponse):
+            content_type = response.replaced_content_type
+
+        content_type = (content_type or '').split(';', 1)[0].strip().lower()
+        if content_type not in self.content_types:
+            return
+
+        # The response differs depending on the Accept-Encoding header, so caches must store each version separately
+        vary = response.get_header('Vary')
+        if vary is None:
+            response.header('Vary', 'Accept-Encoding')
+        elif 'accept-encoding' not in vary.lower():
+            response.header('Vary', f"{vary}, Accept-Encoding")
+
+        encoding = self.negotiate(request.get_header('Accept-Encoding', ''))
+        if encoding is None:
+            return
+
+        # The compressed content is not byte for byte identical, so a strong ETag becomes weak. This is also done for
+        # 304 responses so they have the same ETag as the full response.
+        etag = response.get_header('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            response.header('ETag', 'W/' + etag)
+
+        if response.status[:3] in ('204', '304'):
+            return
+
+        if isinstance(response, StreamingResponse):
+            content_length = response.get_header('Content-Length')
+            if content_length is not None and int(content_length) < self.settings['min_size']:
+                return
+
+            response.remove_header('Content-Length')
+            response.stream(compress_stream(response.iter_content(), encoding, self.settings))
+        else:
+            if len(response.content) < self.settings['min_size']:
+                return
+
+            if getattr(response, 'cacheable', False):
+                response.content = self.__cached_compress(response.content, encoding)
+            else:
+                response.content = compress(response.content, encoding, self.settings)
+
+            response.header('Content-Length', str(len(response.content)))
+
+        response.header('Content-Encoding', encoding)
+
+    def negotiate(self, accept_encoding):
+        """
+        Choose the encoding to use from the ``Accept-Encoding`` header. Brotli is preferred over gzip when both are
+        accepted with the same quality.
+
+        :param accept_encoding: The value of the ``Accept-Encoding`` header
+        :type accept_encoding: str
+
+        :return: 'br', 'gzip' or ``None`` if the response should not be compressed
+        :rtype: str
+        """
+        qualities = {}
+
+        for coding in accept_encoding.split(','):
+            name, _, params = coding.partition(';')
+            name = name.strip().lower()
+
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+
+            if name:
+                qualities[name] = quality
+
+        available = ['br', 'gzip'] if brotli is not None else ['gzip']
+        wildcard = qualities.get('*', 0.0)
+
+        best, best_quality = None, 0.0
+        for encoding in available:
+            quality = qualities.get(encoding, wildcard)
+
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+
+        return best
+
+    def cache_info(self):
+        """
+        How often a compressed body is taken from the cache rather than compressed again.
+
+        :return: The number of hits, misses and the current size of the cache
+        :rtype: dict
+        """
+        with self.__cache_lock:
+            return {**self.__cache_stats, 'size': len(self.__cache), 'max_size': self.settings['cache_size']}
+
+    def __cached_compress(self, content, encoding):
+        """Compress the content, using the cache if the same content has already been compressed."""
+        # The key is a digest rather than the content itself so the uncompressed bodies are not kept in memory
+        key = (encoding, hashlib.sha1(content).digest())
+
+        with self.__cache_lock:
+            try:
+                compressed = self.__cache[key]
+                self.__cache.move_to_end(key)
+                self.__cache_stats['hits'] += 1
+
+                return compressed
+            except KeyError:
+                self.__cache_stats['misses'] += 1
+
+        compressed = compress(content, encoding, self.settings)
+
+        with self.__cache_lock:
+            self.__cache[key] = compressed
+
+            if len(self.__cache) > self.settings['cache_size']:
+                self.__cache.popitem(last=False)
+
+        return compressed
@@ -81,7 +81,7 @@ class MiddlewareController:
             for middleware in self.__cached_middleware[action]:
                 # Check if after function accepts a response. If it doesn't run without passing it in
                 try:
-                    middleware_response = middleware.after(Response)
+                    middleware_response = middleware.after(response)
                 except TypeError:
                     middleware_response = middleware.after()
 
@@ -94,7 +94,7 @@ class MiddlewareController:
 
         for middleware in self.__all_middleware:
             try:
-                middleware_response = middleware.after(Response)
+                middleware_response = middleware.after(response)
             except TypeError:
                 middleware_response = middleware.after()
 
@@ -0,0 +1,371 @@
+import shutil
+import tempfile
+from email.parser import HeaderParser
+from urllib import parse
+
+import config
+from dragonfly.exceptions import RequestTooLarge, InvalidRequestBody
+
+# The settings used to read request bodies if they are not overridden by the REQUEST dictionary in config.py
+DEFAULT_REQUEST_SETTINGS = {
+    # The largest body (in bytes) that will be read. Larger requests are rejected before any of the body is read.
+    'max_body_size': 10 * 1024 * 1024,
+    # Uploaded files larger than this (in bytes) are written to a temporary file rather than kept in memory
+    'spool_threshold': 512 * 1024,
+    # The number of bytes read from the WSGI server at a time
+    'chunk_size': 64 * 1024
+}
+
+# The largest the headers of a single part of a multipart body can be
+MAX_PART_HEADER_SIZE = 16 * 1024
+
+
+def request_settings():
+    """
+    Get the settings used to read request bodies.
+
+    :return: The default settings merged with the ``REQUEST`` dictionary in ``config.py`` (if it exists)
+    :rtype: dict
+    """
+    return {**DEFAULT_REQUEST_SETTINGS, **getattr(config, 'REQUEST', {})}
+
+
+class UploadedFile:
+    """
+    A file uploaded as part of a multipart form. This behaves like a (binary) file object, so it can be read, iterated
+    over or passed to anything that expects a file. Small files are kept in memory and larger files are stored in a
+    temporary file that is deleted once it is closed.
+
+    :param name: The name of the form field
+    :type name: str
+
+    :param filename: The name of the file on the user's computer
+    :type filename: str
+
+    :param content_type: The MIME type given by the browser
+    :type content_type: str
+
+    :param file: The file object containing the uploaded data
+    :type file: :class:`tempfile.SpooledTemporaryFile`
+
+    :param size: The size of the file in bytes
+    :type size: int
+    """
+
+    def __init__(self, name, filename, content_type, file, size):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.file = file
+        self.size = size
+
+    def save(self, destination, chunk_size=64 * 1024):
+        """
+        Write the uploaded file to the given path or file object without reading it all into memory.
+
+        :param destination: The path (or a binary file object) to write the file to
+        :type destination: str
+
+        :param chunk_size: The number of bytes copied at a time
+        :type chunk_size: int
+        """
+        self.file.seek(0)
+
+        if hasattr(destination, 'write'):
+            shutil.copyfileobj(self.file, destination, chunk_size)
+        else:
+            with open(destination, 'wb') as f:
+                shutil.copyfileobj(self.file, f, chunk_size)
+
+        self.file.seek(0)
+
+    def __getattr__(self, name):
+        # Any other attribute (read, seek, close...) is taken from the underlying file
+        return getattr(self.file, name)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.file.close()
+
+    def __repr__(self):
+        return f"<UploadedFile {self.name}: {self.filename} ({self.content_type}, {self.size} bytes)>"
+
+
+class BodyReader:
+    """
+    Reads the body of a request from ``wsgi.input``. No more than ``CONTENT_LENGTH`` bytes are read and if the body is
+    larger than the maximum size :class:`RequestTooLarge <dragonfly.exceptions.RequestTooLarge>` is raised before it is
+    read.
+
+    :param environ: The environ dictionary from the WSGI server
+    :type environ: dict
+
+    :param max_body_size: The largest body (in bytes) that can be read
+    :type max_body_size: int
+    """
+
+    def __init__(self, environ, max_body_size):
+        self.__stream = environ.get('wsgi.input')
+
+        try:
+            self.__remaining = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            raise InvalidRequestBody("Invalid Content-Length")
+
+        # A server that supports chunked requests marks the input as terminated, so it is safe to read until the end
+        if environ.get('CONTENT_LENGTH') in (None, '') and environ.get('wsgi.input_terminated'):
+            self.__remaining = None
+
+        if self.__remaining is not None and self.__remaining > max_body_size:
+            raise RequestTooLarge(f"The request body is larger than {max_body_size} bytes")
+
+        self.__max_body_size = max_body_size
+        self.__read = 0
+
+    def read(self, size):
+        """
+        Read up to the given number of bytes.
+
+        :param size: The maximum number of bytes to read
+        :type size: int
+
+        :return: The bytes read, which is empty once the whole body has been read
+        :rtype: bytes
+        """
+        if self.__stream is None:
+            return b''
+
+        if self.__remaining is not None:
+            size = min(size, self.__remaining)
+
+            if size <= 0:
+                return b''
+
+        data = self.__stream.read(size)
+        self.__read += len(data)
+
+        if self.__remaining is not None:
+            self.__remaining -= len(data)
+        elif self.__read > self.__max_body_size:
+            raise RequestTooLarge(f"The request body is larger than {self.__max_body_size} bytes")
+
+        return data
+
+    def read_all(self, chunk_size):
+        """
+        Read the rest of the body.
+
+        :param chunk_size: The number of bytes read at a time
+        :type chunk_size: int
+
+        :return: The body
+        :rtype: bytes
+        """
+        chunks = []
+
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return b''.join(chunks)
+
+            chunks.append(chunk)
+
+
+class MultipartParser:
+    """
+    A streaming parser for ``multipart/form-data`` bodies. The body is read in chunks so only the current chunk (and
+    any file parts below the spool threshold) are held in memory.
+
+    :param reader: The body of the request
+    :type reader: :class:`BodyReader`
+
+    :param boundary: The boundary given in the Content-Type header
+    :type boundary: str
+
+    :param spool_threshold: Files larger than this (in bytes) are written to a temporary file
+    :type spool_threshold: int
+
+    :param chunk_size: The number of bytes read at a time
+    :type chunk_size: int
+    """
+
+    def __init__(self, reader, boundary, spool_threshold, chunk_size):
+        self.__reader = reader
+        self.__delimiter = b'--' + boundary.encode('latin-1')
+        self.__spool_threshold = spool_threshold
+        self.__chunk_size = chunk_size
+
+        self.__buffer = b''
+
+    def parse(self):
+        """
+        Parse the body.
+
+        :return: A list of tuples containing the name and value of each part. The value is a ``str`` for normal fields
+        and an :class:`UploadedFile` for files.
+        :rtype: list
+        """
+        fields = []
+
+        # Skip anything before the first delimiter
+        self.__read_until(self.__delimiter, lambda data: None)
+
+        while self.__start_part():
+            headers = self.__read_headers()
+
+            disposition = headers.get_params(header='content-disposition')
+            if disposition is None or disposition[0][0] != 'form-data':
+                raise InvalidRequestBody("Each part of a multipart body must have a form-data Content-Disposition")
+
+            name = headers.get_param('name', header='content-disposition')
+            filename = headers.get_filename()
+
+            if filename is None:
+                value = bytearray()
+                self.__read_until(b'\r\n' + self.__delimiter, value.extend)
+
+                charset = headers.get_content_charset('utf-8')
+                fields.append((name, value.decode(charset, 'replace')))
+            else:
+                file = tempfile.SpooledTemporaryFile(max_size=self.__spool_threshold)
+                size = self.__read_until(b'\r\n' + self.__delimiter, file.write)
+                file.seek(0)
+
+                # Browsers send an empty part if no file was chosen
+                if filename == '' and size == 0:
+                    file.close()
+                    continue
+
+                fields.append((name, UploadedFile(name, filename, headers.get_content_type(), file, size)))
+
+        return fields
+
+    def __fill(self):
+        """Read the next chunk of the body into the buffer, returning ``False`` if the end of the body was reached."""
+        chunk = self.__reader.read(self.__chunk_size)
+
+        if not chunk:
+            return False
+
+        self.__buffer += chunk
+
+        return True
+
+    def __read_until(self, separator, write):
+        """
+        Pass the body to the given function until the separator is found. The separator is removed from the buffer.
+
+        :return: The number of bytes written
+        :rtype: int
+        """
+        written = 0
+
+        while True:
+            index = self.__buffer.find(separator)
+
+            if index != -1:
+                write(self.__buffer[:index])
+                self.__buffer = self.__buffer[index + len(separator):]
+
+                return written + index
+
+            # Keep enough of the buffer that a separator split across two chunks is still found
+            keep = len(separator) - 1
+            if len(self.__buffer) > keep:
+                write(self.__buffer[:-keep])
+                written += len(self.__buffer) - keep
+                self.__buffer = self.__buffer[-keep:]
+
+            if not self.__fill():
+                raise InvalidRequestBody("The multipart body ended unexpectedly")
+
+    def __start_part(self):
+        """Check what follows a delimiter, returning ``False`` if it is the final delimiter."""
+        while len(self.__buffer) < 2:
+            if not self.__fill():
+                raise InvalidRequestBody("The multipart body ended unexpectedly")
+
+        if self.__buffer.startswith(b'--'):
+            return False
+
+        if not self.__buffer.startswith(b'\r\n'):
+            raise InvalidRequestBody("Invalid multipart delimiter")
+
+        self.__buffer = self.__buffer[2:]
+
+        return True
+
+    def __read_headers(self):
+        """Read the headers of the current part."""
+        while True:
+            index = self.__buffer.find(b'\r\n\r\n')
+
+            if index != -1:
+                break
+
+            if len(self.__buffer) > MAX_PART_HEADER_SIZE:
+                raise InvalidRequestBody("The headers of a multipart part are too large")
+
+            if not self.__fill():
+                raise InvalidRequestBody("The multipart body ended unexpectedly")
+
+        headers = self.__buffer[:index].decode('utf-8', 'replace')
+        self.__buffer = self.__buffer[index + 4:]
+
+        return HeaderParser().parsestr(headers)
+
+
+def parse_form(environ, settings=None):
+    """
+    Parse the form data in the body of a request. Both ``application/x-www-form-urlencoded`` and ``multipart/form-data``
+    bodies are supported. Any other type of body is ignored.
+
+    :param environ: The environ dictionary from the WSGI server
+    :type environ: dict
+
+    :param settings: The settings used to read the body (see ``DEFAULT_REQUEST_SETTINGS``). Defaults to the settings
+    in ``config.py``.
+    :type settings: dict
+
+    :return: A dictionary of the fields. If a field is given more than once its value is a list.
+    :rtype: dict
+    """
+    settings = request_settings() if settings is None else {**DEFAULT_REQUEST_SETTINGS, **settings}
+
+    content_type = HeaderParser().parsestr(f"Content-Type: {environ.get('CONTENT_TYPE') or 'text/plain'}")
+    mime_type = content_type.get_content_type()
+
+    if mime_type == 'application/x-www-form-urlencoded':
+        reader = BodyReader(environ, settings['max_body_size'])
+        body = reader.read_all(settings['chunk_size']).decode('utf-8', 'replace')
+
+        fields = parse.parse_qsl(body, keep_blank_values=False)
+
+    elif mime_type == 'multipart/form-data':
+        boundary = content_type.get_param('boundary')
+
+        if not boundary:
+            raise InvalidRequestBody("A multipart body must have a boundary")
+
+        reader = BodyReader(environ, settings['max_body_size'])
+        fields = MultipartParser(reader, boundary, settings['spool_threshold'], settings['chunk_size']).parse()
+
+    else:
+        return {}
+
+    field_dict = {}
+
+    for name, value in fields:
+        if name not in field_dict:
+            field_dict[name] = value
+        elif isinstance(field_dict[name], list):
+            field_dict[name].append(value)
+        else:
+            field_dict[name] = [field_dict[name], value]
+
+    return field_dict
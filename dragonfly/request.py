@@ -1,12 +1,50 @@
-import cgi
+import contextvars
+import json
 from http.cookies import SimpleCookie
 from urllib import parse
 
 from dragonfly.constants import DATA_METHODS
+from dragonfly.exceptions import InvalidRequestBody
+from dragonfly.multipart import parse_form, request_settings, BodyReader
+from dragonfly.response import deferred_response
+
+# The function used to decode JSON request bodies. orjson is used if it is installed as it is much faster. This can be
+# replaced with any function that accepts bytes and raises a ``ValueError`` if they are not valid JSON.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+class cached_property:
+    """
+    A property that is only computed the first time it is accessed. The value is then stored on the instance (so it can
+    also be set or deleted like a normal attribute).
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        value = instance.__dict__[self.func.__name__] = self.func(instance)
+
+        return value
 
 
 class Request:
-    """The request object is a class representation of the WSGI environ dictionary"""
+    """
+    The request object is a class representation of the WSGI environ dictionary. A new instance is created for each
+    request, which is accessed through the :data:`request` proxy.
+
+    Only the path, method, query string and remote address are extracted when the request is created. The headers,
+    cookies, query arguments and data are parsed the first time they are used and then cached.
+    """
 
     def __init__(self, environ):
         """
@@ -24,32 +62,117 @@ class Request:
             self.method = environ.get('REQUEST_METHOD')
             self.query_string = environ.get('QUERY_STRING')
             self.remote_address = environ.get('REMOTE_ADDR')
+            self.environ = environ
+        else:
+            self.environ = None
 
-            # Store all items in environ dict which start with 'HTTP_'
-            self.headers = {k: v for k, v in environ.items() if k.startswith('HTTP_')}
+    @cached_property
+    def headers(self):
+        """All items in the environ dictionary which start with 'HTTP_'."""
+        if self.environ is None:
+            return {}
 
-            try:
-                # Try to get all the cookies in the eviron
-                cookie = SimpleCookie()
-                cookie.load(self.headers['HTTP_COOKIE'])
+        return {k: v for k, v in self.environ.items() if k.startswith('HTTP_')}
 
-                self.cookies = {k: v.value for k, v in cookie.items()}
-            except KeyError:
-                self.cookies = {}
+    @cached_property
+    def cookies(self):
+        """The cookies sent with the request."""
+        try:
+            # Try to get all the cookies in the environ
+            cookie = SimpleCookie()
+            cookie.load(self.environ['HTTP_COOKIE'])
 
-            self.wsgi = {'url_scheme': environ.get('wsgi.url_scheme'), 'input': environ.get('wsgi.input'),
-                         'errors': environ.get('wsgi.errors'), }
+            return {k: v.value for k, v in cookie.items()}
+        except (KeyError, TypeError):
+            return {}
 
-            self.base_uri = 'http://' + self.headers['HTTP_HOST']
-            self.uri = self.headers['HTTP_HOST'] + '/' + self.path
-            self.environ = environ
-        else:
-            self.environ = None
+    @cached_property
+    def args(self):
+        """The arguments in the query string. Each argument maps to a list of values."""
+        if not self.query_string:
+            return {}
+
+        return parse.parse_qs(self.query_string)
+
+    @cached_property
+    def wsgi(self):
+        """The WSGI specific values in the environ dictionary."""
+        return {'url_scheme': self.environ.get('wsgi.url_scheme'), 'input': self.environ.get('wsgi.input'),
+                'errors': self.environ.get('wsgi.errors'), }
+
+    @property
+    def base_uri(self):
+        return 'http://' + self.environ['HTTP_HOST']
+
+    @property
+    def uri(self):
+        return self.environ['HTTP_HOST'] + '/' + self.path
+
+    @property
+    def is_json(self):
+        """If the body of the request is JSON (the Content-Type is 'application/json' or ends with '+json')."""
+        if self.environ is None:
+            return False
+
+        mime_type = (self.environ.get('CONTENT_TYPE') or '').split(';', 1)[0].strip().lower()
+
+        return mime_type == 'application/json' or mime_type.endswith('+json')
+
+    @cached_property
+    def body(self):
+        """
+        The raw body of the request. No more than ``CONTENT_LENGTH`` bytes are read and
+        :class:`RequestTooLarge <dragonfly.exceptions.RequestTooLarge>` is raised if this is more than the maximum body
+        size. The body can only be read once, so this is empty if :meth:`get_data` has already parsed form data.
+        """
+        if self.environ is None:
+            return b''
+
+        settings = request_settings()
+
+        return BodyReader(self.environ, settings['max_body_size']).read_all(settings['chunk_size'])
+
+    @cached_property
+    def json(self):
+        """
+        The decoded JSON body of the request, or ``None`` if the body is not JSON (or is empty). The body is only
+        decoded once.
+        """
+        if not self.is_json or not self.body:
+            return None
+
+        try:
+            return json_loads(self.body)
+        except ValueError as e:
+            raise InvalidRequestBody(f"The request body is not valid JSON: {e}") from e
+
+    def get_header(self, name, default=None):
+        """
+        Get a single header without building the dictionary of all headers.
+
+        :param name: The name of the header e.g 'Accept-Encoding'
+        :type name: str
+
+        :param default: The value returned if the header was not sent
+        :type default: str
+
+        :return: The value of the header
+        :rtype: str
+        """
+        if self.environ is None:
+            return default
+
+        return self.environ.get('HTTP_' + name.upper().replace('-', '_'), default)
 
     def get_data(self):
         """
         Gets any from data/query strings from the given request
 
+        The body is read in chunks and any uploaded files are given as
+        :class:`UploadedFile <dragonfly.multipart.UploadedFile>` objects (see :func:`parse_form
+        <dragonfly.multipart.parse_form>`). If the body is a JSON object its keys and values are returned (any other
+        JSON value is only available through :attr:`json`).
+
         :return: A dictionary containing the given data
         :rtype: dict
         """
@@ -60,17 +183,12 @@ class Request:
         if self.environ is not None:
             if self.method in DATA_METHODS:
 
-                environ_copy = self.environ
-                environ_copy['QUERY_STRING'] = ''
-
-                # Get all field data and store in dict
-                field_storage = cgi.FieldStorage(fp=environ_copy['wsgi.input'], environ=environ_copy,
-                                                 keep_blank_values=False)
-
-                field_dict = {}
-
-                for key in field_storage.keys():
-                    field_dict[key] = field_storage[key].value
+                if self.is_json:
+                    data = self.json
+                    field_dict = dict(data) if isinstance(data, dict) else {}
+                else:
+                    # Get all field data and store in dict
+                    field_dict = parse_form(self.environ)
 
                 self.__field_dict = field_dict
 
@@ -78,8 +196,7 @@ class Request:
 
             # If get request may have query strings which need to be retrieved
             elif self.method == 'GET':
-                if self.query_string is not None:
-                    return parse.parse_qs(self.query_string)
+                return dict(self.args)
 
         return {}
 
@@ -90,8 +207,54 @@ class Request:
         :param new_environ: The new environ dictionary
         :type new_environ: dict
         """
-        # Reset request with new data
+        # Reset request with new data (including any cached values)
+        self.__dict__.clear()
         self.__init__(new_environ)
 
 
-request = Request(None)
+# The request being handled in the current context (thread or asyncio task)
+_current_request = contextvars.ContextVar('request')
+
+
+class RequestProxy:
+    """
+    Gives access to the :class:`Request` being handled in the current context. Each thread (or asyncio task) that calls
+    :meth:`update_environ` gets its own :class:`Request`, so many requests can be handled by one process at the same
+    time while the rest of the framework keeps using the module level ``request`` object.
+    """
+
+    def update_environ(self, new_environ):
+        """
+        Starts a new request in the current context. Any headers set on the
+        :class:`DeferredResponse <dragonfly.response.DeferredResponse>` for the previous request are also cleared.
+
+        :param new_environ: The new environ dictionary
+        :type new_environ: dict
+        """
+        _current_request.set(Request(new_environ))
+        deferred_response.reset()
+
+    def get_current_request(self):
+        """
+        Get the :class:`Request` being handled in the current context.
+
+        :return: The current request
+        :rtype: :class:`Request`
+        """
+        try:
+            return _current_request.get()
+        except LookupError:
+            # No request has been started in this context so use an empty one
+            current = Request(None)
+            _current_request.set(current)
+
+            return current
+
+    def __getattr__(self, name):
+        return getattr(self.get_current_request(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get_current_request(), name, value)
+
+
+request = RequestProxy()
@@ -1,3 +1,12 @@
+import contextvars
+import datetime
+import hashlib
+import mimetypes
+import os
+import re
+from email.utils import format_datetime
+from urllib.parse import quote
+
 from dragonfly.constants import REASON_PHRASES
 
 
@@ -20,6 +29,9 @@ class Response:
     :type reason_phrase: int
     """
 
+    # If the same content is likely to be sent again, allowing work done on it (e.g. compression) to be cached.
+    cacheable = False
+
     def __init__(self, content='', content_type='text/html', status_code=200, reason_phrase=None):
 
         self._content_type = content_type
@@ -78,6 +90,70 @@ class Response:
         else:
             self.headers[loc] = new_header
 
+    def get_header(self, field_name):
+        """
+        Get the value of a header.
+
+        :param field_name: The header field name.
+        :type field_name: str
+
+        :return: The value of the header or ``None`` if it has not been set
+        :rtype: str
+        """
+        field_name = field_name.lower()
+
+        return next((v for k, v in self.headers if k.lower() == field_name), None)
+
+    def remove_header(self, field_name):
+        """
+        Remove a header if it exists.
+
+        :param field_name: The header field name.
+        :type field_name: str
+        """
+        field_name = field_name.lower()
+        self.headers = [(k, v) for k, v in self.headers if k.lower() != field_name]
+
+    def set_etag(self, version=None, weak=False):
+        """
+        Set the ETag header, which allows the browser to make a conditional request (see :mod:`dragonfly.conditional`).
+
+        :param version: A value that changes whenever the content changes e.g. ``f"{article.id}-{article.updated_at}"``.
+        If left as ``None`` the ETag is a hash of the content.
+        :type version: str
+
+        :param weak: If the ETag is weak, meaning the content is equivalent (rather than identical) for the same ETag
+        :type weak: bool
+        """
+        self.header('ETag', make_etag(self.content if version is None else version, weak))
+
+    def set_last_modified(self, last_modified):
+        """
+        Set the Last-Modified header.
+
+        :param last_modified: When the content was last modified. A naive datetime is assumed to be in UTC.
+        :type last_modified: datetime.datetime
+        """
+        self.header('Last-Modified', http_date(last_modified))
+
+    def __call__(self, environ, start_response):
+        """
+        Allows the response to be returned from a WSGI application, e.g. ``return response(environ, start_response)``.
+        This must be used for :class:`StreamingResponse` and :class:`FileResponse`.
+
+        :param environ: The environ dictionary from the WSGI server.
+        :type environ: dict
+
+        :param start_response: The ``start_response`` function from the WSGI server.
+        :type start_response: callable
+
+        :return: An iterable of the body
+        :rtype: iterable
+        """
+        start_response(self.status, self.headers)
+
+        return [self.content]
+
     def translate_deferred(self, deferred):
         """
         Merges the given :class:`DeferredResponse<dragonfly.response.DeferredResponse>` object to this :class:`Response<dragonfly.response.Response>` instance.
@@ -129,6 +205,247 @@ class RedirectResponse(Response):
         self.header('Location', location)
 
 
+class StreamingResponse(Response):
+    """
+    A :class:`Response<dragonfly.response.Response>` object whose body is generated while it is sent, so large responses
+    (e.g. a CSV export) do not have to be held in memory.
+
+    If the length of the content is not given no Content-Length header is sent, which allows the WSGI server to use
+    chunked transfer encoding.
+
+    :param content: An iterable (e.g. a generator) of ``bytes`` or ``str``. Any ``str`` is encoded as UTF-8.
+    :type content: iterable
+
+    :param content_type: The MIME type. This defaults to 'text/html'.
+    :type content_type: str
+
+    :param status_code: The HTTP status code. This defaults to success (200).
+    :type status_code: int
+
+    :param reason_phrase: A written meaning of the HTTP status code.
+    :type reason_phrase: str
+
+    :param content_length: The length of the content in bytes, if it is known.
+    :type content_length: int
+    """
+
+    def __init__(self, content, content_type='text/html', status_code=200, reason_phrase=None, content_length=None):
+
+        self._content_type = content_type
+        self._original_content = content
+        self.content = content
+        self.status = None
+
+        self.set_status(status_code, reason_phrase)
+
+        self.headers = [('Content-type', self._content_type)]
+
+        if content_length is not None:
+            self.headers.append(('Content-Length', str(content_length)))
+
+    def set_content(self):
+        """The content is converted to bytes as it is sent (see :meth:`iter_content`)."""
+        pass
+
+    def iter_content(self):
+        """
+        Iterate over the content as ``bytes``.
+
+        :return: A generator of the content
+        :rtype: generator
+        """
+        # The content is read now (rather than when the generator starts) so it can be replaced using a generator that
+        # wraps this one (see :meth:`stream`)
+        return self.__encode(self._original_content)
+
+    @staticmethod
+    def __encode(content):
+        try:
+            for chunk in content:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+
+                if chunk:
+                    yield chunk
+        finally:
+            # Allows generators (and files) to clean up if the client disconnects
+            close = getattr(content, 'close', None)
+            if close is not None:
+                close()
+
+    def stream(self, content):
+        """
+        Replace the content that will be sent, e.g. with a generator that transforms :meth:`iter_content`.
+
+        :param content: An iterable of ``bytes`` or ``str``.
+        :type content: iterable
+        """
+        self._original_content = content
+        self.content = content
+
+    def __call__(self, environ, start_response):
+        start_response(self.status, self.headers)
+
+        return self.iter_content()
+
+
+class FileResponse(StreamingResponse):
+    """
+    A :class:`Response<dragonfly.response.Response>` object that sends a file. The file is read in chunks, or sent by the
+    WSGI server itself if it provides ``wsgi.file_wrapper`` (which may use ``sendfile``).
+
+    :param file: The path of the file or a file object opened in binary mode.
+    :type file: str
+
+    :param content_type: The MIME type. If left as ``None`` it is guessed from the file name.
+    :type content_type: str
+
+    :param filename: If given the file is sent as an attachment (a download) with this name.
+    :type filename: str
+
+    :param chunk_size: The number of bytes read at a time.
+    :type chunk_size: int
+    """
+
+    def __init__(self, file, content_type=None, filename=None, chunk_size=64 * 1024):
+
+        if isinstance(file, (str, os.PathLike)):
+            path = os.fspath(file)
+            file = open(path, 'rb')
+        else:
+            path = getattr(file, 'name', None)
+
+        if content_type is None:
+            guess_name = filename or (path if isinstance(path, str) else '')
+            content_type = mimetypes.guess_type(guess_name)[0] or 'application/octet-stream'
+
+        try:
+            content_length = os.fstat(file.fileno()).st_size - file.tell()
+        except (AttributeError, OSError):
+            content_length = None
+
+        self.__file = file
+        self.__chunk_size = chunk_size
+
+        super().__init__(iter(lambda: file.read(chunk_size), b''), content_type=content_type,
+                         content_length=content_length)
+
+        if filename is not None:
+            self.header('Content-Disposition', content_disposition(filename))
+
+    def iter_content(self):
+        return self.__close_after(super().iter_content())
+
+    def __close_after(self, content):
+        try:
+            yield from content
+        finally:
+            self.__file.close()
+
+    def __call__(self, environ, start_response):
+        start_response(self.status, self.headers)
+
+        file_wrapper = environ.get('wsgi.file_wrapper')
+
+        if file_wrapper is not None:
+            # The server closes the file once it has been sent
+            return file_wrapper(self.__file, self.__chunk_size)
+
+        return self.iter_content()
+
+
+class NotModifiedResponse(Response):
+    """
+    A :class:`Response<dragonfly.response.Response>` object that tells the browser its cached copy is still valid (304).
+
+    :param response: The response that would have been sent. Its validator and caching headers are kept. If not given
+    the full response is assumed to be HTML.
+    :type response: :class:`Response<dragonfly.response.Response>`
+    """
+
+    # The headers that must be sent with a 304 response if they would have been sent with the full response
+    KEPT_HEADERS = ('etag', 'last-modified', 'cache-control', 'expires', 'vary', 'content-location', 'date')
+
+    def __init__(self, response=None):
+        super().__init__(content_type='', status_code=304)
+
+        # A 304 response has no body
+        self.headers = []
+
+        # A 304 response has no Content-Type, but middleware (e.g. compression) needs the type of the full response to
+        # give the 304 the same headers
+        self.replaced_content_type = 'text/html'
+
+        if response is not None:
+            self.headers = [(k, v) for k, v in response.headers if k.lower() in self.KEPT_HEADERS]
+            self.replaced_content_type = response.get_header('Content-type') or ''
+
+
+def make_etag(value, weak=False):
+    """
+    Generate an ETag from the given value.
+
+    :param value: The content or a version key
+    :type value: bytes
+
+    :param weak: If the ETag is weak
+    :type weak: bool
+
+    :return: The ETag, including the quotes (and ``W/`` prefix if it is weak)
+    :rtype: str
+    """
+    if not isinstance(value, bytes):
+        value = str(value).encode('utf-8')
+
+    etag = '"' + hashlib.blake2b(value, digest_size=16).hexdigest() + '"'
+
+    return 'W/' + etag if weak else etag
+
+
+def http_date(value):
+    """
+    Format a datetime (or timestamp) as a HTTP date e.g. 'Wed, 21 Oct 2015 07:28:00 GMT'.
+
+    :param value: The date. A naive datetime is assumed to be in UTC.
+    :type value: datetime.datetime
+
+    :return: The formatted date
+    :rtype: str
+    """
+    if isinstance(value, (int, float)):
+        value = datetime.datetime.fromtimestamp(value, datetime.timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+
+    return format_datetime(value.astimezone(datetime.timezone.utc), usegmt=True)
+
+
+def content_disposition(filename, disposition='attachment'):
+    """
+    Generate a ``Content-Disposition`` header value for the given file name (RFC 6266). Control characters (which would
+    allow header injection) are removed and quotes are escaped. A name that is not ASCII is also given using
+    ``filename*`` (RFC 5987), with an ASCII version in ``filename`` for older browsers.
+
+    :param filename: The name of the file
+    :type filename: str
+
+    :param disposition: Either 'attachment' or 'inline'
+    :type disposition: str
+
+    :return: The header value
+    :rtype: str
+    """
+    filename = re.sub(r'[\x00-\x1f\x7f]', '', filename)
+
+    ascii_filename = re.sub(r'[^\x20-\x7e]', '_', filename).replace('\\', '\\\\').replace('"', '\\"')
+    value = f'{disposition}; filename="{ascii_filename}"'
+
+    if not filename.isascii():
+        value += f"; filename*=UTF-8''{quote(filename, safe='')}"
+
+    return value
+
+
 class DeferredResponse:
     """
     Allows headers for a future response to be set before it exists.
@@ -136,14 +453,31 @@ class DeferredResponse:
     This singleton enables attributes of any :class:`Response<dragonfly.response.Response>` object returned in the normal fashion, i.e through the
     :meth:`dispatch_route<dragonfly.routes.router.Router.dispatch_route>` method, to be set before it exists. The primary use of this class would be in the `before` method
     of a middleware.
+
+    The headers are stored separately for each context (thread or asyncio task) so concurrent requests do not share them.
     """
 
     def __init__(self):
-        self.headers = {}
+        self.__headers = contextvars.ContextVar(f'deferred_headers_{id(self)}')
+
+    @property
+    def headers(self):
+        """The headers set in the current context."""
+        try:
+            return self.__headers.get()
+        except LookupError:
+            headers = {}
+            self.__headers.set(headers)
+
+            return headers
 
     def header(self, field_name, field_value):
         """Define the headers to be set on the real :class:`Response` object."""
         self.headers[field_name] = field_value
 
+    def reset(self):
+        """Clear the headers in the current context. This is done each time a new request starts."""
+        self.__headers.set({})
+
 
 deferred_response = DeferredResponse()
@@ -0,0 +1,353 @@
+import abc
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from dragonfly.request import request
+from dragonfly.response import Response, StreamingResponse
+
+
+class CacheBackend(abc.ABC):
+    """
+    The interface a storage backend for the :class:`ResponseCache` should have. A backend shared between processes (e.g.
+    one that uses memcached or Redis) can be used by implementing these methods. Keys are always strings and values are
+    tuples of strings, bytes and integers (so they can be pickled).
+    """
+
+    @abc.abstractmethod
+    def get(self, key):
+        """
+        Get a value.
+
+        :param key: The key of the value
+        :type key: str
+
+        :return: The value or ``None`` if it does not exist (or has expired)
+        """
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl=None):
+        """
+        Store a value.
+
+        :param key: The key of the value
+        :type key: str
+
+        :param value: The value to store
+
+        :param ttl: The number of seconds the value should be kept for. ``None`` means it does not expire.
+        :type ttl: float
+        """
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """
+        Delete a value if it exists.
+
+        :param key: The key of the value
+        :type key: str
+        """
+
+    def get_many(self, keys):
+        """
+        Get several values. Backends that can do this in one round trip (e.g. memcached's ``get_multi`` or Redis'
+        ``MGET``) should override it.
+
+        :param keys: The keys of the values
+        :type keys: list
+
+        :return: A list of the values (``None`` for any that do not exist), in the same order as the keys
+        :rtype: list
+        """
+        return [self.get(key) for key in keys]
+
+    def incr(self, key):
+        """
+        Increment an integer value (starting from 0). Backends that support this atomically should override it.
+
+        :param key: The key of the value
+        :type key: str
+
+        :return: The new value
+        :rtype: int
+        """
+        value = (self.get(key) or 0) + 1
+        self.set(key, value)
+
+        return value
+
+
+class MemoryBackend(CacheBackend):
+    """
+    A thread-safe, in-process LRU cache.
+
+    :param max_size: The maximum number of values kept. The least recently used value is removed once this is reached.
+    :type max_size: int
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+
+        # Stored as {key: (expires, value)}
+        self.__values = OrderedDict()
+        self.__lock = threading.Lock()
+
+        # Values created using `incr` (the version numbers) are kept separately so they are never removed. If they were,
+        # invalidated responses could be used again.
+        self.__counters = {}
+
+    def get(self, key):
+        with self.__lock:
+            if key in self.__counters:
+                return self.__counters[key]
+
+            try:
+                expires, value = self.__values[key]
+            except KeyError:
+                return None
+
+            if expires is not None and expires < time.monotonic():
+                del self.__values[key]
+                return None
+
+            self.__values.move_to_end(key)
+
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else time.monotonic() + ttl
+
+        with self.__lock:
+            self.__values[key] = (expires, value)
+            self.__values.move_to_end(key)
+
+            if len(self.__values) > self.max_size:
+                self.__values.popitem(last=False)
+
+    def delete(self, key):
+        with self.__lock:
+            self.__values.pop(key, None)
+
+    def incr(self, key):
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + 1
+
+            return self.__counters[key]
+
+    def __len__(self):
+        return len(self.__values)
+
+
+class CacheRule:
+    """
+    How the responses of an action are cached.
+
+    :param ttl: The number of seconds a response is cached for
+    :type ttl: float
+
+    :param vary_cookies: The names of the cookies that change the response (e.g. 'session_id' for a page that shows the
+    logged in user)
+    :type vary_cookies: list
+
+    :param vary_headers: The names of the headers that change the response (e.g. 'Accept-Language')
+    :type vary_headers: list
+
+    :param vary_query: If the query string changes the response. This can also be a list of the query arguments that
+    change the response, in which case any others are ignored.
+    :type vary_query: bool
+    """
+
+    __slots__ = ('ttl', 'vary_cookies', 'vary_headers', 'vary_query')
+
+    def __init__(self, ttl, vary_cookies=(), vary_headers=(), vary_query=True):
+        self.ttl = ttl
+        self.vary_cookies = tuple(vary_cookies)
+        self.vary_headers = tuple(vary_headers)
+        self.vary_query = vary_query if isinstance(vary_query, bool) else tuple(vary_query)
+
+
+class ResponseCache:
+    """
+    Caches the full responses of actions, so a cached page does not run the controller, database queries or the
+    template. Only successful ``GET`` responses that do not set a cookie are cached. The ``before`` and ``after`` methods
+    of any middleware still run for cached responses.
+
+    A ``Vary`` header listing the headers (and ``Cookie`` if any cookies) a response varies by is added when it is
+    cached, so shared caches (e.g. a CDN) also store each version separately.
+
+    Entries are invalidated by increasing a version number (stored in the backend) that forms part of each key, so
+    invalidation also works with a backend shared between processes. Old entries are left to expire. A backend must not
+    remove the version numbers before the entries that use them have expired.
+
+    :param backend: Where the responses are stored. Defaults to a :class:`MemoryBackend`.
+    :type backend: :class:`CacheBackend`
+
+    :param prefix: The prefix of every key stored in the backend
+    :type prefix: str
+    """
+
+    def __init__(self, backend=None, prefix='dragonfly:response:'):
+        self.backend = MemoryBackend() if backend is None else backend
+        self.prefix = prefix
+
+        # Stored as {action: CacheRule}
+        self.__rules = {}
+
+        self.__stats_lock = threading.Lock()
+        self.__stats = {'hits': 0, 'misses': 0, 'stores': 0, 'invalidations': 0}
+
+    def add_rule(self, action, ttl, vary_cookies=(), vary_headers=(), vary_query=True):
+        """
+        Cache the responses of the given action. See :class:`CacheRule` for the parameters.
+
+        :param action: The action e.g 'ArticleController@index'
+        :type action: str
+        """
+        self.__rules[action] = CacheRule(ttl, vary_cookies, vary_headers, vary_query)
+
+    def remove_rule(self, action):
+        """Stop caching the responses of the given action."""
+        self.__rules.pop(action, None)
+
+    def is_cached(self, action):
+        """If responses of the given action are cached."""
+        return action in self.__rules
+
+    def get(self, action):
+        """
+        Get the cached response of the given action for the current request.
+
+        :param action: The action the request was routed to
+        :type action: str
+
+        :return: A copy of the cached response or ``None``
+        :rtype: :class:`Response <dragonfly.response.Response>`
+        """
+        rule = self.__rules.get(action)
+
+        if rule is None or request.method != 'GET':
+            return None
+
+        value = self.backend.get(self.__key(action, rule))
+
+        with self.__stats_lock:
+            self.__stats['hits' if value is not None else 'misses'] += 1
+
+        if value is None:
+            return None
+
+        status, headers, content = value
+
+        response = Response()
+        response.status = status
+        response.headers = list(headers)
+        response.content = content
+        response.cacheable = True
+
+        return response
+
+    def set(self, action, response):
+        """
+        Cache the response of the given action for the current request, if it can be cached.
+
+        :param action: The action the request was routed to
+        :type action: str
+
+        :param response: The response returned by the controller
+        :type response: :class:`Response <dragonfly.response.Response>`
+
+        :return: If the response was cached
+        :rtype: bool
+        """
+        rule = self.__rules.get(action)
+
+        if rule is None or request.method != 'GET' or not response.status.startswith('200') or \
+                isinstance(response, StreamingResponse) or response.get_header('Set-Cookie') is not None:
+            return False
+
+        self.__add_vary(response, rule.vary_headers + (('Cookie',) if rule.vary_cookies else ()))
+
+        self.backend.set(self.__key(action, rule), (response.status, tuple(response.headers), response.content),
+                         rule.ttl)
+
+        # The response is likely to be sent again
+        response.cacheable = True
+
+        with self.__stats_lock:
+            self.__stats['stores'] += 1
+
+        return True
+
+    def invalidate(self, path=None, action=None):
+        """
+        Remove cached responses. If neither a path nor an action is given all cached responses are removed.
+
+        :param path: Remove all cached responses for this path (without the leading '/') e.g 'articles/1'
+        :type path: str
+
+        :param action: Remove all cached responses of this action e.g 'ArticleController@show'
+        :type action: str
+        """
+        if path is not None:
+            self.backend.incr(self.__version_key('path', path))
+
+        if action is not None:
+            self.backend.incr(self.__version_key('action', action))
+
+        if path is None and action is None:
+            self.backend.incr(self.__version_key('all', ''))
+
+        with self.__stats_lock:
+            self.__stats['invalidations'] += 1
+
+    def clear(self):
+        """Remove all cached responses."""
+        self.invalidate()
+
+    def cache_info(self):
+        """
+        How often a response is sent from the cache rather than generated by the controller.
+
+        :return: The number of hits, misses, stored responses and invalidations
+        :rtype: dict
+        """
+        with self.__stats_lock:
+            return dict(self.__stats)
+
+    @staticmethod
+    def __add_vary(response, names):
+        """Add the given header names to the response's ``Vary`` header (if they are not already in it)."""
+        vary = response.get_header('Vary')
+        existing = {name.strip().lower() for name in vary.split(',')} if vary else set()
+
+        missing = [name for name in names if name.lower() not in existing]
+
+        if missing:
+            response.header('Vary', ', '.join(([vary] if vary else []) + missing))
+
+    def __version_key(self, kind, name):
+        return f"{self.prefix}version:{kind}:{name}"
+
+    def __key(self, action, rule):
+        """Generate the key of the current request."""
+        path = request.path
+
+        # The version numbers are fetched together, so a networked backend only needs one round trip
+        versions = tuple(version or 0 for version in self.backend.get_many(
+            [self.__version_key('all', ''), self.__version_key('action', action), self.__version_key('path', path)]))
+
+        if rule.vary_query is True:
+            query = request.query_string or ''
+        elif rule.vary_query is False:
+            query = ''
+        else:
+            args = request.args
+            query = tuple((name, tuple(args.get(name, ()))) for name in rule.vary_query)
+
+        cookies = tuple(request.cookies.get(name) for name in rule.vary_cookies) if rule.vary_cookies else ()
+        headers = tuple(request.get_header(name) for name in rule.vary_headers)
+
+        key = repr((versions, action, path, query, cookies, headers)).encode('utf-8')
+
+        return self.prefix + hashlib.blake2b(key, digest_size=20).hexdigest()
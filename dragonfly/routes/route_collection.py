@@ -1,11 +1,92 @@
-from collections import defaultdict
-
 from dragonfly.constants import METHODS
-from dragonfly.routes.route_rule import RouteRule
+from dragonfly.routes.route_rule import RouteRule, SEGMENT_TYPES
 from dragonfly.exceptions import MethodDoesNotExist, InvalidControllerMethod
 
 import re
 
+# The format all actions must follow e.g 'HomeController@home'
+ACTION_REGEX = re.compile("(.+@.+)")
+
+# A slug of a URI that is a single route parameter e.g '<id:int>'
+PARAMETER_REGEX = re.compile("<([^<>:]+):([^<>]+)>")
+
+
+class RouteNode:
+    """
+    A node in the tree of dynamic routes. Each node represents one slug of a URL, either a static slug or a route
+    parameter that always matches exactly one slug (e.g. ``<id:int>``). A rule is stored on the node reached by its
+    slugs, up to the first slug that is neither (e.g. ``<name:str>``, which can contain a '/'). The rules on a node are
+    compiled into one regex.
+
+    :param depth: The number of static slugs before the first route parameter on the path to this node
+    :type depth: int
+    """
+
+    def __init__(self, depth=0):
+        self.children = {}
+
+        # The child for a slug matched by a route parameter
+        self.parameter = None
+
+        self.depth = depth
+        self.rules = []
+
+        # The compiled regex of all rules on this node and a mapping from the group index of each rule to the rule
+        self.__pattern = None
+        self.__groups = {}
+
+    def add(self, route_rule, action, order):
+        """
+        Add a rule to this node and recompile the regex.
+
+        :param route_rule: The rule to add
+        :type route_rule: :class:`RouteRule <dragonfly.routes.route_rule.RouteRule>`
+
+        :param action: The route action
+        :type action: str
+
+        :param order: The position of the rule in the order all rules were added
+        :type order: int
+        """
+        self.rules.append((route_rule, action, order))
+
+        alternatives = []
+        self.__groups = {}
+
+        # Each rule is wrapped in a group. The route parameters of the rule are the groups directly after it.
+        group = 1
+        for rule, rule_action, rule_order in self.rules:
+            alternatives.append(f"({rule.regex})")
+            self.__groups[group] = (rule, rule_action, rule_order)
+            group += rule.group_count + 1
+
+        self.__pattern = re.compile("|".join(alternatives))
+
+    def match(self, uri):
+        """
+        Match the URI against the rules on this node. The first rule (in the order they were added) to match is used.
+
+        :param uri: The URI to match
+        :type uri: str
+
+        :return: The order, rule, action and route parameters, or ``None`` if no rule matches
+        :rtype: tuple
+        """
+        if self.__pattern is None:
+            return None
+
+        match = self.__pattern.fullmatch(uri)
+
+        if match is None:
+            return None
+
+        # The group of the matching rule is the outermost group and thus the last to close
+        rule, action, order = self.__groups[match.lastindex]
+        start = match.lastindex + 1
+
+        return order, rule, action, rule.parameters([match.group(i) for i in range(start, start + rule.group_count)])
+
+
 class RouteCollection:
     """
     A way to store registered routes.
@@ -13,11 +94,17 @@ class RouteCollection:
 
     def __init__(self):
         self.__static_routes = {}
-        self.__dynamic_routes = defaultdict(dict)
+        self.__dynamic_routes = {}
+
+        # Descriptions of any routes that replaced a previously registered route
+        self.__replaced = []
+
+        # The number of dynamic routes added, which gives the order they were added in
+        self.__order = 0
 
         for method in METHODS:
             self.__static_routes[method] = {}
-            self.__dynamic_routes[method] = {}
+            self.__dynamic_routes[method] = RouteNode()
 
     def add(self, uri, action, method):
         """
@@ -33,49 +120,57 @@ class RouteCollection:
         :type method: str
         """
 
-        if method not in METHODS:
+        # A list of methods is primarily used for the `.any()` function on the router.
+        methods = METHODS if isinstance(method, list) else [method]
+
+        if any(method not in METHODS for method in methods):
             raise MethodDoesNotExist(f"{method} is not a valid HTTP method")
 
-        if re.fullmatch("(.+@.+)", action) is None:
+        if ACTION_REGEX.fullmatch(action) is None:
             raise InvalidControllerMethod(f"{action} does not conform to the controller method naming scheme. See docs "
                                           f"for more info")
 
         # Determine if the route is dynamic (contains a route parameter e.g <id:int> )
         if self.__is_dynamic(uri):
-            # Split url at '/' and '<'
-            url_list = uri.split('<', 1)[0].split('/')
-            del url_list[-1]
+            route_rule = RouteRule(uri)
+
+            for method in methods:
+                node = self.__dynamic_routes[method]
+
+                # If only static slugs have been found so far
+                static = True
 
-            # If we return a list of methods to add (this is primarily used for the `.any()` function on the router.
-            if isinstance(method, list):
-                route_rule = RouteRule(uri)
+                for slug in uri.split('/'):
+                    # Iterate over each slug of the URI and add a new node as a child of the previous node, until a slug
+                    # that can contain a '/' (or only part of which is a route parameter) is found
+                    if '<' not in slug:
+                        if slug not in node.children:
+                            node.children[slug] = RouteNode(node.depth + 1 if static else node.depth)
 
-                for method in METHODS:
-                    slug_dict = self.__dynamic_routes[method]
+                        node = node.children[slug]
+                    else:
+                        parameter = PARAMETER_REGEX.fullmatch(slug)
 
-                    for url in url_list:
-                        # Iterate over each part of url and add a new dictionary (as a value) to the previously defined
-                        # dictionary with the current url part as the key
-                        slug_dict = slug_dict.setdefault(url, {})
+                        if parameter is None or parameter.group(2) not in SEGMENT_TYPES:
+                            break
 
-                    # Store the route rule, as the key, in the final dictionary (that corresponds to the final slug in
-                    # the static part of the URL) with the value as the action it corresponds to
-                    slug_dict[route_rule] = action
-            else:
-                # Same as above but for one HTTP method
-                slug_dict = self.__dynamic_routes[method]
+                        if node.parameter is None:
+                            node.parameter = RouteNode(node.depth)
 
-                for url in url_list:
-                    slug_dict = slug_dict.setdefault(url, {})
+                        node = node.parameter
+                        static = False
 
-                slug_dict[RouteRule(uri)] = action
+                # Store the route rule in the node that corresponds to the last of these slugs
+                node.add(route_rule, action, self.__order)
+
+            self.__order += 1
 
         else:
-            if isinstance(method, list):
-                # Used for the `.any()` function on the router.
-                for method in METHODS:
-                    self.__static_routes[method][uri] = action
-            else:
+            for method in methods:
+                if uri in self.__static_routes[method]:
+                    self.__replaced.append(f"{method} '{uri}' ({self.__static_routes[method][uri]}) is replaced by "
+                                           f"{action}")
+
                 # Store the static route in a simple dictionary.
                 self.__static_routes[method][uri] = action
 
@@ -84,6 +179,10 @@ class RouteCollection:
         Match the given route using its URI and method. First we check if it is a static route before checking all
         dynamic routes.
 
+        The dynamic routes are stored in a tree, so only the rules on the nodes that match the slugs of the URI need to
+        be tried. The rule with the most static slugs before its first route parameter is used, followed by the rule that
+        was added first.
+
         :param uri: The URI to match
         :type uri: str
 
@@ -94,28 +193,115 @@ class RouteCollection:
         :type: dict
         """
 
-        # See if static route first before trying dynamic route dictionary
+        # See if static route first before trying dynamic route tree
         try:
             return self.__static_routes[method][uri], {}
         except KeyError:
-            url_list = uri.split('/')
-            slug_dict = self.__dynamic_routes[method]
-
-            # Iterate over each slug in the URL and find the corresponding dictionary until failure
-            for url in url_list:
-                try:
-                    slug_dict = slug_dict[url]
-                except KeyError:
-                    pass
-
-            for route, action in slug_dict.items():
-                # Ensure value found is a RouteRule (and not another dictionary)
-                if isinstance(route, RouteRule):
-                    match = route.match(uri)
-                    if match:
-                        return action, match
-
-            return None, {}
+            match = self.__match_dynamic(uri, method)
+
+            if match is None:
+                return None, {}
+
+            return match[2], match[3]
+
+    def routes(self):
+        """
+        Get every registered route.
+
+        :return: A generator of tuples containing the method, URI and action of each route
+        :rtype: generator
+        """
+        for method in METHODS:
+            for uri, action in self.__static_routes[method].items():
+                yield method, uri, action
+
+            for rule, action, order in sorted((rule for node in self.__nodes(method) for rule in node.rules),
+                                              key=lambda rule: rule[2]):
+                yield method, rule.uri, action
+
+    def conflicts(self):
+        """
+        Find any routes that can never be matched. This is either because the route was replaced by another static route
+        with the same URI or because another dynamic route (with at least as many static slugs before its first route
+        parameter, that was registered before it) matches the same URIs.
+
+        :return: A description of each conflict
+        :rtype: list
+        """
+        conflicts = list(self.__replaced)
+
+        for method in METHODS:
+            for node in self.__nodes(method):
+                for rule, action, order in node.rules:
+                    if rule.example is None:
+                        continue
+
+                    match = self.__match_dynamic(rule.example, method)
+
+                    if match[1] is not rule:
+                        conflicts.append(f"{method} '{rule.uri}' ({action}) is shadowed by '{match[1].uri}' "
+                                         f"({match[2]})")
+
+        return conflicts
+
+    def node_info(self):
+        """
+        The size of the tree of dynamic routes. The time taken to match a URL depends on the number of rules on the nodes
+        it is tried against, rather than the total number of routes.
+
+        :return: The number of nodes and the largest number of rules on one node
+        :rtype: dict
+        """
+        sizes = [len(node.rules) for method in METHODS for node in self.__nodes(method)]
+
+        return {'nodes': len(sizes), 'max_rules': max(sizes)}
+
+    def __nodes(self, method):
+        """Every node in the tree of dynamic routes of the given method."""
+        nodes = [self.__dynamic_routes[method]]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children.values())
+
+            if node.parameter is not None:
+                nodes.append(node.parameter)
+
+            yield node
+
+    def __match_dynamic(self, uri, method):
+        """
+        Match the given URI against the dynamic routes.
+
+        :return: The order, rule, action and route parameters of the matching rule, or ``None`` if no rule matches
+        :rtype: tuple
+        """
+        slugs = uri.split('/')
+        best = None
+        best_depth = -1
+
+        # Each node whose slugs match the start of the URI, with the index of the next slug
+        nodes = [(self.__dynamic_routes[method], 0)]
+        while nodes:
+            node, i = nodes.pop()
+
+            # Only a deeper node (or an earlier rule on a node of the same depth) can replace the current match
+            if node.rules and node.depth >= best_depth:
+                match = node.match(uri)
+
+                if match is not None and (node.depth > best_depth or match[0] < best[0]):
+                    best, best_depth = match, node.depth
+
+            if i < len(slugs):
+                child = node.children.get(slugs[i])
+
+                if child is not None:
+                    nodes.append((child, i + 1))
+
+                # None of the route parameter types match an empty slug
+                if node.parameter is not None and slugs[i]:
+                    nodes.append((node.parameter, i + 1))
+
+        return best
 
     @staticmethod
     def __is_dynamic(uri):
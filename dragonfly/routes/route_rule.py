@@ -1,19 +1,40 @@
 import re
-from config import PYTHON_TO_REGEX
+import uuid
+
+import config
+from dragonfly import constants
+
+# The default types are always available. Any types defined in config.py are added to (or override) these.
+PYTHON_TO_REGEX = {**constants.PYTHON_TO_REGEX, **getattr(config, 'PYTHON_TO_REGEX', {})}
+
+# How each type of route parameter is converted before being passed to the controller. Any type not listed is passed as
+# a string.
+PYTHON_TO_CONVERTER = {"int": int, "uuid": uuid.UUID}
+
+# The default types whose values never contain a '/', so they always match exactly one slug of a URL. Routes are stored
+# in a tree of these slugs (see `RouteCollection`). A type that has been overridden in config.py is not included.
+SEGMENT_TYPES = {type for type in ("int", "slug", "uuid") if PYTHON_TO_REGEX[type] == constants.PYTHON_TO_REGEX[type]}
+
+# A value that matches each of the default types. Used to check if a route is shadowed by another.
+EXAMPLE_VALUES = {"int": "1", "str": "a", "slug": "a", "uuid": "00000000-0000-0000-0000-000000000000", "path": "a"}
 
 
 class RouteRule:
     """
     Data structure to store dynamic routes. Allows for an easy check of whether a given route matches a dynamic route.
+
+    The regex is compiled and the converter for each route parameter is found once, when the rule is created. Matching
+    does not modify the rule so it can be shared between threads.
     """
 
     def __init__(self, uri):
 
-        self.__route_parameters = []
+        self.uri = uri
 
         # Firstly convert the given URI to a regex expression that can easily be checked. Also generate the needed
         # structures for any expected route parameters
-        self.__converted_uri = self.__convert_to_regex(uri)
+        self.__converted_uri, self.__route_parameters, self.example = self.__convert_to_regex(uri)
+        self.__pattern = re.compile(self.__converted_uri)
 
     def match(self, uri):
         """
@@ -26,55 +47,64 @@ class RouteRule:
         :rtype: dict
         """
 
-        match = re.fullmatch(self.__converted_uri, uri)
+        match = self.__pattern.fullmatch(uri)
 
         if match is None:
             return False
 
-        for i in range(len(self.__route_parameters)):
-            self.__route_parameters[i][1] = match.group(i + 1)
+        return self.parameters(match.groups())
 
-        arg_dict = {}
-        for el in self.__route_parameters:
-            if el[2] == 'int':
-                arg_dict[el[0]] = int(el[1])
-            else:
-                arg_dict[el[0]] = str(el[1])
+    @property
+    def regex(self):
+        """The regex equivalent of the URI (used to compile the routes in a ``RouteCollection``)."""
+        return self.__converted_uri
 
-        return arg_dict
+    @property
+    def group_count(self):
+        """The number of groups in the regex, one for each route parameter."""
+        return len(self.__route_parameters)
 
-    def __convert_to_regex(self, uri):
+    def parameters(self, values):
         """
-        Converts the given URI to regex.
+        Converts the values matched by the groups in the regex to the route parameters.
 
-        :param uri: The URI to convert
-        :rtype: str
+        :param values: The matched values, in the same order as the route parameters
+        :type values: tuple
 
-        :return: The converted URI
-        :rtype: str
+        :return: A new dictionary containing the route parameters
+        :rtype: dict
         """
-        matches = re.findall("(<[^<]+:[^>]+>)", uri)
-        for match in matches:
-            # Substitute the match with the corresponding regex
-            uri = re.sub(match, self.__map_to_regex, uri)
-
-        return uri
+        return {name: converter(value) for (name, converter), value in zip(self.__route_parameters, values)}
 
-    def __map_to_regex(self, match):
+    @staticmethod
+    def __convert_to_regex(uri):
         """
-        Finds the regex equivalent of the route parameter declaration as well generating the appropriate data structures
-        for the route parameters.
-
-        :param match: The route parameter declaration
+        Converts the given URI to regex. Any part of the URI that is not a route parameter is escaped.
 
-        :return: The regex equivalent of the given route parameter declaration
+        :param uri: The URI to convert
         :rtype: str
+
+        :return: The converted URI, a tuple containing the name and converter of each route parameter and an example
+        URI that matches the rule (``None`` if a custom type is used)
+        :rtype: tuple
         """
-        # Split the parameter '<id:int>' to two strings
-        name, type = match.group(0).split(":")
+        # Split the URI into [static, name, type, static, name, type, ..., static]
+        parts = re.split("<([^<>:]+):([^<>]+)>", uri)
 
-        # Add a tuple to the route parameters list containg the name and type of parameter to expect
-        self.__route_parameters.append([name[1:], None, type[:-1]])
+        regex = re.escape(parts[0])
+        example = parts[0]
+        route_parameters = []
+
+        for i in range(1, len(parts), 3):
+            name, type = parts[i], parts[i + 1]
+
+            # Get corresponding regex from config.py
+            regex += PYTHON_TO_REGEX[type] + re.escape(parts[i + 2])
+            route_parameters.append((name, PYTHON_TO_CONVERTER.get(type, str)))
+
+            if example is not None and type in EXAMPLE_VALUES:
+                example += EXAMPLE_VALUES[type] + parts[i + 2]
+            else:
+                example = None
 
-        # Get corresponding regex from config.py
-        return PYTHON_TO_REGEX[type[:-1]]
+        return regex, tuple(route_parameters), example
@@ -1,10 +1,16 @@
 import importlib
+import inspect
 import re
+import threading
+from collections import OrderedDict
 
-from dragonfly.constants import METHODS, DATA_METHODS
+from dragonfly import conditional
+from dragonfly.constants import METHODS, DATA_METHODS, OVERRIDE_METHODS
+from dragonfly.exceptions import InvalidControllerMethod, RouterFrozen, RequestTooLarge, InvalidRequestBody
 from dragonfly.middleware.middleware_controller import middleware_controller
 from dragonfly.request import request
-from dragonfly.response import Response, ErrorResponse, deferred_response
+from dragonfly.response import Response, ErrorResponse, StreamingResponse, deferred_response
+from dragonfly.response_cache import ResponseCache
 from dragonfly.routes.route_collection import RouteCollection
 
 
@@ -22,9 +28,52 @@ class Router:
     generated :class:`Response <dragonfly.response.Response>`.
     """
 
-    def __init__(self):
+    def __init__(self, reuse_controllers=False, match_cache_size=1024, etags=True, response_cache=None):
+        """
+        :param reuse_controllers: If one instance of each controller should be shared by all requests, rather than
+        instantiating the controller for each request
+        :type reuse_controllers: bool
+
+        :param match_cache_size: The number of matched (and unmatched) URLs to remember. Set to 0 to disable the cache.
+        :type match_cache_size: int
+
+        :param etags: If an ETag (a hash of the content) should be added to successful GET responses that do not have
+        one, allowing browsers to revalidate their cached copy
+        :type etags: bool
+
+        :param response_cache: The cache used for the actions registered using :meth:`cache`. Defaults to an in-process
+        cache.
+        :type response_cache: :class:`ResponseCache <dragonfly.response_cache.ResponseCache>`
+        """
         self.__routes = RouteCollection()
 
+        # The most recently matched URLs, stored as {(method, path): (action, parameters)}. URLs that did not match a
+        # route are also stored so repeated 404s are cheap.
+        self.__match_cache = OrderedDict()
+        self.__match_cache_size = match_cache_size
+        self.__match_cache_lock = threading.Lock()
+        self.__match_cache_stats = {'hits': 0, 'misses': 0}
+
+        # Once frozen no more routes can be added
+        self.__frozen = False
+
+        # Resolved actions, stored as {action: callable that runs the controller method}
+        self.__actions = {}
+        self.__reuse_controllers = reuse_controllers
+
+        self.etags = etags
+        self.response_cache = ResponseCache() if response_cache is None else response_cache
+
+    @property
+    def reuse_controllers(self):
+        """If one instance of each controller is shared by all requests."""
+        return self.__reuse_controllers
+
+    @reuse_controllers.setter
+    def reuse_controllers(self, reuse_controllers):
+        self.__reuse_controllers = reuse_controllers
+        self.__actions.clear()
+
     def add_route(self, uri, action, method):
         """
         Adds a route to the `RouteCollection` object.
@@ -38,27 +87,148 @@ class Router:
         :param method: The HTTP method verb e.g 'GET'
         :type method: str
         """
+        if self.__frozen:
+            raise RouterFrozen(f"Cannot add the route '{uri}' as the router has been frozen")
 
         self.__routes.add(uri, action, method)
 
+        # A new route could change the result of any cached match
+        with self.__match_cache_lock:
+            self.__match_cache.clear()
+
+    def freeze(self, strict=False):
+        """
+        Prepares the router to serve requests. This should be called once all routes have been added (e.g. at the end
+        of ``routes.py``), so worker processes start with everything loaded.
+
+        All the controllers used by the routes are imported (meaning any invalid actions are found at startup rather
+        than on the first request) and the routes are checked for conflicts. No routes can be added afterwards.
+
+        :param strict: If an exception should be raised when conflicting routes are found
+        :type strict: bool
+
+        :return: A description of each conflicting (unreachable) route
+        :rtype: list
+        """
+        for method, uri, action in self.__routes.routes():
+            try:
+                self.resolve_action(action)
+            except (ImportError, AttributeError, ValueError) as e:
+                raise InvalidControllerMethod(f"The action {action} for {method} '{uri}' could not be loaded: {e}") from e
+
+        conflicts = self.__routes.conflicts()
+
+        if conflicts and strict:
+            raise RouterFrozen("Conflicting routes found:\n" + "\n".join(conflicts))
+
+        self.__frozen = True
+
+        return conflicts
+
+    @property
+    def frozen(self):
+        """If the router has been frozen (see :meth:`freeze`)."""
+        return self.__frozen
+
+    def cache(self, action, ttl, vary_cookies=(), vary_headers=(), vary_query=True):
+        """
+        Cache the full response of the given action (see :class:`ResponseCache <dragonfly.response_cache.ResponseCache>`).
+        The ``before`` method of any middleware still runs before a cached response is returned, but a page that depends
+        on the user should vary by the session cookie.
+
+        :example:
+            ``routes.cache('ArticleController@show', ttl=60, vary_cookies=['session_id'])``
+
+        :param action: The action e.g 'ArticleController@show'
+        :type action: str
+
+        :param ttl: The number of seconds the response is cached for
+        :type ttl: float
+
+        :param vary_cookies: The names of the cookies that change the response
+        :type vary_cookies: list
+
+        :param vary_headers: The names of the headers that change the response
+        :type vary_headers: list
+
+        :param vary_query: If the query string changes the response, or a list of the query arguments that do
+        :type vary_query: bool
+        """
+        self.response_cache.add_rule(action, ttl, vary_cookies, vary_headers, vary_query)
+
+    def match_route(self, uri, method):
+        """
+        Match the given URI and method to a route, using the cache of recently matched URLs if possible.
+
+        :param uri: The URI to match
+        :type uri: str
+
+        :param method: The HTTP method
+        :type method: str
+
+        :return: The action (or ``None`` if no route matches) and the route parameters
+        :rtype: tuple
+        """
+        key = (method, uri)
+
+        with self.__match_cache_lock:
+            try:
+                action, parameters = self.__match_cache[key]
+            except KeyError:
+                self.__match_cache_stats['misses'] += 1
+            else:
+                self.__match_cache.move_to_end(key)
+                self.__match_cache_stats['hits'] += 1
+
+                # The parameters are copied as the dispatcher adds to them
+                return action, dict(parameters)
+
+        action, parameters = self.__routes.match_route(uri, method)
+
+        if self.__match_cache_size > 0:
+            with self.__match_cache_lock:
+                self.__match_cache[key] = (action, dict(parameters))
+
+                if len(self.__match_cache) > self.__match_cache_size:
+                    self.__match_cache.popitem(last=False)
+
+        return action, parameters
+
+    def match_cache_info(self):
+        """
+        How often a URL is found in the cache of matched URLs rather than matched against the routes.
+
+        :return: The number of hits, misses and the current size of the cache
+        :rtype: dict
+        """
+        with self.__match_cache_lock:
+            return {**self.__match_cache_stats, 'size': len(self.__match_cache), 'max_size': self.__match_cache_size}
+
     def dispatch_route(self):
         """
         Dispatches the appropriate route based on the request method and path.
         """
 
-        # See if there is a hidden input on the request that changes the request method.
-        request_data = request.get_data()
+        # Only requests that can have a body are given its data. Other requests (e.g. GET) are routed without reading
+        # anything else from the request, so controllers read `request.args` etc. only if they need them.
+        request_data = None
 
-        try:
-            method = request_data['_method'].upper()
-            if method in ['PUT', 'PATCH', 'DELETE']:
-                request.method = method
+        if request.method in DATA_METHODS:
+            try:
+                request_data = request.get_data()
+            except RequestTooLarge:
+                return ErrorResponse("Request entity too large", status_code=413)
+            except InvalidRequestBody:
+                return ErrorResponse("Bad request", status_code=400)
 
-            del request_data['_method']
-        except KeyError:
-            pass
+            # See if there is a hidden input on the request that changes the request method. Anything other than one
+            # of the allowed methods (e.g. a list or number in a JSON body) is ignored.
+            method = request_data.pop('_method', None)
 
-        action, parameters = self.__routes.match_route(request.path, request.method)
+            if isinstance(method, str) and method.upper() in OVERRIDE_METHODS:
+                request.method = method.upper()
+
+        action, parameters = self.match_route(request.path, request.method)
 
         # If no route is found
         if action is None:
@@ -71,36 +241,99 @@ class Router:
             if isinstance(middleware_response, Response):
                 return middleware_response
 
-            # Import the correct controller, pass in request object (if request is singleton this can be removed...).
-            controller_file, controller_function_name = action.split("@")
-            controller_class = getattr(importlib.import_module(f"controllers.{to_snake(controller_file)}"),
-                                       controller_file)
-            controller_class = controller_class()
-            controller_function = getattr(controller_class, controller_function_name)
+            # The cache is only checked once the middleware has run, so cached pages are still protected by it (e.g.
+            # authentication and CSRF checks)
+            cached_response = self.response_cache.get(action)
+
+            if cached_response is not None:
+                cached_response.translate_deferred(deferred_response)
 
+                return self.__finish(action, conditional.evaluate(cached_response))
+
+            # Get the function that runs the controller method (importing the controller on the first request)
             try:
-                del request_data['csrf_token']
+                controller_function = self.__actions[action]
             except KeyError:
-                pass
+                controller_function = self.resolve_action(action)
+
+            # If there is a possibility that the given request method could send data e.g POST, pass it to the controller
+            if request_data is not None:
+                request_data.pop('csrf_token', None)
 
-            # If there is a possibility that the given request method could send data e.g POST, try and fetch it.
-            if request.method in DATA_METHODS:
-                parameters['request_data'] = request_data
+                if request.method in DATA_METHODS:
+                    parameters['request_data'] = request_data
 
             # Run the appropriate function on the controller
             response = controller_function(**parameters)
 
+            if self.etags and request.method in conditional.CONDITIONAL_METHODS and response.status.startswith('200') \
+                    and not isinstance(response, StreamingResponse) and response.get_header('ETag') is None:
+                response.set_etag()
+
+            # The response is cached before the deferred headers are added, as they belong to this request only (e.g. a
+            # header set by a `before` middleware). They are added to cached responses when they are sent.
+            self.response_cache.set(action, response)
+
             # Modify the response using the `DeferredResponse` singleton.
             response.translate_deferred(deferred_response)
 
-            # Run any `after` methods on the registered middleware.
-            middleware_response = middleware_controller.run_after(action, response)
+            # If the browser's cached copy is still valid send a 304 response instead of the content
+            response = conditional.evaluate(response)
 
-            # Check if they returned a `Response` and return that (thus cancelling the rest of the routing).
-            if isinstance(middleware_response, Response):
-                return middleware_response
+            return self.__finish(action, response)
+
+    @staticmethod
+    def __finish(action, response):
+        """Run any `after` methods on the registered middleware."""
+        middleware_response = middleware_controller.run_after(action, response)
+
+        # Check if they returned a `Response` and return that (thus cancelling the rest of the routing).
+        if isinstance(middleware_response, Response):
+            return middleware_response
+
+        return response
+
+    def resolve_action(self, action):
+        """
+        Imports the controller for the given action and returns a function that runs the controller method. The result
+        is cached so this only happens once for each action.
+
+        :param action: The action of the route e.g 'HomeController@home'
+        :type action: str
+
+        :return: A function that accepts the route parameters and returns the controller method's response
+        :rtype: callable
+        """
+        try:
+            return self.__actions[action]
+        except KeyError:
+            pass
+
+        # Import the correct controller
+        controller_file, controller_function_name = action.split("@")
+        controller_class = getattr(importlib.import_module(f"controllers.{to_snake(controller_file)}"),
+                                   controller_file)
+
+        # Look up the attribute without binding it, so static and class methods can be told apart from normal methods
+        attribute = inspect.getattr_static(controller_class, controller_function_name)
+
+        if isinstance(attribute, (staticmethod, classmethod)):
+            # These do not need an instance of the controller
+            controller_function = getattr(controller_class, controller_function_name)
+        elif self.__reuse_controllers:
+            # The bound method of a single instance
+            controller_function = getattr(controller_class(), controller_function_name)
+        elif inspect.isfunction(attribute):
+            def controller_function(**parameters):
+                return attribute(controller_class(), **parameters)
+        else:
+            # Any other kind of attribute is looked up on each new instance
+            def controller_function(**parameters):
+                return getattr(controller_class(), controller_function_name)(**parameters)
+
+        self.__actions[action] = controller_function
 
-            return response
+        return controller_function
 
     def get(self, uri, action):
         self.add_route(uri, action, 'GET')
@@ -1,8 +1,9 @@
-import importlib
 import os
-import platform
 import re
+import threading
+import time
 
+import config
 from config import ROOT_DIR
 from dragonfly.auth import Auth
 from dragonfly.request import request
@@ -11,6 +12,15 @@ from dragonfly.utils import Utils
 
 INDENT = "    "
 
+# The settings used if they are not overridden by the TEMPLATES dictionary in config.py
+DEFAULT_TEMPLATE_SETTINGS = {
+    # If templates should be recompiled when they change. This should be False in production, meaning the filesystem is
+    # only used the first time a template is rendered.
+    'auto_reload': True,
+    # How often (in seconds) a template is checked for changes when auto_reload is True
+    'check_interval': 1
+}
+
 # For clarity
 LINE = 1
 VAR = 2
@@ -80,9 +90,9 @@ class Line:
             python = self.line
 
             for match in self.__matches:
-                # Replace the match (templating code) with Python (close template string, concatenate the chosen
-                # variable and reopen string)
-                python = python.replace(match, f"''' + str({self.__fix_variable(match[3:-3])}) + '''")
+                # Replace the match (templating code) with Python (close template string, add the chosen variable as
+                # another part and reopen string)
+                python = python.replace(match, f"''', str({self.__fix_variable(match[3:-3])}), '''")
 
             return python
 
@@ -129,7 +139,7 @@ class Line:
                                 range_words[i] = self.__fix_variable(word)
 
                     # Generate the Python equivalent of the for loop (with the correct indentation)
-                    return f"'''\n{INDENT * self.__indent}for {words[0]} in range({range_words[0]}, {range_words[1]}):\n{INDENT * (self.__indent + 1)}template += '''"
+                    return f"''',))\n{INDENT * self.__indent}for {words[0]} in range({range_words[0]}, {range_words[1]}):\n{INDENT * (self.__indent + 1)}extend(('''"
                 else:
                     # Normal for loop, just fix the iterable being iterated over
                     words[2] = self.__fix_variable(words[2])
@@ -138,18 +148,18 @@ class Line:
             statement = " ".join(words)
 
             # Generate the correct python using the extracted variables
-            python = f"'''\n{INDENT * self.__indent}{clause} {statement}:\n{INDENT * (self.__indent + 1)}template += '''"
+            python = f"''',))\n{INDENT * self.__indent}{clause} {statement}:\n{INDENT * (self.__indent + 1)}extend(('''"
 
             return python
 
         elif self.identity == ELSE_CONTROL:
 
-            python = f"'''\n{INDENT * self.__indent}else:\n{INDENT * (self.__indent + 1)}template += '''"
+            python = f"''',))\n{INDENT * self.__indent}else:\n{INDENT * (self.__indent + 1)}extend(('''"
 
             return python
 
         elif self.identity == CLOSE_CONTROL:
-            return f"'''\n{INDENT * self.__indent}template += '''\n"
+            return f"''',))\n{INDENT * self.__indent}extend(('''\n"
 
     @staticmethod
     def __fix_variable(variable):
@@ -196,7 +206,8 @@ class Converter:
 
     def convert(self):
         """
-        Convert the given file to Python.
+        Convert the given file to Python. The generated ``get_html`` function adds each part of the HTML to a list and
+        joins them once at the end, so rendering takes linear time however many times a loop runs.
 
         :return: The Python code.
         :rtype: str
@@ -224,25 +235,164 @@ class Converter:
 
             self.__objects.append(line_object)
 
-        python = f"def get_html(kwargs):\n{INDENT}template = '''"
+        python = f"def get_html(kwargs):\n{INDENT}parts = []\n{INDENT}extend = parts.extend\n{INDENT}extend(('''"
 
         for l in self.__objects:
             l_python = l.to_python()
             if l_python:
                 python += l_python
 
-        python += f"'''\n{INDENT}return template\n"
+        python += f"''',))\n{INDENT}return ''.join(parts)\n"
 
         return python
 
 
+class CompiledTemplate:
+    """A compiled template held by the :class:`TemplateRegistry`."""
+
+    __slots__ = ('get_html', 'template_mtime', 'last_checked')
+
+    def __init__(self, get_html, template_mtime, last_checked):
+        self.get_html = get_html
+        self.template_mtime = template_mtime
+        self.last_checked = last_checked
+
+
+class TemplateRegistry:
+    """
+    Holds the compiled ``get_html`` function of each template in memory, so rendering a template does not need to use
+    the filesystem.
+
+    The first time a template is used it is compiled to Python (if the compiled view in 'storage/views' does not exist or
+    is out of date) and loaded. If ``auto_reload`` is ``True`` (development) the template is checked for changes at most
+    once every ``check_interval`` seconds. Otherwise (production) the template is never checked again.
+
+    :param auto_reload: If templates should be recompiled when they change. Defaults to the setting in ``config.py``.
+    :type auto_reload: bool
+
+    :param check_interval: The minimum number of seconds between checks for changes. Defaults to the setting in
+    ``config.py``.
+    :type check_interval: float
+
+    :param root_dir: The directory containing the 'templates' and 'storage' directories. Defaults to ``ROOT_DIR``.
+    :type root_dir: str
+    """
+
+    def __init__(self, auto_reload=None, check_interval=None, root_dir=None):
+        settings = {**DEFAULT_TEMPLATE_SETTINGS, **getattr(config, 'TEMPLATES', {})}
+
+        self.auto_reload = settings['auto_reload'] if auto_reload is None else auto_reload
+        self.check_interval = settings['check_interval'] if check_interval is None else check_interval
+        self.root_dir = ROOT_DIR if root_dir is None else root_dir
+
+        # Stored as {template: CompiledTemplate}
+        self.__templates = {}
+        self.__lock = threading.Lock()
+
+    def get(self, template):
+        """
+        Get the ``get_html`` function of the given template, compiling it if needed.
+
+        :param template: The location of the template in the 'templates' directory (using dot notation)
+        :type template: str
+
+        :return: The function that generates the HTML
+        :rtype: callable
+        """
+        try:
+            compiled = self.__templates[template]
+        except KeyError:
+            return self.__load(template).get_html
+
+        if self.auto_reload:
+            now = time.monotonic()
+
+            if now - compiled.last_checked >= self.check_interval:
+                compiled.last_checked = now
+
+                if os.path.getmtime(self.template_path(template)) != compiled.template_mtime:
+                    return self.__load(template).get_html
+
+        return compiled.get_html
+
+    def preload(self):
+        """
+        Compile and load every template in the 'templates' directory. This can be used when the application starts so
+        no template is compiled while handling a request.
+
+        :return: The names of the loaded templates
+        :rtype: list
+        """
+        templates_dir = os.path.join(self.root_dir, 'templates')
+        loaded = []
+
+        for directory, _, files in os.walk(templates_dir):
+            for file in files:
+                if file.endswith('.html'):
+                    path = os.path.relpath(os.path.join(directory, file[:-5]), templates_dir)
+                    template = '.'.join(path.split(os.sep))
+
+                    self.__load(template)
+                    loaded.append(template)
+
+        return loaded
+
+    def clear(self):
+        """Remove all loaded templates, meaning they are loaded again the next time they are used."""
+        with self.__lock:
+            self.__templates.clear()
+
+    def template_path(self, template):
+        """The path of the given template e.g 'articles.show' is 'templates/articles/show.html'."""
+        return os.path.join(self.root_dir, 'templates', *template.split('.')) + '.html'
+
+    def view_path(self, template):
+        """The path of the compiled template e.g 'articles.show' is 'storage/views/articles/show.py'."""
+        return os.path.join(self.root_dir, 'storage', 'views', *template.split('.')) + '.py'
+
+    def __load(self, template):
+        """Compile (if needed) and load the given template."""
+        with self.__lock:
+            template_path = self.template_path(template)
+            view_path = self.view_path(template)
+
+            template_mtime = os.path.getmtime(template_path)
+
+            # If the template was updated after the view was compiled (or it does not exist) compile it again
+            try:
+                outdated = template_mtime > os.path.getmtime(view_path)
+            except FileNotFoundError:
+                outdated = True
+
+            if outdated:
+                python = Converter(template_path).convert()
+
+                os.makedirs(os.path.dirname(view_path), exist_ok=True)
+                with open(view_path, 'w+') as f:
+                    f.write(python)
+            else:
+                with open(view_path) as f:
+                    python = f.read()
+
+            # The compiled view is executed directly (rather than imported) so an updated view replaces the old one
+            namespace = {}
+            exec(compile(python, view_path, 'exec'), namespace)
+
+            compiled = CompiledTemplate(namespace['get_html'], template_mtime, time.monotonic())
+            self.__templates[template] = compiled
+
+            return compiled
+
+
+template_registry = TemplateRegistry()
+
+
 class View:
     """
     Returns a HTML version (view) of the requested template.
-    The class first attempts to locate the deisred view. If a pre-compiled python version of the template does not exist or is out
-    of date, the class will generate one. Otherwise it imports the compiled python file and runs the ``get_html``
-    method, passing in any variables that the user.py has given to the constructor (via ``**kwargs``). It then returns a
-    :class:`Response <dragonfly.response.Response>` with this HTML.
+    The compiled template is retrieved from the :class:`TemplateRegistry` (which compiles it if needed) and its
+    ``get_html`` method is run, passing in any variables that the user has given to the constructor (via ``**kwargs``).
+    It then returns a :class:`Response <dragonfly.response.Response>` with this HTML.
     :param template: The view to return
     :type template: str
     """
@@ -255,34 +405,13 @@ class View:
         'articles.show'
         :param kwargs: Any variables to pass into the view
         """
-        # Cross platform compatibility
-        self.__slash = '/'
-        if platform.system() == 'Windows':
-            self.__slash = '\\'
-
-        # Get an actual __file path
-        local_loc = template.replace(".", self.__slash)
-
-        self.__template_path = os.path.join(ROOT_DIR, f"templates{self.__slash}" + local_loc + '.html')
-        self.__view_path = os.path.join(ROOT_DIR, f"storage{self.__slash}views{self.__slash}{local_loc}.py")
-
-        # Try to get last modified time, if not present __file does not exist
-        try:
-            os.path.getmtime(self.__view_path)
-        except FileNotFoundError:
-            self.__write_to_file()
-
-        # If template updated after compiled view then regenerated python and write to __file
-        if os.path.getmtime(self.__template_path) > os.path.getmtime(self.__view_path):
-            self.__write_to_file()
-
         # Add in useful features to template by default
         kwargs['request'] = request
         kwargs['Auth'] = Auth
         kwargs['Utils'] = Utils
 
         # Retrieve the HTML from the compiled template
-        self.__html = importlib.import_module(f"storage.views.{template}").get_html(kwargs)
+        self.__html = template_registry.get(template)(kwargs)
 
     def make(self):
         """
@@ -293,21 +422,6 @@ class View:
         """
         return Response(self.__html)
 
-    def __write_to_file(self):
-        """
-        Write the compiled template to the file (view).
-        """
-        html = Converter(self.__template_path).convert()
-        try:
-            with open(self.__view_path, 'w+') as f:
-                f.writelines(html)
-        except FileNotFoundError:
-            # Generate needed directories if not present
-            os.makedirs(self.__view_path.rpartition(self.__slash)[0], exist_ok=True)
-
-            with open(self.__view_path, 'w+') as f:
-                f.writelines(html)
-
 
 def view(view, **kwargs):
     """
@@ -1,11 +1,11 @@
 import os
 from string import Template
 
-import MySQLdb.cursors
 import click
+from dragonfly.db.database import DB
 from dragonfly.db.database_migrator import DatabaseMigrator
 
-from config import DATABASE, ROOT_DIR
+from config import ROOT_DIR
 
 os.chdir(ROOT_DIR + '/tests/builder')
 
@@ -326,8 +326,7 @@ def migrate():
 
     dbm = DatabaseMigrator()
 
-    db = MySQLdb.connect(**DATABASE, cursorclass=MySQLdb.cursors.DictCursor)
-    cursor = db.cursor()
+    db = DB()
 
     no_dependency = []
     to_append = []
@@ -351,20 +350,15 @@ def migrate():
 
     for table in no_dependency:
         click.secho(f"Migrating {table} model", fg="blue")
-        cursor.execute(dbm.tables[table][1])
-        db.commit()
+        db.custom_sql(dbm.tables[table][1])
         click.secho(f"Migrated {table} successfully!", fg="green")
 
-    cursor.close()
-    db.close()
-
 
 @cli.command()
 def drop():
     dbm = DatabaseMigrator()
 
-    db = MySQLdb.connect(**DATABASE, cursorclass=MySQLdb.cursors.DictCursor)
-    cursor = db.cursor()
+    db = DB()
 
     no_dependency = []
     to_append = []
@@ -390,24 +384,15 @@ def drop():
 
     for table in no_dependency:
         click.secho(f"Deleting {table} model", fg="blue")
-        cursor.execute(f"DROP TABLE {table}")
-        db.commit()
+        db.custom_sql(f"DROP TABLE {table}")
         click.secho(f"Deleted {table} successfully!", fg="green")
 
 
 @cli.command()
 def seed():
-    dbm = DatabaseMigrator()
-
-    db = MySQLdb.connect(**DATABASE, cursorclass=MySQLdb.cursors.DictCursor)
-    cursor = db.cursor()
-
-    cursor.execute("INSERT INTO users (username, email, password, salt) VALUES ('test', 'test', 'test', 'test')")
-    db.commit()
+    DB().table('users').insert({'username': 'test', 'email': 'test', 'password': 'test', 'salt': 'test'})
 
-    for i in range(100):
-        cursor.execute("INSERT INTO articles (name, text, user_id) VALUES ('Article', 'Article text', 1)")
-    db.commit()
+    DB().table('articles').insert_many([{'name': 'Article', 'text': 'Article text', 'user_id': 1}] * 100)
 
 
 @cli.command()
@@ -1,7 +1,7 @@
 from unittest import TestCase
 from dragonfly.db.database import DB
 
-from dragonfly.exceptions import MissingTable, MissingClause, InvalidOperator, ChunkOutOfRange
+from dragonfly.exceptions import MissingTable, MissingClause, InvalidOperator, ChunkOutOfRange, InvalidCursor
 from MySQLdb._exceptions import ProgrammingError, OperationalError
 
 class TestDB(TestCase):
@@ -21,6 +21,10 @@ class TestDB(TestCase):
     def test_where(self):
         self.assertEqual(self.database.where('string', '=', 'Test').first(), {'id': 1, 'string': 'Test'})
 
+    def test_where_in(self):
+        self.assertEqual(self.database.where('id', 'IN', [2, 4]).get(),
+                         ({'id': 2, 'string': 'Test 1'}, {'id': 4, 'string': 'Test 3'}))
+
     def test_multiple_where(self):
         self.assertEqual(self.database.multiple_where({'string': 'Test', 'id': 1}).first(), {'id': 1, 'string': 'Test'})
 
@@ -29,6 +33,24 @@ class TestDB(TestCase):
             {'id': 1, 'string': 'Test'}, {'id': 2, 'string': 'Test 1'}, {'id': 3, 'string': 'Test 2'},
             {'id': 4, 'string': 'Test 3'}, {'id': 5, 'string': 'Test 4'}))
 
+    def test_iterate(self):
+        rows = self.database.where('id', '>', 1).iterate(batch_size=2)
+
+        self.assertEqual(next(rows), {'id': 2, 'string': 'Test 1'})
+        self.assertEqual(len(list(rows)), 3)
+
+    def test_iterate_released(self):
+        closed = self.database.pool_info()['closed']
+
+        list(self.database.iterate())
+        self.assertEqual(self.database.pool_info()['closed'], closed)
+
+        # A connection with unread rows is closed rather than returned to the pool
+        rows = self.database.iterate(batch_size=2)
+        next(rows)
+        rows.close()
+        self.assertEqual(self.database.pool_info()['closed'], closed + 1)
+
     def test_first(self):
         self.assertEqual(self.database.first(), {'id': 1, 'string': 'Test'})
 
@@ -37,6 +59,30 @@ class TestDB(TestCase):
                                                       {'current_page': 2, 'from': 3, 'last_page': 3, 'per_page': 2,
                                                        'to': 4, 'total': 5})))
 
+    def test_keyset_chunk(self):
+        rows, meta = self.database.keyset_chunk(2, after=2)
+        self.assertEqual(rows, [{'id': 3, 'string': 'Test 2'}, {'id': 4, 'string': 'Test 3'}])
+
+        rows, meta = self.database.keyset_chunk(2, cursor=meta['next_cursor'])
+        self.assertEqual(rows, [{'id': 5, 'string': 'Test 4'}])
+        self.assertIsNone(meta['next_cursor'])
+
+        rows, meta = self.database.keyset_chunk(2, cursor=meta['prev_cursor'])
+        self.assertEqual(rows, [{'id': 3, 'string': 'Test 2'}, {'id': 4, 'string': 'Test 3'}])
+
+        rows, meta = self.database.keyset_chunk(2, cursor=meta['prev_cursor'])
+        self.assertEqual(rows, [{'id': 1, 'string': 'Test'}, {'id': 2, 'string': 'Test 1'}])
+        self.assertIsNone(meta['prev_cursor'])
+
+    def test_keyset_chunk_where(self):
+        rows, meta = self.database.where('id', '>', 3).keyset_chunk(5, total='cached')
+        self.assertEqual(rows, [{'id': 4, 'string': 'Test 3'}, {'id': 5, 'string': 'Test 4'}])
+        self.assertEqual(meta, {'per_page': 5, 'total': 2, 'next_cursor': None, 'prev_cursor': None})
+
+    def test_count(self):
+        self.assertEqual(self.database.count(), 5)
+        self.assertEqual(self.database.where('id', '<', 3).count(), 2)
+
     def test_update(self):
         self.database.where('id', '=', 1).update({'string': 'Updated'})
         self.assertEqual(self.database.where('id', '=', 1).first(), {'id': 1, 'string': 'Updated'})
@@ -49,6 +95,36 @@ class TestDB(TestCase):
         self.database.insert({'string': 'Testing 5'})
         self.assertEqual(self.database.where('id', '=', 6).first(), {'id': 6, 'string': 'Testing 5'})
 
+    def test_insert_many(self):
+        first_ids = self.database.insert_many([{'string': f"Bulk {i}"} for i in range(5)], batch_size=2)
+
+        self.assertEqual(first_ids, [6, 8, 10])
+        self.assertEqual(self.database.where('id', '=', 10).first(), {'id': 10, 'string': 'Bulk 4'})
+        self.assertEqual(len(self.database.get()), 10)
+
+    def test_last_insert_id(self):
+        self.database.insert({'string': 'Testing 5'})
+        self.assertEqual(self.database.last_insert_id, 6)
+
+        # Reads should not change the stored id
+        self.database.get()
+        self.assertEqual(self.database.last_insert_id, 6)
+
+    def test_debug(self):
+        self.database.get()
+        self.assertIsNone(self.database.last_query)
+
+        database = DB(debug=True).table('testing')
+        database.where('id', '=', 1).get()
+        self.assertIsNotNone(database.last_query)
+
+    def test_statement_cache(self):
+        self.database.where('id', '=', 1).first()
+        hits = DB.statement_cache_info()['select']['hits']
+
+        self.assertEqual(self.database.where('id', '=', 2).first(), {'id': 2, 'string': 'Test 1'})
+        self.assertEqual(DB.statement_cache_info()['select']['hits'], hits + 1)
+
     # Erroneous
     def test_missing_clause(self):
         with self.assertRaises(MissingClause):
@@ -72,6 +148,18 @@ class TestDB(TestCase):
         with self.assertRaises(InvalidOperator):
             self.database.where('id', '==', 1).get()
 
+    def test_erroneous_insert_many(self):
+        with self.assertRaises(ValueError):
+            self.database.insert_many([{'string': 'Testing'}, {'id': 7}])
+
+    def test_erroneous_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            self.database.keyset_chunk(2, cursor='invalid')
+
+        # Valid JSON that is not a position
+        with self.assertRaises(InvalidCursor):
+            self.database.keyset_chunk(2, cursor='WzFd')
+
     def test_erroneous_chunk(self):
         with self.assertRaises(ChunkOutOfRange):
             self.database.chunk(200, 20)
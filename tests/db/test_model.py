@@ -1,5 +1,9 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 from dragonfly.db.database import DB
+from dragonfly.db import models
+from dragonfly.request import request
+from dragonfly.response import ErrorResponse
+from tests.helpers import environ
 from tests.models.article import Article
 
 
@@ -34,6 +38,56 @@ class TestModel(TestCase):
         self.assertEqual(md, {'title': 'Test Article', 'text': 'Testing'})
 
 
+    def test_bulk_create(self):
+        rows = self.model.bulk_create([{'title': f"Bulk {i}", 'text': 'Bulk text'} for i in range(3)],
+                                      return_models=True, batch_size=2)
+
+        self.assertEqual([row.title for row in rows], ['Bulk 0', 'Bulk 1', 'Bulk 2'])
+        self.assertIsNotNone(rows[0].created_at)
+
+        for row in rows:
+            row.delete()
+
+    def test_bulk_create_interleaved(self):
+        # When the ids of a multi-row insert may not be evenly spaced the rows are read back using a unique field
+        with mock.patch('dragonfly.db.models.model._auto_increment_step', return_value=None):
+            rows = self.model.bulk_create([{'title': f"Bulk {i}", 'text': 'Bulk text'} for i in range(3)],
+                                          return_models=True, batch_size=2)
+
+        self.assertEqual([row.title for row in rows], ['Bulk 0', 'Bulk 1', 'Bulk 2'])
+
+        for row in rows:
+            row.delete()
+
+        # Without a unique field each row is inserted on its own
+        with mock.patch('dragonfly.db.models.model._auto_increment_step', return_value=None), \
+                mock.patch.dict(Article.fields['title'].default_parameters, {'unique': False}):
+            rows = self.model.bulk_create([{'title': f"Bulk {i}", 'text': 'Bulk text'} for i in range(3)],
+                                          return_models=True, batch_size=2)
+
+        self.assertEqual([row.title for row in rows], ['Bulk 0', 'Bulk 1', 'Bulk 2'])
+
+        for row in rows:
+            row.delete()
+
+    def test_shared_schema(self):
+        row = self.model.first()
+
+        self.assertIs(row.fields, Article.fields)
+        self.assertEqual(Article.primary_key, ['id'])
+        self.assertEqual(Article.meta['table_name'], 'articles')
+
+        # The model declares `__slots__ = ()` so its rows only have the slots of `Model`
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    def test_field_values(self):
+        row = self.model.find(3)
+        row.title = 'Changed'
+
+        self.assertEqual(row.title, 'Changed')
+        self.assertEqual(row.to_dict()['title'], 'Article 2')
+        self.assertIsInstance(Article.title, models.VarCharField)
+
     def test_first(self):
         model = self.model.first().to_dict()
         del model['created_at']
@@ -49,6 +103,12 @@ class TestModel(TestCase):
         model = self.model.get()
         self.assertEqual(len(model), 10)
 
+    def test_iterate(self):
+        rows = list(self.model.iterate(batch_size=3))
+
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[1].title, 'Article 1')
+
     def test_find(self):
         model = self.model.find(2)
 
@@ -73,6 +133,29 @@ class TestModel(TestCase):
         self.assertEqual(5, len(result[0]))
         self.assertEqual(result[1], {'total': 10, 'per_page': 5, 'current_page': 1, 'last_page': 2, 'from': 1, 'to': 5})
 
+    def test_keyset_paginate(self):
+
+        result, meta = self.model.paginate(size=5, keyset=True)
+
+        self.assertEqual([row.id for row in result], [1, 2, 3, 4, 5])
+        self.assertIsNotNone(meta['next_cursor'])
+        self.assertIsNone(meta['prev_cursor'])
+
+    def test_erroneous_keyset_paginate(self):
+        self.addCleanup(request.update_environ, None)
+
+        # A truncated cursor, a cursor that is not an object and one with both an `after` and `before` value
+        for cursor in (DB.encode_cursor(after=5)[:-3], 'WzFd', 'eyJhZnRlciI6IDEsICJiZWZvcmUiOiA1fQ=='):
+            request.update_environ(environ('articles', f"cursor={cursor}"))
+
+            response = self.model.paginate(size=5, keyset=True, to_json=True)
+            self.assertIsInstance(response, ErrorResponse)
+            self.assertEqual(response.status, '400 Bad Request')
+
+            # Without JSON the first page is returned
+            result, meta = self.model.paginate(size=5, keyset=True)
+            self.assertEqual([row.id for row in result], [1, 2, 3, 4, 5])
+
     def test_save(self):
 
         model = self.model.first()
@@ -88,6 +171,18 @@ class TestModel(TestCase):
 
         self.assertEqual(id, retrieved_model.id)
 
+    def test_get_changes(self):
+        model = self.model.find(4)
+        self.assertEqual(model.get_changes(), {})
+
+        model.title = model.title
+        model.text = 'Changed text'
+        self.assertEqual(model.get_changes(), {'text': 'Changed text'})
+
+        model.save()
+        self.assertEqual(model.get_changes(), {})
+        self.assertEqual(self.model.find(4).text, 'Changed text')
+
     def test_delete(self):
 
         self.model.create({'title': 'Dummy', 'text': 'Dummy text'})
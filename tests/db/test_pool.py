@@ -0,0 +1,110 @@
+from unittest import TestCase, mock
+
+from config import DATABASE
+from dragonfly.db.pool import ConnectionPool
+from dragonfly.exceptions import PoolExhausted
+
+
+class TestConnectionPool(TestCase):
+
+    def setUp(self):
+        settings = {k: v for k, v in DATABASE.items() if k != 'pool'}
+        self.pool = ConnectionPool(settings, min_size=1, max_size=2, checkout_timeout=0.1)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_reuse(self):
+        with self.pool.connection() as first:
+            pass
+
+        with self.pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(self.pool.pool_info()['created'], 1)
+
+    def test_stats(self):
+        with self.pool.connection():
+            stats = self.pool.pool_info()
+            self.assertEqual((stats['size'], stats['idle'], stats['in_use']), (1, 0, 1))
+
+        stats = self.pool.pool_info()
+        self.assertEqual((stats['size'], stats['idle'], stats['in_use'], stats['checkouts']), (1, 1, 0, 1))
+
+    def test_exhausted(self):
+        with self.pool.connection(), self.pool.connection():
+            with self.assertRaises(PoolExhausted):
+                self.pool.acquire()
+
+    def test_max_lifetime(self):
+        self.pool.max_lifetime = 0
+
+        with self.pool.connection() as first:
+            pass
+
+        with self.pool.connection() as second:
+            pass
+
+        self.assertIsNot(first, second)
+
+    def test_close_while_checked_out(self):
+        pooled = self.pool.acquire()
+        self.pool.close()
+
+        # A connection returned after the pool is closed is closed rather than kept
+        self.pool.release(pooled)
+
+        stats = self.pool.pool_info()
+        self.assertEqual((stats['size'], stats['idle'], stats['closed']), (0, 0, 1))
+
+    def test_idle_timeout(self):
+        self.pool.min_size = 0
+        self.pool.idle_timeout = 0
+
+        with self.pool.connection() as first:
+            pass
+
+        with self.pool.connection() as second:
+            pass
+
+        self.assertIsNot(first, second)
+
+    def test_transaction_reset(self):
+        with self.pool.connection() as db:
+            db.autocommit(False)
+
+        # An unfinished transaction is rolled back and autocommit turned back on before the connection is reused
+        with self.pool.connection() as second:
+            self.assertIs(second, db)
+            self.assertTrue(second.get_autocommit())
+
+    def test_round_trips(self):
+        with self.pool.connection() as db:
+            pass
+
+        # A recently used connection is not pinged and nothing needs to be committed or rolled back
+        with mock.patch.object(db, 'ping') as ping, mock.patch.object(db, 'commit') as commit, \
+                mock.patch.object(db, 'rollback') as rollback:
+            with self.pool.connection() as second:
+                cursor = second.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+                cursor.close()
+
+        self.assertIs(second, db)
+        ping.assert_not_called()
+        commit.assert_not_called()
+        rollback.assert_not_called()
+
+    def test_ping_after_idle(self):
+        self.pool.ping_after_idle = 0
+
+        with self.pool.connection() as db:
+            pass
+
+        with mock.patch.object(db, 'ping') as ping:
+            with self.pool.connection():
+                pass
+
+        ping.assert_called_once_with()
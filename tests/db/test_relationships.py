@@ -0,0 +1,97 @@
+import os
+import sys
+from unittest import TestCase, mock
+
+import MySQLdb.cursors
+
+from dragonfly.db.database import DB
+
+# Relationships import their target model from the `models` package, so the test models are added to it
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.author import Author
+from models.post import Post
+
+
+class TestRelationships(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = DB()
+        cls.db.custom_sql("CREATE TABLE authors (\nname VARCHAR(50),\nid INT UNSIGNED AUTO_INCREMENT PRIMARY KEY\n)")
+        cls.db.custom_sql("CREATE TABLE posts (\ntitle VARCHAR(50),\nauthor_id INT,\nid INT UNSIGNED AUTO_INCREMENT PRIMARY KEY\n)")
+        cls.db.custom_sql("CREATE TABLE tags (\nname VARCHAR(50),\nid INT UNSIGNED AUTO_INCREMENT PRIMARY KEY\n)")
+        cls.db.custom_sql("CREATE TABLE posts_tags (\npost_id INT,\ntag_id INT\n)")
+
+        # The third author has no posts, the third post has no tags and the fourth post's author does not exist
+        DB().table('authors').insert_many([{'name': 'Ada'}, {'name': 'Grace'}, {'name': 'Alan'}])
+        DB().table('posts').insert_many([{'title': 'First', 'author_id': 1}, {'title': 'Second', 'author_id': 1},
+                                         {'title': 'Third', 'author_id': 2}, {'title': 'Fourth', 'author_id': 99}])
+        DB().table('tags').insert_many([{'name': 'python'}, {'name': 'sql'}])
+        DB().table('posts_tags').insert_many([{'post_id': 1, 'tag_id': 1}, {'post_id': 1, 'tag_id': 2},
+                                              {'post_id': 2, 'tag_id': 2}])
+
+    @classmethod
+    def tearDownClass(cls):
+        for table in ('authors', 'posts', 'tags', 'posts_tags'):
+            cls.db.custom_sql(f"DROP TABLE {table}")
+
+    def assertQueries(self, n_queries, function):
+        """Asserts the given function runs the given number of queries and returns its result."""
+        execute = MySQLdb.cursors.DictCursor.execute
+
+        with mock.patch.object(MySQLdb.cursors.DictCursor, 'execute', autospec=True, side_effect=execute) as patched:
+            result = function()
+
+        self.assertEqual(patched.call_count, n_queries)
+
+        return result
+
+    def test_has_many(self):
+        # One query for the authors and one for all of their posts
+        authors = self.assertQueries(2, lambda: Author().with_('posts').get())
+
+        posts = self.assertQueries(0, lambda: [[post.title for post in author.posts()] for author in authors])
+        self.assertEqual(posts, [['First', 'Second'], ['Third'], []])
+
+    def test_belongs_to(self):
+        posts = self.assertQueries(2, lambda: Post().with_('author').get())
+
+        authors = self.assertQueries(0, lambda: [post.author() for post in posts])
+        self.assertEqual([author.name for author in authors[:3]], ['Ada', 'Ada', 'Grace'])
+
+        # A post without an author gets a model that is not bound to any data
+        self.assertIsInstance(authors[3], Author)
+        self.assertIsNone(authors[3].name)
+
+    def test_many_to_many(self):
+        posts = self.assertQueries(2, lambda: Post().with_('tags').get())
+
+        tags = self.assertQueries(0, lambda: [[tag.name for tag in post.tags()] for post in posts])
+        self.assertEqual(tags, [['python', 'sql'], ['sql'], [], []])
+
+        # Each row can be iterated on its own
+        self.assertEqual(len(posts[0].tags()), 2)
+        self.assertFalse(posts[2].tags())
+
+    def test_eager_load_several(self):
+        # One query for the posts and one for each relationship
+        posts = self.assertQueries(3, lambda: Post().with_('author', 'tags').where('id', '<', 3).get())
+
+        self.assertQueries(0, lambda: [(post.author(), list(post.tags())) for post in posts])
+        self.assertEqual([post.author().name for post in posts], ['Ada', 'Ada'])
+
+    def test_with_reset(self):
+        author = Author()
+        author.with_('posts').get()
+
+        # The relationships given to `with_` only apply to the query they were given for
+        authors = self.assertQueries(1, author.get)
+        self.assertEqual(len(authors), 3)
+
+    def test_lazy_load(self):
+        # Without `with_` each row retrieves its relationship when it is first used
+        authors = Author().get()
+
+        posts = self.assertQueries(3, lambda: [len(author.posts()) for author in authors])
+        self.assertEqual(posts, [2, 1, 0])
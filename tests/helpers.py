@@ -0,0 +1,50 @@
+import io
+
+
+def environ(path='', query_string='', method='GET', body=None, content_type=None, content_length=None, **headers):
+    """
+    Builds the WSGI environ of a request, to be given to ``request.update_environ``.
+
+    :param path: The path of the request (without the leading '/')
+    :type path: str
+
+    :param query_string: The query string of the request
+    :type query_string: str
+
+    :param method: The method of the request
+    :type method: str
+
+    :param body: The body of the request. The content length is set to its length unless ``content_length`` is given.
+    :type body: bytes
+
+    :param content_type: The value of the Content-Type header
+    :type content_type: str
+
+    :param content_length: The value of the Content-Length header
+    :type content_length: int
+
+    :param headers: Any other headers e.g. ``if_none_match='"etag"'`` for the If-None-Match header
+
+    :return: The environ
+    :rtype: dict
+    """
+    environ = {
+        'HTTP_HOST': 'localhost:8080',
+        'REQUEST_METHOD': method,
+        'PATH_INFO': '/' + path,
+        'QUERY_STRING': query_string,
+        'REMOTE_ADDR': '127.0.0.1',
+        **{'HTTP_' + name.upper(): value for name, value in headers.items()}
+    }
+
+    if content_type is not None:
+        environ['CONTENT_TYPE'] = content_type
+
+    if body is not None:
+        environ['wsgi.input'] = io.BytesIO(body)
+        environ['CONTENT_LENGTH'] = str(len(body))
+
+    if content_length is not None:
+        environ['CONTENT_LENGTH'] = str(content_length)
+
+    return environ
@@ -0,0 +1,103 @@
+import gzip
+from unittest import TestCase
+
+from dragonfly import conditional
+from dragonfly.middleware.compression_middleware import CompressionMiddleware
+from dragonfly.request import request
+from dragonfly.response import Response, StreamingResponse
+from tests.helpers import environ
+
+CONTENT = '<p>Hello world</p>' * 100
+
+
+class TestCompressionMiddleware(TestCase):
+
+    def setUp(self):
+        self.middleware = CompressionMiddleware()
+        self.accept_encoding('gzip, deflate')
+
+    def accept_encoding(self, value, **headers):
+        request.update_environ(environ(accept_encoding=value, **headers))
+
+    def test_compress(self):
+        response = Response(CONTENT)
+        self.middleware.after(response)
+
+        self.assertEqual(response.get_header('Content-Encoding'), 'gzip')
+        self.assertEqual(response.get_header('Vary'), 'Accept-Encoding')
+        self.assertEqual(response.get_header('Content-Length'), str(len(response.content)))
+        self.assertEqual(gzip.decompress(response.content), CONTENT.encode())
+
+    def test_not_accepted(self):
+        self.accept_encoding('identity')
+
+        response = Response(CONTENT)
+        self.middleware.after(response)
+
+        self.assertIsNone(response.get_header('Content-Encoding'))
+        self.assertEqual(response.get_header('Vary'), 'Accept-Encoding')
+
+        self.accept_encoding('gzip;q=0')
+        self.assertIsNone(self.middleware.negotiate('gzip;q=0'))
+
+    def test_min_size(self):
+        response = Response('Hello world')
+        self.middleware.after(response)
+
+        self.assertEqual(response.content, b'Hello world')
+        self.assertIsNone(response.get_header('Content-Encoding'))
+
+    def test_content_type(self):
+        response = Response(CONTENT, content_type='image/png')
+        self.middleware.after(response)
+
+        self.assertIsNone(response.get_header('Content-Encoding'))
+        self.assertIsNone(response.get_header('Vary'))
+
+    def test_streaming(self):
+        response = StreamingResponse(iter([CONTENT, CONTENT]))
+        self.middleware.after(response)
+
+        self.assertEqual(response.get_header('Content-Encoding'), 'gzip')
+        self.assertIsNone(response.get_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.iter_content())), (CONTENT * 2).encode())
+
+    def test_cache(self):
+        for _ in range(3):
+            response = Response(CONTENT)
+            response.cacheable = True
+            self.middleware.after(response)
+
+            self.assertEqual(gzip.decompress(response.content), CONTENT.encode())
+
+        self.assertEqual(self.middleware.cache_info()['hits'], 2)
+        self.assertEqual(self.middleware.cache_info()['misses'], 1)
+
+    def test_weak_etag(self):
+        response = Response(CONTENT)
+        response.set_etag()
+        etag = response.get_header('ETag')
+
+        self.middleware.after(response)
+
+        self.assertEqual(response.get_header('ETag'), 'W/' + etag)
+
+    def test_not_modified(self):
+        def send():
+            response = Response(CONTENT)
+            response.set_etag()
+
+            response = conditional.evaluate(response)
+            self.middleware.after(response)
+
+            return response
+
+        full = send()
+
+        # The browser revalidates using the ETag it was sent
+        self.accept_encoding('gzip, deflate', if_none_match=full.get_header('ETag'))
+        not_modified = send()
+
+        self.assertEqual(not_modified.status[:3], '304')
+        self.assertEqual(not_modified.get_header('ETag'), full.get_header('ETag'))
+        self.assertEqual(not_modified.get_header('Vary'), full.get_header('Vary'))
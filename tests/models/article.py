@@ -3,5 +3,7 @@ from dragonfly import models
 
 class Article(models.Model):
 
+    __slots__ = ()
+
     title = models.VarCharField(length=50, unique=True)
     text = models.TextField()
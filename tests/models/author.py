@@ -0,0 +1,12 @@
+from dragonfly import models
+
+
+class Author(models.Model):
+
+    name = models.VarCharField(length=50)
+
+    class Meta:
+        timestamps = False
+
+    def posts(self):
+        return self.add_relationship(models.HasMany(target='post'))
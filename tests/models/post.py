@@ -0,0 +1,16 @@
+from dragonfly import models
+
+
+class Post(models.Model):
+
+    title = models.VarCharField(length=50)
+    author_id = models.IntField()
+
+    class Meta:
+        timestamps = False
+
+    def author(self):
+        return self.add_relationship(models.BelongsTo(target='author'))
+
+    def tags(self):
+        return self.add_relationship(models.ManyToMany(target='tag'))
@@ -0,0 +1,9 @@
+from dragonfly import models
+
+
+class Tag(models.Model):
+
+    name = models.VarCharField(length=50)
+
+    class Meta:
+        timestamps = False
@@ -0,0 +1,103 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from dragonfly.exceptions import RequestTooLarge, InvalidRequestBody
+from dragonfly.multipart import parse_form, UploadedFile
+
+BOUNDARY = '----dragonfly'
+
+
+def multipart_body(fields, files=()):
+    body = b''
+
+    for name, value in fields:
+        body += f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+
+    for name, filename, content in files:
+        body += f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n' \
+                f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n'
+
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+
+def environ(body, content_type=f'multipart/form-data; boundary={BOUNDARY}', content_length=None):
+    return {
+        'REQUEST_METHOD': 'POST',
+        'CONTENT_TYPE': content_type,
+        'CONTENT_LENGTH': str(len(body) if content_length is None else content_length),
+        'wsgi.input': io.BytesIO(body),
+    }
+
+
+class TestMultipart(TestCase):
+
+    def test_urlencoded(self):
+        data = parse_form(environ(b'title=Hello+world&tag=a&tag=b&empty=', 'application/x-www-form-urlencoded'))
+        self.assertEqual(data, {'title': 'Hello world', 'tag': ['a', 'b']})
+
+    def test_content_length(self):
+        # Only the number of bytes given in the Content-Length should be read
+        data = parse_form(environ(b'title=Hello&other=1', 'application/x-www-form-urlencoded', content_length=11))
+        self.assertEqual(data, {'title': 'Hello'})
+
+    def test_fields(self):
+        data = parse_form(environ(multipart_body([('title', 'Hello'), ('text', 'Line 1\r\nLine 2')])))
+        self.assertEqual(data, {'title': 'Hello', 'text': 'Line 1\r\nLine 2'})
+
+    def test_file(self):
+        content = os.urandom(1000)
+        data = parse_form(environ(multipart_body([('title', 'Hello')], [('upload', 'test.bin', content)])))
+
+        upload = data['upload']
+        self.assertIsInstance(upload, UploadedFile)
+        self.assertEqual(upload.filename, 'test.bin')
+        self.assertEqual(upload.content_type, 'application/octet-stream')
+        self.assertEqual(upload.size, 1000)
+        self.assertEqual(upload.read(), content)
+
+    def test_small_chunks(self):
+        # Delimiters split across chunks should still be found
+        content = os.urandom(5000)
+        data = parse_form(environ(multipart_body([('title', 'Hello')], [('upload', 'test.bin', content)])),
+                          {'chunk_size': 7})
+
+        self.assertEqual(data['title'], 'Hello')
+        self.assertEqual(data['upload'].read(), content)
+
+    def test_spool_to_disk(self):
+        content = os.urandom(20000)
+        data = parse_form(environ(multipart_body([], [('upload', 'test.bin', content)])), {'spool_threshold': 1024})
+
+        self.assertTrue(data['upload'].file._rolled)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'test.bin')
+            data['upload'].save(path)
+
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), content)
+
+    def test_empty_file(self):
+        data = parse_form(environ(multipart_body([('title', 'Hello')], [('upload', '', b'')])))
+        self.assertEqual(data, {'title': 'Hello'})
+
+    def test_erroneous_size(self):
+        stream = io.BytesIO(b'title=Hello')
+        env = {**environ(b'', 'application/x-www-form-urlencoded', content_length=100), 'wsgi.input': stream}
+
+        with self.assertRaises(RequestTooLarge):
+            parse_form(env, {'max_body_size': 10})
+
+        # The body should not have been read
+        self.assertEqual(stream.tell(), 0)
+
+    def test_erroneous_body(self):
+        body = multipart_body([('title', 'Hello')])[:-20]
+
+        with self.assertRaises(InvalidRequestBody):
+            parse_form(environ(body))
+
+        with self.assertRaises(InvalidRequestBody):
+            parse_form(environ(b'', 'multipart/form-data'))
@@ -0,0 +1,114 @@
+import contextvars
+import threading
+from unittest import TestCase
+
+from dragonfly.exceptions import InvalidRequestBody, RequestTooLarge
+from dragonfly.request import request, Request
+from dragonfly.response import deferred_response
+from tests.helpers import environ
+
+
+class TestRequest(TestCase):
+
+    def setUp(self):
+        request.update_environ(environ('testing', 'page=2', cookie='session_id=testing'))
+
+    def test_proxy(self):
+        self.assertEqual(request.path, 'testing')
+        self.assertIsInstance(request.get_current_request(), Request)
+
+        request.path = 'changed'
+        self.assertEqual(request.get_current_request().path, 'changed')
+
+    def test_context_isolation(self):
+        def handle():
+            request.update_environ(environ('other'))
+            deferred_response.header('X-Testing', 'other')
+
+        contextvars.copy_context().run(handle)
+
+        self.assertEqual(request.path, 'testing')
+        self.assertNotIn('X-Testing', deferred_response.headers)
+
+    def test_thread_isolation(self):
+        paths = {}
+        started = threading.Barrier(4)
+
+        def handle(i):
+            request.update_environ(environ(f'thread/{i}'))
+            started.wait()
+            paths[i] = request.path
+
+        threads = [threading.Thread(target=handle, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(paths, {i: f'thread/{i}' for i in range(4)})
+        self.assertEqual(request.path, 'testing')
+
+    def test_deferred_reset(self):
+        deferred_response.header('X-Testing', 'testing')
+        self.assertEqual(deferred_response.headers, {'X-Testing': 'testing'})
+
+        request.update_environ(environ('testing'))
+        self.assertEqual(deferred_response.headers, {})
+
+    def test_lazy_properties(self):
+        current = request.get_current_request()
+        self.assertNotIn('headers', current.__dict__)
+        self.assertNotIn('cookies', current.__dict__)
+
+        self.assertEqual(request.headers['HTTP_HOST'], 'localhost:8080')
+        self.assertEqual(request.cookies, {'session_id': 'testing'})
+        self.assertEqual(request.args, {'page': ['2']})
+        self.assertEqual(request.get_header('Host'), 'localhost:8080')
+        self.assertIsNone(request.get_header('X-Missing'))
+        self.assertEqual(request.uri, 'localhost:8080/testing')
+
+        # Values are only parsed once
+        self.assertIs(request.cookies, request.cookies)
+
+    def test_update_environ_clears_cache(self):
+        current = request.get_current_request()
+        self.assertEqual(current.cookies, {'session_id': 'testing'})
+
+        current.update_environ(environ('testing'))
+
+        self.assertEqual(current.cookies, {})
+
+    def test_json(self):
+        body = b'{"title": "Hello", "tags": ["a", "b"]}'
+        request.update_environ(environ('testing', method='POST', body=body,
+                                       content_type='application/json; charset=utf-8'))
+
+        self.assertEqual(request.json, {'title': 'Hello', 'tags': ['a', 'b']})
+        self.assertEqual(request.get_data(), {'title': 'Hello', 'tags': ['a', 'b']})
+
+        # The body is only read and decoded once
+        self.assertIs(request.json, request.json)
+
+    def test_json_array(self):
+        body = b'[1, 2, 3]'
+        request.update_environ(environ('testing', method='POST', body=body, content_type='application/json'))
+
+        self.assertEqual(request.json, [1, 2, 3])
+        self.assertEqual(request.get_data(), {})
+
+    def test_not_json(self):
+        self.assertIsNone(request.json)
+
+    def test_erroneous_json(self):
+        body = b'{"title": '
+        request.update_environ(environ('testing', method='POST', body=body, content_type='application/json'))
+
+        with self.assertRaises(InvalidRequestBody):
+            request.get_data()
+
+    def test_erroneous_json_size(self):
+        request.update_environ(environ('testing', method='POST', body=b'{}', content_type='application/json',
+                                       content_length=100 * 1024 * 1024))
+
+        with self.assertRaises(RequestTooLarge):
+            request.json
@@ -0,0 +1,60 @@
+import datetime
+from unittest import TestCase
+
+from dragonfly.conditional import etag_matches, evaluate, not_modified
+from dragonfly.request import request
+from dragonfly.response import Response, NotModifiedResponse, make_etag
+from tests.helpers import environ
+
+UPDATED_AT = datetime.datetime(2020, 1, 1, 12, 0, 0)
+
+
+class TestConditional(TestCase):
+
+    def request_headers(self, **headers):
+        request.update_environ(environ(**headers))
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(etag_matches('W/"a"', '"a"'))
+        self.assertTrue(etag_matches('"a"', 'W/"a"'))
+        self.assertTrue(etag_matches('*', '"a"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+
+    def test_etag(self):
+        response = Response('Hello')
+        response.set_etag()
+
+        self.assertEqual(response.get_header('ETag'), make_etag(b'Hello'))
+
+        self.request_headers(if_none_match=make_etag(b'Hello'))
+        self.assertIsInstance(evaluate(response), NotModifiedResponse)
+
+        self.request_headers(if_none_match=make_etag(b'Goodbye'))
+        self.assertIs(evaluate(response), response)
+
+    def test_last_modified(self):
+        response = Response('Hello')
+        response.set_last_modified(UPDATED_AT)
+
+        self.assertEqual(response.get_header('Last-Modified'), 'Wed, 01 Jan 2020 12:00:00 GMT')
+
+        self.request_headers(if_modified_since='Wed, 01 Jan 2020 12:00:00 GMT')
+        self.assertIsInstance(evaluate(response), NotModifiedResponse)
+
+        self.request_headers(if_modified_since='Tue, 31 Dec 2019 12:00:00 GMT')
+        self.assertIs(evaluate(response), response)
+
+        # If-None-Match takes precedence over If-Modified-Since
+        self.request_headers(if_modified_since='Wed, 01 Jan 2020 12:00:00 GMT', if_none_match='"other"')
+        self.assertIs(evaluate(response), response)
+
+    def test_not_modified(self):
+        self.request_headers(if_none_match=make_etag('article-1'))
+
+        response = not_modified(etag='article-1')
+        self.assertIsInstance(response, NotModifiedResponse)
+        self.assertEqual(response.get_header('ETag'), make_etag('article-1'))
+
+        self.assertIsNone(not_modified(etag='article-2'))
+        self.assertIsNone(not_modified(last_modified=UPDATED_AT))
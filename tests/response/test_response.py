@@ -0,0 +1,93 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from dragonfly.response import Response, StreamingResponse, FileResponse, content_disposition
+
+
+class StartResponse:
+
+    def __call__(self, status, headers):
+        self.status = status
+        self.headers = dict(headers)
+
+
+class FileWrapper:
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+
+
+class TestResponse(TestCase):
+
+    def test_response(self):
+        start_response = StartResponse()
+        body = Response('Hello')({}, start_response)
+
+        self.assertEqual(b''.join(body), b'Hello')
+        self.assertEqual(start_response.status, '200 OK')
+        self.assertEqual(start_response.headers['Content-Length'], '5')
+
+    def test_streaming_response(self):
+        def generate():
+            yield 'id,title\n'
+            yield b'1,Hello\n'
+
+        start_response = StartResponse()
+        body = StreamingResponse(generate(), content_type='text/csv')({}, start_response)
+
+        self.assertNotIn('Content-Length', start_response.headers)
+        self.assertEqual(b''.join(body), b'id,title\n1,Hello\n')
+
+    def test_streaming_response_close(self):
+        closed = []
+
+        def generate():
+            try:
+                yield 'a'
+                yield 'b'
+            finally:
+                closed.append(True)
+
+        body = StreamingResponse(generate())({}, StartResponse())
+        next(body)
+        body.close()
+
+        self.assertEqual(closed, [True])
+
+    def test_file_response(self):
+        content = os.urandom(100000)
+
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+            f.write(content)
+
+        try:
+            start_response = StartResponse()
+            response = FileResponse(f.name, filename='export.csv', chunk_size=1024)
+            body = list(response({}, start_response))
+
+            self.assertEqual(b''.join(body), content)
+            self.assertEqual(len(body), 98)
+            self.assertEqual(start_response.headers['Content-Length'], '100000')
+            self.assertEqual(start_response.headers['Content-type'], 'text/csv')
+            self.assertEqual(start_response.headers['Content-Disposition'], 'attachment; filename="export.csv"')
+
+            # The server's file wrapper should be used if it exists
+            response = FileResponse(f.name)
+            wrapper = response({'wsgi.file_wrapper': FileWrapper}, StartResponse())
+
+            self.assertIsInstance(wrapper, FileWrapper)
+            self.assertEqual(wrapper.file.read(), content)
+            wrapper.file.close()
+        finally:
+            os.unlink(f.name)
+
+    def test_content_disposition(self):
+        self.assertEqual(content_disposition('say "hi"\\.txt'), 'attachment; filename="say \\"hi\\"\\\\.txt"')
+
+        # Control characters are removed so the header cannot be split
+        self.assertEqual(content_disposition('a\r\nSet-Cookie: x=1.txt'), 'attachment; filename="aSet-Cookie: x=1.txt"')
+
+        self.assertEqual(content_disposition('résumé.pdf'),
+                         "attachment; filename=\"r_sum_.pdf\"; filename*=UTF-8''r%C3%A9sum%C3%A9.pdf")
@@ -0,0 +1,139 @@
+import time
+from unittest import TestCase
+
+from dragonfly.request import request
+from dragonfly.response import Response, StreamingResponse
+from dragonfly.response_cache import ResponseCache, MemoryBackend
+from tests.helpers import environ
+
+ACTION = 'ArticleController@show'
+
+
+class CountingBackend(MemoryBackend):
+    """Records the calls that would be round trips to a networked backend."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def get_many(self, keys):
+        self.calls.append('get_many')
+        return [MemoryBackend.get(self, key) for key in keys]
+
+    def get(self, key):
+        self.calls.append('get')
+        return super().get(key)
+
+
+class TestResponseCache(TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.cache.add_rule(ACTION, ttl=60, vary_cookies=['session_id'], vary_query=['page'])
+
+        self.update_request()
+
+    def update_request(self, path='articles/1', query_string='', method='GET', **headers):
+        request.update_environ(environ(path, query_string, method, **headers))
+
+    def test_cache(self):
+        self.assertIsNone(self.cache.get(ACTION))
+        self.assertTrue(self.cache.set(ACTION, Response('Article 1')))
+
+        response = self.cache.get(ACTION)
+        self.assertEqual(response.content, b'Article 1')
+        self.assertEqual(response.status, '200 OK')
+        self.assertTrue(response.cacheable)
+
+        self.assertEqual(self.cache.cache_info(), {'hits': 1, 'misses': 1, 'stores': 1, 'invalidations': 0})
+
+    def test_not_cached(self):
+        self.assertFalse(self.cache.set('ArticleController@index', Response('Articles')))
+        self.assertFalse(self.cache.set(ACTION, Response('Error', status_code=500)))
+        self.assertFalse(self.cache.set(ACTION, StreamingResponse(iter(['Article 1']))))
+
+        response = Response('Article 1')
+        response.header('Set-Cookie', 'visited=True')
+        self.assertFalse(self.cache.set(ACTION, response))
+
+        self.update_request(method='POST')
+        self.assertFalse(self.cache.set(ACTION, Response('Article 1')))
+
+    def test_vary(self):
+        self.cache.set(ACTION, Response('Article 1'))
+
+        # Query arguments that are not listed are ignored
+        self.update_request(query_string='utm_source=testing')
+        self.assertIsNotNone(self.cache.get(ACTION))
+
+        self.update_request(query_string='page=2')
+        self.assertIsNone(self.cache.get(ACTION))
+
+        self.update_request(cookie='session_id=testing')
+        self.assertIsNone(self.cache.get(ACTION))
+
+        self.update_request(path='articles/2')
+        self.assertIsNone(self.cache.get(ACTION))
+
+    def test_vary_header(self):
+        self.cache.add_rule('ArticleController@index', ttl=60, vary_headers=['Accept-Language'])
+
+        response = Response('Articles')
+        response.header('Vary', 'Accept-Encoding')
+        self.cache.set('ArticleController@index', response)
+
+        # Shared caches must also store a version for each language
+        self.assertEqual(response.get_header('Vary'), 'Accept-Encoding, Accept-Language')
+
+        response = Response('Article 1')
+        self.cache.set(ACTION, response)
+        self.assertEqual(response.get_header('Vary'), 'Cookie')
+        self.assertEqual(self.cache.get(ACTION).get_header('Vary'), 'Cookie')
+
+    def test_key_round_trips(self):
+        backend = CountingBackend()
+        cache = ResponseCache(backend)
+        cache.add_rule(ACTION, ttl=60)
+
+        cache.set(ACTION, Response('Article 1'))
+        backend.calls.clear()
+
+        # One multi-get for the version numbers and one get for the response
+        self.assertIsNotNone(cache.get(ACTION))
+        self.assertEqual(backend.calls, ['get_many', 'get'])
+
+    def test_invalidate(self):
+        self.cache.set(ACTION, Response('Article 1'))
+        self.update_request(path='articles/2')
+        self.cache.set(ACTION, Response('Article 2'))
+
+        self.cache.invalidate(path='articles/2')
+        self.assertIsNone(self.cache.get(ACTION))
+
+        self.update_request(path='articles/1')
+        self.assertIsNotNone(self.cache.get(ACTION))
+
+        self.cache.invalidate(action=ACTION)
+        self.assertIsNone(self.cache.get(ACTION))
+
+        self.cache.set(ACTION, Response('Article 1'))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(ACTION))
+
+    def test_ttl(self):
+        backend = MemoryBackend()
+        backend.set('testing', 'value', ttl=0.01)
+        self.assertEqual(backend.get('testing'), 'value')
+
+        time.sleep(0.02)
+        self.assertIsNone(backend.get('testing'))
+
+    def test_lru(self):
+        backend = MemoryBackend(max_size=2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+
+        self.assertEqual(backend.get('a'), 1)
+        self.assertIsNone(backend.get('b'))
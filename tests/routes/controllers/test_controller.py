@@ -5,3 +5,14 @@ class TestController:
 
     def test(self):
         return Response()
+
+    def instance(self, id):
+        return Response(f"{type(self).__name__} {id}")
+
+    @staticmethod
+    def static(id):
+        return Response(f"static {id}")
+
+    @classmethod
+    def class_method(cls, id):
+        return Response(f"{cls.__name__} {id}")
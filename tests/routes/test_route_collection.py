@@ -19,6 +19,72 @@ class TestRouteCollection(TestCase):
         self.route_collection.add('testing/<id:int>/<name:str>', 'TestController@testing', 'GET')
         self.assertEqual(self.route_collection.match_route('testing/1/test', 'GET'), ('TestController@testing', {'id': 1, 'name': 'test'}))
 
+    def test_dynamic_prefix_fallback(self):
+        self.route_collection.add('testing/<name:str>', 'TestController@name', 'GET')
+        self.route_collection.add('testing/nested/<id:int>', 'TestController@nested', 'GET')
+
+        self.assertEqual(self.route_collection.match_route('testing/nested/1', 'GET'), ('TestController@nested', {'id': 1}))
+        self.assertEqual(self.route_collection.match_route('testing/nested/a', 'GET'),
+                         ('TestController@name', {'name': 'nested/a'}))
+
+    def test_dynamic_order(self):
+        self.route_collection.add('testing/<id:int>', 'TestController@first', 'GET')
+        self.route_collection.add('testing/<name:str>', 'TestController@second', 'GET')
+
+        self.assertEqual(self.route_collection.match_route('testing/1', 'GET'), ('TestController@first', {'id': 1}))
+        self.assertEqual(self.route_collection.match_route('testing/a', 'GET'), ('TestController@second', {'name': 'a'}))
+
+    def test_parameter_nodes(self):
+        # Routes that only differ after a route parameter are stored on separate nodes
+        for i in range(10):
+            self.route_collection.add(f"users/<user:int>/resource{i}/<id:int>", f"Resource{i}Controller@user", 'GET')
+
+        self.assertEqual(self.route_collection.match_route('users/1/resource5/2', 'GET'),
+                         ('Resource5Controller@user', {'user': 1, 'id': 2}))
+        self.assertEqual(self.route_collection.match_route('users/a/resource5/2', 'GET'), (None, {}))
+        self.assertEqual(self.route_collection.node_info()['max_rules'], 1)
+
+    def test_parameter_node_order(self):
+        # Rules on different nodes with the same static prefix are still tried in the order they were added
+        self.route_collection.add('testing/<id:int>/<name:str>', 'TestController@name', 'GET')
+        self.route_collection.add('testing/<id:int>/edit', 'TestController@edit', 'GET')
+        self.route_collection.add('testing/nested/<id:int>', 'TestController@nested', 'GET')
+
+        self.assertEqual(self.route_collection.match_route('testing/1/edit', 'GET'),
+                         ('TestController@name', {'id': 1, 'name': 'edit'}))
+        self.assertEqual(self.route_collection.match_route('testing/nested/1', 'GET'),
+                         ('TestController@nested', {'id': 1}))
+        self.assertEqual(len(self.route_collection.conflicts()), 1)
+
+    def test_any(self):
+        self.route_collection.add('testing/<id:int>', 'TestController@testing', ['GET', 'POST'])
+        self.assertEqual(self.route_collection.match_route('testing/1', 'DELETE'), ('TestController@testing', {'id': 1}))
+
+    def test_no_match(self):
+        self.route_collection.add('testing/<id:int>', 'TestController@testing', 'GET')
+        self.assertEqual(self.route_collection.match_route('other/testing/1', 'GET'), (None, {}))
+
+    def test_routes(self):
+        self.route_collection.add('testing', 'TestController@testing', 'GET')
+        self.route_collection.add('testing/<id:int>', 'TestController@dynamic', 'GET')
+
+        self.assertEqual(list(self.route_collection.routes()), [('GET', 'testing', 'TestController@testing'),
+                                                                ('GET', 'testing/<id:int>', 'TestController@dynamic')])
+
+    def test_conflicts(self):
+        self.route_collection.add('testing', 'TestController@first', 'GET')
+        self.route_collection.add('testing', 'TestController@second', 'GET')
+        self.route_collection.add('testing/<name:str>', 'TestController@name', 'GET')
+        self.route_collection.add('testing/<id:int>', 'TestController@id', 'GET')
+
+        self.assertEqual(len(self.route_collection.conflicts()), 2)
+
+    def test_no_conflicts(self):
+        self.route_collection.add('testing/<id:int>', 'TestController@id', 'GET')
+        self.route_collection.add('testing/<name:str>', 'TestController@name', 'GET')
+
+        self.assertEqual(self.route_collection.conflicts(), [])
+
     def test_erroneous_method(self):
         with self.assertRaises(MethodDoesNotExist):
             self.route_collection.add('testing', 'TestController@testing', 'TESTING')
@@ -1,3 +1,4 @@
+import uuid
 from unittest import TestCase
 from dragonfly.routes.route_rule import RouteRule
 
@@ -27,3 +28,25 @@ class TestRouteRule(TestCase):
     def test_erroneous_multiple_dynamic_route(self):
         route_rule = RouteRule('test/<id:int>/<name:str>')
         self.assertEqual(route_rule.match('testing'), False)
+
+    def test_converters(self):
+        route_rule = RouteRule('test/<slug:slug>/<id:uuid>/<rest:path>')
+        self.assertEqual(route_rule.match('test/a-slug/12345678-1234-5678-1234-567812345678/a/b'),
+                         {'slug': 'a-slug', 'id': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'rest': 'a/b'})
+
+    def test_erroneous_converters(self):
+        route_rule = RouteRule('test/<slug:slug>/<id:uuid>')
+        self.assertEqual(route_rule.match('test/a slug/12345678-1234-5678-1234-567812345678'), False)
+        self.assertEqual(route_rule.match('test/slug/not-a-uuid'), False)
+
+    def test_escaped_route(self):
+        route_rule = RouteRule('files/<name:slug>.txt')
+        self.assertEqual(route_rule.match('files/test.txt'), {'name': 'test'})
+        self.assertEqual(route_rule.match('files/testatxt'), False)
+
+    def test_fresh_parameters(self):
+        route_rule = RouteRule('test/<id:int>')
+        first = route_rule.match('test/1')
+        route_rule.match('test/2')
+
+        self.assertEqual(first, {'id': 1})
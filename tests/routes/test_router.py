@@ -1,7 +1,11 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 from dragonfly.routes.router import Router
+from dragonfly.middleware.middleware_controller import middleware_controller
 from dragonfly.request import request
-from dragonfly.response import Response, ErrorResponse
+from dragonfly.response import Response, ErrorResponse, deferred_response
+from dragonfly.exceptions import InvalidControllerMethod, RouterFrozen
+from tests.helpers import environ
+import json
 import os
 
 
@@ -12,13 +16,7 @@ class TestRouter(TestCase):
 
 		self.router = Router()
 
-		request.update_environ({
-			'HTTP_HOST': 'localhost:8080',
-			'REQUEST_METHOD': 'GET',
-			'PATH_INFO': '/',
-			'QUERY_STRING': '',
-			'REMOTE_ADDR': '127.0.0.1',
-		})
+		request.update_environ(environ())
 
 		self.router.get('', 'TestController@test')
 
@@ -26,6 +24,14 @@ class TestRouter(TestCase):
 		response = self.router.dispatch_route()
 		self.assertIsInstance(response, Response)
 
+	def test_dispatch_lazy(self):
+		# A GET request is routed without parsing the query string or body
+		request.update_environ(environ(query_string='page=2'))
+
+		self.router.dispatch_route()
+
+		self.assertNotIn('args', vars(request.get_current_request()))
+
 	def test_erroneous_dispatch_route(self):
 		# Shows the router deals errors by returning an error response
 
@@ -35,3 +41,97 @@ class TestRouter(TestCase):
 
 		self.assertIsInstance(response, ErrorResponse)
 
+	def test_match_cache(self):
+		self.router.get('testing/<id:int>', 'TestController@testing')
+
+		self.assertEqual(self.router.match_route('testing/1', 'GET'), ('TestController@testing', {'id': 1}))
+		self.assertEqual(self.router.match_route('testing/1', 'GET'), ('TestController@testing', {'id': 1}))
+		self.assertEqual(self.router.match_route('missing', 'GET'), (None, {}))
+		self.assertEqual(self.router.match_route('missing', 'GET'), (None, {}))
+
+		self.assertEqual(self.router.match_cache_info()['hits'], 2)
+		self.assertEqual(self.router.match_cache_info()['misses'], 2)
+
+	def test_match_cache_invalidation(self):
+		self.assertEqual(self.router.match_route('testing', 'GET'), (None, {}))
+
+		self.router.get('testing', 'TestController@testing')
+
+		self.assertEqual(self.router.match_route('testing', 'GET'), ('TestController@testing', {}))
+
+	def test_freeze(self):
+		router = Router()
+
+		self.assertEqual(router.freeze(), [])
+		self.assertTrue(router.frozen)
+
+		with self.assertRaises(RouterFrozen):
+			router.get('testing', 'TestController@testing')
+
+	def test_erroneous_freeze(self):
+		# Shows actions that cannot be imported are found when the router is frozen
+		self.router.get('testing', 'MissingController@testing')
+
+		with self.assertRaises(InvalidControllerMethod):
+			self.router.freeze()
+
+		self.assertFalse(self.router.frozen)
+
+	def test_resolve_action(self):
+		# Instance, static and class methods can all be used as actions, whether or not controllers are reused
+		for reuse_controllers in (False, True):
+			router = Router(reuse_controllers=reuse_controllers)
+
+			for name, content in (('instance', b'TestController 1'), ('static', b'static 1'),
+								  ('class_method', b'TestController 1')):
+				response = router.resolve_action(f"TestController@{name}")(id=1)
+				self.assertEqual(response.content, content)
+
+			self.assertIs(router.resolve_action('TestController@static'), router.resolve_action('TestController@static'))
+
+	def test_method_override(self):
+		for value, method in (('delete', 'DELETE'), ('GET', 'POST'), (['DELETE'], 'POST'), (1, 'POST')):
+			body = json.dumps({'_method': value}).encode('utf-8')
+
+			request.update_environ(environ(method='POST', body=body, content_type='application/json'))
+
+			self.router.dispatch_route()
+
+			# Only a string naming one of the allowed methods changes the method, anything else is ignored
+			self.assertEqual(request.method, method)
+
+	def test_cache_after_middleware(self):
+		# A cached response is only returned once the `before` middleware has run
+		self.router.cache('TestController@test', ttl=60)
+		self.router.response_cache.set('TestController@test', Response('cached'))
+
+		response = self.router.dispatch_route()
+		self.assertEqual(response.content, b'before (*)')
+
+	def test_cache_deferred_headers(self):
+		# Headers a `before` middleware sets for each request are added to cached responses, but are not cached
+		self.router.cache('TestController@test', ttl=60)
+
+		request_ids = iter(('1', '2'))
+
+		def before(action):
+			deferred_response.header('X-Request-Id', next(request_ids))
+
+		with mock.patch.object(middleware_controller, 'run_before', side_effect=before), \
+				mock.patch.object(middleware_controller, 'run_after', return_value=None):
+			for request_id in ('1', '2'):
+				deferred_response.reset()
+
+				response = self.router.dispatch_route()
+				self.assertEqual(response.get_header('X-Request-Id'), request_id)
+
+		self.assertEqual(self.router.response_cache.cache_info()['hits'], 1)
+
+	def test_erroneous_body_size(self):
+		request.update_environ(environ(method='POST', content_type='application/x-www-form-urlencoded',
+									   content_length=100 * 1024 * 1024))
+
+		response = self.router.dispatch_route()
+
+		self.assertIsInstance(response, ErrorResponse)
+		self.assertEqual(response.status, '413 Request Entity Too Large')
@@ -1,5 +1,7 @@
 def get_html(kwargs):
-    template = '''<!DOCTYPE html>
+    parts = []
+    extend = parts.extend
+    extend(('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -7,12 +9,12 @@ def get_html(kwargs):
 </head>
 <body>
 
-'''
+''',))
     for item in kwargs['items']:
-        template += '''        ''' + str(kwargs['item']) + '''
-'''
-    template += '''
+        extend(('''        ''', str(kwargs['item']), '''
+''',))
+    extend(('''
 
 </body>
-</html>'''
-    return template
+</html>''',))
+    return ''.join(parts)
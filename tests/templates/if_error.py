@@ -1,5 +1,7 @@
 def get_html(kwargs):
-    template = '''<!DOCTYPE html>
+    parts = []
+    extend = parts.extend
+    extend(('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -7,18 +9,18 @@ def get_html(kwargs):
 </head>
 <body>
 
-'''
+''',))
     if kwargs['var'] == 1:
-        template += '''        <p>1</p>
-'''
+        extend(('''        <p>1</p>
+''',))
     else:
-        template += '''        <p>2</p>
-'''
+        extend(('''        <p>2</p>
+''',))
     elif kwargs['var'] == 2:
-        template += '''        <p>3</p>
-'''
-    template += '''
+        extend(('''        <p>3</p>
+''',))
+    extend(('''
 
 </body>
-</html>'''
-    return template
+</html>''',))
+    return ''.join(parts)
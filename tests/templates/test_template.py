@@ -1,6 +1,8 @@
 from unittest import TestCase
-from dragonfly.template.template import Converter
+from dragonfly.template.template import Converter, TemplateRegistry
 import importlib
+import os
+import tempfile
 
 
 class TestTemplate(TestCase):
@@ -8,6 +10,18 @@ class TestTemplate(TestCase):
     def test_convert(self):
         res = Converter('test.html').convert()
 
+    def test_render_loop(self):
+        res = Converter('test.html').convert()
+
+        namespace = {}
+        exec(res, namespace)
+        html = namespace['get_html']({'var': 2, 'items': [['a', 'b'], ['c']]})
+
+        self.assertIn('<p>2</p>', html)
+        self.assertNotIn('<p>3</p>', html)
+        self.assertEqual([line.strip() for line in html.splitlines() if line.strip() in ('a', 'b', 'c')],
+                         ['a', 'b', 'c'])
+
     def test_erroneous_if(self):
         res = Converter('if_error.html').convert()
 
@@ -28,3 +42,63 @@ class TestTemplate(TestCase):
         with self.assertRaises(KeyError):
             arg_dict = {'items': [1, 2, 3]}
             html = importlib.import_module("for_error").get_html(arg_dict)
+
+
+class TestTemplateRegistry(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.root.name, 'templates', 'articles'))
+
+        self.write('<p>{{ title }}</p>')
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def write(self, html, mtime=None):
+        path = os.path.join(self.root.name, 'templates', 'articles', 'show.html')
+
+        with open(path, 'w') as f:
+            f.write(html)
+
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_compiles_and_caches(self):
+        registry = TemplateRegistry(auto_reload=False, root_dir=self.root.name)
+
+        get_html = registry.get('articles.show')
+
+        self.assertEqual(get_html({'title': 'Hello'}).strip(), '<p>Hello</p>')
+        self.assertTrue(os.path.exists(registry.view_path('articles.show')))
+        self.assertIs(registry.get('articles.show'), get_html)
+
+    def test_production_never_reloads(self):
+        registry = TemplateRegistry(auto_reload=False, root_dir=self.root.name)
+        get_html = registry.get('articles.show')
+
+        self.write('<h1>{{ title }}</h1>', mtime=os.path.getmtime(registry.template_path('articles.show')) + 10)
+
+        self.assertIs(registry.get('articles.show'), get_html)
+
+    def test_development_reloads(self):
+        registry = TemplateRegistry(auto_reload=True, check_interval=0, root_dir=self.root.name)
+        registry.get('articles.show')
+
+        self.write('<h1>{{ title }}</h1>', mtime=os.path.getmtime(registry.template_path('articles.show')) + 10)
+
+        self.assertEqual(registry.get('articles.show')({'title': 'Hello'}).strip(), '<h1>Hello</h1>')
+
+    def test_check_interval(self):
+        registry = TemplateRegistry(auto_reload=True, check_interval=60, root_dir=self.root.name)
+        get_html = registry.get('articles.show')
+
+        self.write('<h1>{{ title }}</h1>', mtime=os.path.getmtime(registry.template_path('articles.show')) + 10)
+
+        # The template is not checked again until the interval has passed
+        self.assertIs(registry.get('articles.show'), get_html)
+
+    def test_preload(self):
+        registry = TemplateRegistry(auto_reload=False, root_dir=self.root.name)
+
+        self.assertEqual(registry.preload(), ['articles.show'])